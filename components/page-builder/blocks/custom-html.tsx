@@ -1,5 +1,5 @@
 import * as React from "react"
-import DOMPurify from "dompurify"
+import { sanitizeCustomHTML } from "@/lib/sanitize-html"
 import { Block, CustomHtmlBlock } from "../types"
 import { TextareaField, SectionContainer, applyBlockStyles } from "../utils"
 
@@ -17,36 +17,7 @@ export function CustomHtmlEditor({
         onChange({ ...block, html: draft })
     }
 
-    const sanitizedHtml = DOMPurify.sanitize(draft, {
-        ALLOWED_TAGS: [
-            "p",
-            "br",
-            "strong",
-            "em",
-            "u",
-            "h1",
-            "h2",
-            "h3",
-            "h4",
-            "h5",
-            "h6",
-            "ul",
-            "ol",
-            "li",
-            "a",
-            "img",
-            "div",
-            "span",
-            "table",
-            "thead",
-            "tbody",
-            "tr",
-            "td",
-            "th",
-        ],
-        ALLOWED_ATTR: ["href", "src", "alt", "title", "class", "id", "target", "rel"],
-        ALLOW_DATA_ATTR: false,
-    })
+    const sanitizedHtml = sanitizeCustomHTML(draft)
 
     return (
         <div className="space-y-3 text-[11px]">
@@ -106,36 +77,7 @@ export function CustomHtmlView({ block }: { block: CustomHtmlBlock }) {
     const { hoverStyles, ...blockProps } = applyBlockStyles(block.blockStyles)
 
     // تنقية HTML قبل عرضه
-    const sanitizedHtml = DOMPurify.sanitize(block.html, {
-        ALLOWED_TAGS: [
-            "p",
-            "br",
-            "strong",
-            "em",
-            "u",
-            "h1",
-            "h2",
-            "h3",
-            "h4",
-            "h5",
-            "h6",
-            "ul",
-            "ol",
-            "li",
-            "a",
-            "img",
-            "div",
-            "span",
-            "table",
-            "thead",
-            "tbody",
-            "tr",
-            "td",
-            "th",
-        ],
-        ALLOWED_ATTR: ["href", "src", "alt", "title", "class", "id", "target", "rel"],
-        ALLOW_DATA_ATTR: false,
-    })
+    const sanitizedHtml = sanitizeCustomHTML(block.html)
 
     return (
         <>
@@ -1,46 +1,93 @@
 import DOMPurify from "isomorphic-dompurify"
 
+/**
+ * سياسة تنقية النصوص المنسقة (rich text)
+ * يقرأ scripts/html_sanitizer.py هذه السياسة والسياسة التالية ويطبقهما وقت البناء
+ */
+export const RICH_TEXT_POLICY = {
+  // العناصر المسموحة فقط
+  ALLOWED_TAGS: [
+    "p",
+    "br",
+    "strong",
+    "em",
+    "u",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "ul",
+    "ol",
+    "li",
+    "a",
+    "img",
+    "blockquote",
+    "code",
+    "pre",
+    "div",
+    "span",
+    "table",
+    "thead",
+    "tbody",
+    "tr",
+    "th",
+    "td",
+  ],
+  // الخصائص المسموحة فقط
+  ALLOWED_ATTR: ["href", "src", "alt", "title", "class", "id", "target", "rel"],
+  // منع العناصر الخطرة
+  FORBID_TAGS: ["script", "style", "iframe", "object", "embed", "form", "input"],
+  // منع الأحداث الخطرة
+  FORBID_ATTR: ["onerror", "onload", "onclick", "onmouseover", "onmouseout", "onfocus", "onblur"],
+}
+
+/**
+ * سياسة تنقية كتلة HTML المخصص (custom-html) في المحرر والعرض
+ */
+export const CUSTOM_HTML_POLICY = {
+  ALLOWED_TAGS: [
+    "p",
+    "br",
+    "strong",
+    "em",
+    "u",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "ul",
+    "ol",
+    "li",
+    "a",
+    "img",
+    "div",
+    "span",
+    "table",
+    "thead",
+    "tbody",
+    "tr",
+    "td",
+    "th",
+  ],
+  ALLOWED_ATTR: ["href", "src", "alt", "title", "class", "id", "target", "rel"],
+  ALLOW_DATA_ATTR: false,
+}
+
 /**
  * تنقية HTML من العناصر الخطرة والأكواد الضارة
  * يستخدم DOMPurify لمنع XSS attacks
  */
 export function sanitizeHTML(html: string): string {
-  return DOMPurify.sanitize(html, {
-    // العناصر المسموحة فقط
-    ALLOWED_TAGS: [
-      "p",
-      "br",
-      "strong",
-      "em",
-      "u",
-      "h1",
-      "h2",
-      "h3",
-      "h4",
-      "h5",
-      "h6",
-      "ul",
-      "ol",
-      "li",
-      "a",
-      "img",
-      "blockquote",
-      "code",
-      "pre",
-      "div",
-      "span",
-      "table",
-      "thead",
-      "tbody",
-      "tr",
-      "th",
-      "td",
-    ],
-    // الخصائص المسموحة فقط
-    ALLOWED_ATTR: ["href", "src", "alt", "title", "class", "id", "target", "rel"],
-    // منع العناصر الخطرة
-    FORBID_TAGS: ["script", "style", "iframe", "object", "embed", "form", "input"],
-    // منع الأحداث الخطرة
-    FORBID_ATTR: ["onerror", "onload", "onclick", "onmouseover", "onmouseout", "onfocus", "onblur"],
-  })
+  return DOMPurify.sanitize(html, RICH_TEXT_POLICY)
+}
+
+/**
+ * تنقية HTML لكتلة HTML المخصص (custom-html)
+ */
+export function sanitizeCustomHTML(html: string): string {
+  return DOMPurify.sanitize(html, CUSTOM_HTML_POLICY)
 }
@@ -0,0 +1,313 @@
+"""
+Benchmarks for the content tooling.
+
+Times page building, serialization, compression, translation and startup on
+synthetic corpora of 10, 1k and 100k pages/strings, and records the peak
+Python heap (tracemalloc) and peak RSS of each case. Every case runs in a
+fresh process so one case's memory high-water mark never hides another's.
+
+Results are written as JSON; `--baseline` compares them against a stored run
+and exits non-zero when a case got slower or hungrier than the tolerance.
+
+Usage:
+    python scripts/benchmarks.py
+    python scripts/benchmarks.py --sizes 10 1000 --save-baseline
+    python scripts/benchmarks.py --baseline build/benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from page_generator import build_page, iter_tasks
+from page_writers import compress_variants, serialize_page
+from translation_engine import Translator, load_table
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+RESULTS_DIR = os.path.join(REPO_ROOT, "build", "benchmarks")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "latest.json")
+BASELINE_FILE = os.path.join(RESULTS_DIR, "baseline.json")
+
+SIZES = (10, 1_000, 100_000)
+# Pages are built once and reused for the serialization/translation cases,
+# so their memory stays flat no matter how large the corpus is
+SAMPLE_PAGES = 500
+TIMESTAMP = "2024-01-01T00:00:00"
+DEFAULT_REPEATS = 5
+STARTUP_REPEATS = 5
+# Allowed slowdown or memory growth before a case counts as a regression; cases
+# faster than the noise floor are too short to time reliably and only memory is compared
+DEFAULT_TOLERANCE = 0.25
+NOISE_FLOOR_SECONDS = 0.005
+# Filler that no table entry covers, so translation also exercises partial matches
+FILLER_WORDS = ["و", "في", "مع", "الطلاب", "برنامج", "2024", "جديد", "للجميع"]
+
+
+def synthetic_spec(size):
+    """A spec with `size` home-recipe pages, each with its own Arabic title."""
+    return {
+        "languages": ["ar"],
+        "pages": [
+            {
+                "slug": f"bench/page-{i}",
+                "titleAr": f"صفحة {i}",
+                "titleEn": f"Page {i}",
+                "content": {"hero": {"titleAr": f"مرحباً بكم {i}"}},
+            }
+            for i in range(size)
+        ],
+    }
+
+
+def synthetic_strings(table, size, seed=0):
+    """Yield `size` Arabic strings mixing table phrases with uncovered filler."""
+    rng = random.Random(seed)
+    phrases = sorted(table)
+    for _ in range(size):
+        words = [rng.choice(phrases) for _ in range(rng.randint(1, 3))]
+        words.insert(rng.randrange(len(words) + 1), rng.choice(FILLER_WORDS))
+        yield " ".join(words)
+
+
+def sample_pages(size):
+    spec = synthetic_spec(min(size, SAMPLE_PAGES))
+    return [build_page(task.page, task.recipe, task.language, task.timestamp) for task in iter_tasks(spec, TIMESTAMP)]
+
+
+def _cycle(items, size):
+    for i in range(size):
+        yield items[i % len(items)]
+
+
+# Each benchmark has a setup (untimed) and a run that returns the items processed
+
+
+def setup_build(size):
+    return list(iter_tasks(synthetic_spec(size), TIMESTAMP))
+
+
+def run_build(tasks):
+    for task in tasks:
+        build_page(task.page, task.recipe, task.language, task.timestamp)
+    return len(tasks)
+
+
+def setup_sample(size):
+    return sample_pages(size), size
+
+
+def run_serialize_pretty(state):
+    pages, size = state
+    for page in _cycle(pages, size):
+        serialize_page(page, "pretty")
+    return size
+
+
+def run_serialize_compact(state):
+    pages, size = state
+    for page in _cycle(pages, size):
+        serialize_page(page, "compact")
+    return size
+
+
+def setup_compress(size):
+    texts = [serialize_page(page, "compact").encode("utf-8") for page in sample_pages(size)]
+    return texts, size
+
+
+def run_compress_gz(state):
+    texts, size = state
+    for text in _cycle(texts, size):
+        compress_variants(text, ("gz",))
+    return size
+
+
+def setup_translate_strings(size):
+    table = load_table()
+    return table, list(synthetic_strings(table, size))
+
+
+def run_translate_strings(state):
+    table, strings = state
+    # A fresh translator per run, so the memo cache starts cold
+    translator = Translator(table)
+    for text in strings:
+        translator.translate(text)
+    return len(strings)
+
+
+def setup_translate_pages(size):
+    return load_table(), sample_pages(size), size
+
+
+def run_translate_pages(state):
+    table, pages, size = state
+    translator = Translator(table)
+    for page in _cycle(pages, size):
+        translator.translate_page(page, overwrite=True)
+    return size
+
+
+BENCHMARKS = {
+    "build": (setup_build, run_build, "pages"),
+    "serialize-pretty": (setup_sample, run_serialize_pretty, "pages"),
+    "serialize-compact": (setup_sample, run_serialize_compact, "pages"),
+    "compress-gz": (setup_compress, run_compress_gz, "pages"),
+    "translate-strings": (setup_translate_strings, run_translate_strings, "strings"),
+    "translate-pages": (setup_translate_pages, run_translate_pages, "pages"),
+}
+
+
+def run_case(name, size, repeats):
+    """Run one benchmark case; meant to be called in a fresh process."""
+    setup, run, unit = BENCHMARKS[name]
+    state = setup(size)
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        count = run(state)
+        timings.append(time.perf_counter() - started)
+    # Memory is measured in a separate pass: tracemalloc slows allocation down
+    tracemalloc.start()
+    run(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    seconds = min(timings)
+    return {
+        "benchmark": name,
+        "size": size,
+        "unit": unit,
+        "seconds": seconds,
+        "perSecond": count / seconds if seconds else None,
+        "peakBytes": peak,
+        "maxRssKb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_startup(repeats=STARTUP_REPEATS):
+    """Median wall time of `create-home-page-template.py --help` and of a bare interpreter."""
+
+    def median_seconds(command):
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            subprocess.run(command, cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL)
+            timings.append(time.perf_counter() - started)
+        return sorted(timings)[len(timings) // 2]
+
+    interpreter = median_seconds([sys.executable, "-c", "pass"])
+    script = median_seconds([sys.executable, os.path.join(SCRIPTS_DIR, "create-home-page-template.py"), "--help"])
+    return {
+        "benchmark": "startup",
+        "size": None,
+        "unit": "runs",
+        "seconds": script,
+        "perSecond": 1 / script,
+        "importSeconds": max(0.0, script - interpreter),
+        "peakBytes": None,
+        "maxRssKb": None,
+    }
+
+
+def case_key(result):
+    return result["benchmark"] if result["size"] is None else f"{result['benchmark']}@{result['size']}"
+
+
+def run_suite(names, sizes, repeats=DEFAULT_REPEATS):
+    results = {}
+    for name in names:
+        if name == "startup":
+            result = run_startup()
+            results[case_key(result)] = result
+            print(f"  {case_key(result):<28} {result['seconds'] * 1000:9.1f} ms", flush=True)
+            continue
+        for size in sizes:
+            # The largest corpora take long enough that one timed run is representative
+            case_repeats = repeats if size < SIZES[-1] else 1
+            with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+                result = executor.submit(run_case, name, size, case_repeats).result()
+            results[case_key(result)] = result
+            print(
+                f"  {case_key(result):<28} {result['perSecond']:>12,.0f} {result['unit']}/s"
+                f" {result['peakBytes'] / 1024 / 1024:9.1f} MiB peak",
+                flush=True,
+            )
+    return {
+        "createdAt": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Return a list of regression messages for cases present in both runs."""
+    regressions = []
+    for key, result in current["results"].items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            continue
+        if previous["seconds"] >= NOISE_FLOOR_SECONDS and result["seconds"] > previous["seconds"] * (1 + tolerance):
+            regressions.append(
+                f"{key}: {previous['seconds'] * 1000:.1f} ms → {result['seconds'] * 1000:.1f} ms "
+                f"({result['seconds'] / previous['seconds'] - 1:+.0%})"
+            )
+        if result["peakBytes"] and previous["peakBytes"] and result["peakBytes"] > previous["peakBytes"] * (1 + tolerance):
+            regressions.append(
+                f"{key}: peak memory {previous['peakBytes']:,} → {result['peakBytes']:,} bytes "
+                f"({result['peakBytes'] / previous['peakBytes'] - 1:+.0%})"
+            )
+    return regressions
+
+
+def write_results(results, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+def main(argv=None):
+    names = ["startup", *BENCHMARKS]
+    parser = argparse.ArgumentParser(description="Benchmark the page generator and translation tooling.")
+    parser.add_argument("--benchmarks", nargs="+", choices=names, default=names)
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES), help="corpus sizes (pages/strings)")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="timed runs per case; the best is kept")
+    parser.add_argument("--out", default=RESULTS_FILE, help="where to write the results JSON")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown/memory growth")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also store the results as {BASELINE_FILE}")
+    args = parser.parse_args(argv)
+
+    print(f"⏱️  Running {len(args.benchmarks)} benchmarks on sizes {', '.join(map(str, args.sizes))}")
+    results = run_suite(args.benchmarks, args.sizes, args.repeats)
+    write_results(results, args.out)
+    print(f"📁 Results saved to: {args.out}")
+    if args.save_baseline:
+        write_results(results, BASELINE_FILE)
+        print(f"📌 Baseline saved to: {BASELINE_FILE}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regressions beyond {args.tolerance:.0%}:")
+            for message in regressions:
+                print(f"   {message}")
+            return 1
+        print(f"✅ No regressions beyond {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
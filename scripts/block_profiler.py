@@ -0,0 +1,385 @@
+"""
+Payload-size and render-cost profile of page blocks.
+
+One pass over a page corpus (generated pages, NDJSON builds or an export)
+measures every block:
+
+    bytes, gzipBytes    size of the serialized block, raw and gzipped on its own
+    images, imagePixels image fields and the pixels they request (width × height in the URL)
+    motion              style properties that make the browser animate or repaint:
+                        entrance animation, hover scale/rotate/translate/shadow, backdrop blur
+    items               entries of list content (gallery images, testimonials, departments, …)
+
+Per page the same metrics are summed, with gzipBytes taken over the whole
+page. The report aggregates blocks per type, lists the heaviest pages and is
+printed as a table and written as JSON.
+
+Budgets cap any metric per block, per block type or per page:
+
+    {"block": {"gzipBytes": 2500}, "page": {"gzipBytes": 8000, "images": 20},
+     "types": {"gallery": {"items": 12}, "hero": {"imagePixels": 1280000}}}
+
+Large corpora are profiled in a process pool (--workers); the report is
+folded together in page order, so it does not depend on the pool size.
+Every block or page over budget is reported and the run exits non-zero, so a
+build fails before heavy pages ship. Interned blocks (stylePreset) are
+expanded with the style-presets.json found next to the pages or --presets.
+
+Usage:
+    python scripts/block_profiler.py generated-pages
+    python scripts/block_profiler.py generated-pages --budgets budgets.json
+    python scripts/block_profiler.py pages.ndjson --max-block-gzip 2500 --max-page-gzip 8000
+"""
+
+import argparse
+import gzip
+import hashlib
+import heapq
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+from page_generator import POOL_CHUNK_SIZE, POOL_WINDOW_PER_WORKER
+from page_writers import GZIP_LEVEL
+from style_presets import PRESETS_FILE, expand_block, find_presets, load_presets
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT_FILE = os.path.join(REPO_ROOT, "build", "benchmarks", "block-profile.json")
+METRICS = ("bytes", "gzipBytes", "images", "imagePixels", "motion", "items")
+BUDGET_LEVELS = ("block", "page", "types")
+# Same fields image_pipeline.py resolves; importing it would pull in Pillow
+IMAGE_FIELDS = ("image", "url")
+# Style properties that cost client-side work, with the values that leave them idle
+MOTION_STYLES = {
+    "animation": ("none", ""),
+    "hoverScale": ("none", "100", ""),
+    "hoverRotate": ("0", "none", ""),
+    "hoverTranslateX": ("0", "none", ""),
+    "hoverTranslateY": ("0", "none", ""),
+    "hoverShadow": ("none", ""),
+    "backdropBlur": ("none", ""),
+}
+BLOCKS_PLACEHOLDER = "\0blocks\0"
+HEAVIEST_PAGES = 10
+MAX_VIOLATIONS = 1000
+
+_gzip_sizes = {}
+_requested_sizes = {}
+
+
+def gzip_size(data):
+    """Gzipped size of `data`; memoized, since template blocks repeat across pages."""
+    key = hashlib.sha1(data).digest()
+    size = _gzip_sizes.get(key)
+    if size is None:
+        size = _gzip_sizes[key] = len(gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0))
+    return size
+
+
+def _serialize(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def requested_size(url):
+    """(width, height) an image URL asks for in its query (placeholders, resizing CDNs), else None."""
+    if url not in _requested_sizes:
+        query = parse_qs(urlsplit(url).query)
+        try:
+            _requested_sizes[url] = int(query["width"][0]), int(query["height"][0])
+        except (KeyError, ValueError):
+            _requested_sizes[url] = None
+    return _requested_sizes[url]
+
+
+def _image_sizes(value):
+    """Yield the requested (width, height) of every image field, or None when the URL does not say."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in IMAGE_FIELDS and isinstance(item, str):
+                yield requested_size(item)
+            elif isinstance(item, (dict, list)):
+                yield from _image_sizes(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _image_sizes(item)
+
+
+def motion_properties(styles):
+    """Style properties of a block that animate or repaint on the client."""
+    return [key for key, idle in MOTION_STYLES.items() if str(styles.get(key, "")) not in idle]
+
+
+def profile_block(block, presets=None, data=None):
+    """Metrics of one block; `data` is its serialization when the caller already has it."""
+    data = data or _serialize(block)
+    if presets and "stylePreset" in block:
+        block = expand_block(block, presets)
+    content = block.get("content") or {}
+    styles = block.get("styles") or {}
+    sizes = list(_image_sizes(content))
+    lists = {key: len(value) for key, value in content.items() if isinstance(value, list)}
+    return {
+        "id": block.get("id"),
+        "type": block.get("type", "unknown"),
+        "bytes": len(data),
+        "gzipBytes": gzip_size(data),
+        "images": len(sizes),
+        "imageSizes": [f"{size[0]}x{size[1]}" if size else None for size in sizes],
+        "imagePixels": sum(size[0] * size[1] for size in sizes if size),
+        "motion": motion_properties(styles),
+        "gradient": styles.get("backgroundColor") == "gradient",
+        "lists": lists,
+        "items": sum(lists.values()),
+    }
+
+
+def metric(profile, name):
+    value = profile[name]
+    return len(value) if isinstance(value, list) else value
+
+
+def profile_page(page, presets=None):
+    """(page totals, block profiles) of one page."""
+    serialized = [_serialize(block) for block in page.get("blocks") or []]
+    blocks = [profile_block(block, presets, data) for block, data in zip(page.get("blocks") or [], serialized)]
+    totals = {name: sum(metric(block, name) for block in blocks) for name in METRICS}
+    # The page is serialized around a placeholder and the block bytes spliced in, so no block is encoded twice
+    head, _, tail = _serialize({**page, "blocks": BLOCKS_PLACEHOLDER}).partition(_serialize(BLOCKS_PLACEHOLDER))
+    data = b"".join((head, b"[", b",".join(serialized), b"]", tail))
+    totals["bytes"] = len(data)
+    totals["gzipBytes"] = len(gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0))
+    return totals, blocks
+
+
+def _page_id(page):
+    return page.get("id") or page.get("slug")
+
+
+def _profile_chunk(pages, presets):
+    return [(_page_id(page), *profile_page(page, presets)) for page in pages]
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def profile_pages(pages, presets=None, workers=1):
+    """Yield (page id, totals, block profiles) in page order, in a process pool when workers > 1."""
+    if workers <= 1:
+        for page in pages:
+            yield (_page_id(page), *profile_page(page, presets))
+        return
+    window = workers * POOL_WINDOW_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunked(pages, POOL_CHUNK_SIZE):
+            pending.append(executor.submit(_profile_chunk, chunk, presets))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def load_budgets(path=None, overrides=None):
+    """Budgets from a JSON file, with {level: {metric: limit}} overrides applied on top."""
+    budgets = {"block": {}, "page": {}, "types": {}}
+    if path:
+        with open(path, encoding="utf-8") as f:
+            loaded = json.load(f)
+        unknown = set(loaded) - set(BUDGET_LEVELS)
+        if unknown:
+            raise ValueError(f"unknown budget levels: {', '.join(sorted(unknown))}")
+        for level in BUDGET_LEVELS:
+            budgets[level].update(loaded.get(level, {}))
+    for level, limits in (overrides or {}).items():
+        budgets[level].update(limits)
+    for limits in [budgets["block"], budgets["page"], *budgets["types"].values()]:
+        unknown = set(limits) - set(METRICS)
+        if unknown:
+            raise ValueError(f"unknown budget metrics: {', '.join(sorted(unknown))}")
+    return budgets
+
+
+def _over(values, limits):
+    return [(name, values[name], limit) for name, limit in limits.items() if values[name] > limit]
+
+
+class CorpusProfile:
+    """Aggregates page profiles as they stream by and checks them against budgets."""
+
+    def __init__(self, budgets=None, presets=None):
+        self.budgets = budgets or {"block": {}, "page": {}, "types": {}}
+        self.presets = presets
+        self.pages = 0
+        self.blocks = 0
+        self.totals = dict.fromkeys(METRICS, 0)
+        self.types = {}
+        self.violations = []
+        self.violation_count = 0
+        self._heaviest = []
+
+    def _violate(self, page_id, block_id, block_type, name, value, limit):
+        self.violation_count += 1
+        if len(self.violations) < MAX_VIOLATIONS:
+            self.violations.append(
+                {"page": page_id, "block": block_id, "type": block_type, "metric": name, "value": value, "limit": limit}
+            )
+
+    def add(self, page):
+        """Profile one page and fold it into the report; returns (page totals, block profiles)."""
+        totals, blocks = profile_page(page, self.presets)
+        self.record(_page_id(page), totals, blocks)
+        return totals, blocks
+
+    def record(self, page_id, totals, blocks):
+        """Fold an already profiled page into the report."""
+        self.pages += 1
+        self.blocks += len(blocks)
+        for name in METRICS:
+            self.totals[name] += totals[name]
+        for block in blocks:
+            values = {name: metric(block, name) for name in METRICS}
+            stats = self.types.setdefault(block["type"], {
+                "blocks": 0, "animated": 0, "hover": 0, "gradient": 0,
+                "motionProperties": {},
+                **{name: {"total": 0, "max": 0} for name in METRICS},
+            })
+            stats["blocks"] += 1
+            stats["animated"] += "animation" in block["motion"]
+            stats["hover"] += any(key.startswith("hover") for key in block["motion"])
+            stats["gradient"] += block["gradient"]
+            for key in block["motion"]:
+                stats["motionProperties"][key] = stats["motionProperties"].get(key, 0) + 1
+            for name, value in values.items():
+                stats[name]["total"] += value
+                stats[name]["max"] = max(stats[name]["max"], value)
+            limits = {**self.budgets["block"], **self.budgets["types"].get(block["type"], {})}
+            for name, value, limit in _over(values, limits):
+                self._violate(page_id, block["id"], block["type"], name, value, limit)
+        for name, value, limit in _over(totals, self.budgets["page"]):
+            self._violate(page_id, None, None, name, value, limit)
+
+        if len(self._heaviest) == HEAVIEST_PAGES and totals["gzipBytes"] <= self._heaviest[0][0]:
+            return
+        entry = (totals["gzipBytes"], self.pages, {
+            "page": page_id,
+            **totals,
+            "blocks": [{key: block[key] for key in ("id", "type", "bytes", "gzipBytes", "images", "items")} for block in blocks],
+        })
+        if len(self._heaviest) < HEAVIEST_PAGES:
+            heapq.heappush(self._heaviest, entry)
+        else:
+            heapq.heappushpop(self._heaviest, entry)
+
+    def report(self):
+        return {
+            "profiledAt": datetime.now().isoformat(),
+            "pages": self.pages,
+            "blocks": self.blocks,
+            "totals": self.totals,
+            "budgets": self.budgets,
+            "types": {
+                block_type: {
+                    **stats,
+                    **{name: {**stats[name], "mean": round(stats[name]["total"] / stats["blocks"], 1)} for name in METRICS},
+                }
+                for block_type, stats in sorted(self.types.items())
+            },
+            "heaviestPages": [entry for _, _, entry in sorted(self._heaviest, key=lambda item: (-item[0], item[1]))],
+            "violationCount": self.violation_count,
+            "violations": self.violations,
+        }
+
+
+def print_table(report):
+    header = f"  {'block type':<14}{'blocks':>7}{'mean B':>9}{'max B':>9}{'mean gz':>9}{'max gz':>8}{'images':>8}{'max px':>11}{'motion':>8}{'max items':>10}"
+    print(header)
+    print("  " + "-" * (len(header) - 2))
+    for block_type, stats in report["types"].items():
+        print(
+            f"  {block_type:<14}{stats['blocks']:>7,}{stats['bytes']['mean']:>9,.0f}{stats['bytes']['max']:>9,}"
+            f"{stats['gzipBytes']['mean']:>9,.0f}{stats['gzipBytes']['max']:>8,}{stats['images']['total']:>8,}"
+            f"{stats['imagePixels']['max']:>11,}{stats['motion']['mean']:>8.1f}{stats['items']['max']:>10,}"
+        )
+
+
+def print_violations(report, limit=20):
+    for violation in report["violations"][:limit]:
+        where = f"{violation['page']} / {violation['block']} ({violation['type']})" if violation["block"] else violation["page"]
+        print(f"   {where}: {violation['metric']} {violation['value']:,} > {violation['limit']:,}")
+    if report["violationCount"] > limit:
+        print(f"   … and {report['violationCount'] - limit} more (see the JSON report)")
+
+
+def write_report(report, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile payload size and render cost per block, with budgets.")
+    parser.add_argument("paths", nargs="+", help="page JSON/NDJSON files or directories, or export collection directories")
+    parser.add_argument("--budgets", help="budgets JSON ({block, page, types} → {metric: limit})")
+    parser.add_argument("--max-block-gzip", type=int, help="gzipped bytes allowed per block")
+    parser.add_argument("--max-page-gzip", type=int, help="gzipped bytes allowed per page")
+    parser.add_argument("--max-page-images", type=int, help="images allowed per page")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="process pool size (default: CPU count)")
+    parser.add_argument("--presets", help=f"style preset table for interned pages (default: <dir>/{PRESETS_FILE})")
+    parser.add_argument("--out", default=REPORT_FILE, help="where to write the JSON report")
+    args = parser.parse_args(argv)
+    # Deferred so the page generator can profile its own output without loading the importer
+    from page_patch import iter_deployed_pages
+
+    overrides = {"block": {}, "page": {}}
+    if args.max_block_gzip is not None:
+        overrides["block"]["gzipBytes"] = args.max_block_gzip
+    if args.max_page_gzip is not None:
+        overrides["page"]["gzipBytes"] = args.max_page_gzip
+    if args.max_page_images is not None:
+        overrides["page"]["images"] = args.max_page_images
+    try:
+        budgets = load_budgets(args.budgets, overrides)
+    except ValueError as error:
+        parser.error(str(error))
+    presets = load_presets(args.presets) if args.presets else find_presets(args.paths)
+
+    started = time.perf_counter()
+    profile = CorpusProfile(budgets, presets)
+    for page_id, totals, blocks in profile_pages(iter_deployed_pages(args.paths), presets, args.workers):
+        profile.record(page_id, totals, blocks)
+    report = profile.report()
+    seconds = time.perf_counter() - started
+
+    print_table(report)
+    totals = report["totals"]
+    print(f"✅ Profiled {report['pages']} pages ({report['blocks']} blocks) in {seconds:.2f}s")
+    if report["pages"]:
+        print(f"📦 {totals['bytes'] / report['pages']:,.0f} bytes, {totals['gzipBytes'] / report['pages']:,.0f} gzipped per page on average")
+    for entry in report["heaviestPages"][:3]:
+        heaviest = max(entry["blocks"], key=lambda block: block["gzipBytes"], default=None)
+        detail = f", heaviest block {heaviest['type']} {heaviest['gzipBytes']:,} gzipped" if heaviest else ""
+        print(f"🐘 {entry['page']}: {entry['gzipBytes']:,} bytes gzipped, {entry['images']} images{detail}")
+    write_report(report, args.out)
+    print(f"📁 Report saved to: {args.out}")
+    if report["violationCount"]:
+        print(f"❌ {report['violationCount']} budget violations:")
+        print_violations(report)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
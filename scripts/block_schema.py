@@ -0,0 +1,507 @@
+"""
+Schema validation of generated pages against lib/types/blocks.ts.
+
+The block interfaces (`PageBlockNew`, `HeroSliderBlock`, `BlockStyles`, …) are
+parsed once into a JSON schema cached under build/schema, keyed by a hash of
+blocks.ts, and compiled into validator closures the first time a process
+needs them. Each block is checked as a `PageBlockNew`, and its `content` is
+checked as a `Partial<…>` of the `RealBlock` member whose `type` matches the
+block's type, so renamed or misspelt fields are reported as unknown.
+
+Errors carry the file, the line for NDJSON input and a JSON path:
+
+    pages.ndjson:12 $.blocks[0].type: expected one of "about", "contact-section", …
+
+Usage:
+    python scripts/block_schema.py generated-pages
+    python scripts/block_schema.py pages.ndjson --workers 8 --report schema-errors.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from page_writers import list_page_files
+from style_presets import expand_page, find_presets
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BLOCK_TYPES_FILE = os.path.join(REPO_ROOT, "lib", "types", "blocks.ts")
+SCHEMA_DIR = os.path.join(REPO_ROOT, "build", "schema")
+BLOCK_INTERFACE = "PageBlockNew"
+BLOCK_UNION = "RealBlock"
+# NDJSON lines handed to a worker per task, and tasks kept in flight per worker
+CHUNK_LINES = 500
+WINDOW_PER_WORKER = 4
+MAX_PRINTED_ERRORS = 50
+
+PRIMITIVES = {"string", "number", "boolean", "any", "unknown", "null", "undefined"}
+TOKEN_RE = re.compile(r'\s*(?:(?P<string>"[^"]*"|\'[^\']*\')|(?P<name>[A-Za-z_$][\w$]*)|(?P<punct>[{}\[\]<>()|:;?,=]))')
+COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.S)
+
+
+# Types are stored as JSON-friendly lists so the parsed schema can be cached:
+#   ["prim", "string"]  ["lit", "hero-slider"]  ["ref", "BlockStyles"]
+#   ["array", T]  ["union", [T, …]]  ["partial", T]
+#   ["object", {name: [T, optional]}, index T or None]
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def _tokenize(source):
+    source = COMMENT_RE.sub("", source)
+    tokens = []
+    position = 0
+    while True:
+        match = TOKEN_RE.match(source, position)
+        if match is None:
+            if source[position:].strip():
+                raise SchemaError(f"Cannot parse type source near {source[position:position + 40]!r}")
+            return tokens
+        position = match.end()
+        if match.group("string"):
+            tokens.append(("string", match.group("string")[1:-1]))
+        elif match.group("name"):
+            tokens.append(("name", match.group("name")))
+        else:
+            tokens.append(("punct", match.group("punct")))
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self, offset=0):
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self, expected=None):
+        token = self.peek()
+        if token[0] is None or (expected is not None and token[1] != expected):
+            raise SchemaError(f"Expected {expected!r}, got {token[1]!r}")
+        self.position += 1
+        return token[1]
+
+    def accept(self, value):
+        if self.peek()[1] == value and self.peek()[0] != "string":
+            self.position += 1
+            return True
+        return False
+
+    def parse_declarations(self):
+        interfaces, aliases = {}, {}
+        while self.peek()[0] is not None:
+            self.accept("export")
+            keyword = self.take()
+            if keyword == "interface":
+                name = self.take()
+                interfaces[name] = self.parse_object()
+            elif keyword == "type":
+                name = self.take()
+                self.take("=")
+                aliases[name] = self.parse_type()
+                self.accept(";")
+            else:
+                raise SchemaError(f"Unsupported declaration {keyword!r}")
+        return interfaces, aliases
+
+    def parse_object(self):
+        self.take("{")
+        fields, index = {}, None
+        while not self.accept("}"):
+            if self.accept("["):
+                self.take()  # key name
+                self.take(":")
+                self.take()  # key type
+                self.take("]")
+                self.take(":")
+                index = self.parse_type()
+            else:
+                name = self.take()
+                optional = self.accept("?")
+                self.take(":")
+                fields[name] = [self.parse_type(), optional]
+            self.accept(";") or self.accept(",")
+        return ["object", fields, index]
+
+    def parse_type(self):
+        self.accept("|")
+        members = [self.parse_postfix()]
+        while self.accept("|"):
+            members.append(self.parse_postfix())
+        return members[0] if len(members) == 1 else ["union", members]
+
+    def parse_postfix(self):
+        node = self.parse_primary()
+        while self.peek()[1] == "[" and self.peek(1)[1] == "]":
+            self.position += 2
+            node = ["array", node]
+        return node
+
+    def parse_primary(self):
+        kind, value = self.peek()
+        if kind == "string":
+            self.position += 1
+            return ["lit", value]
+        if value == "{":
+            return self.parse_object()
+        if value == "(":
+            self.position += 1
+            node = self.parse_type()
+            self.take(")")
+            return node
+        name = self.take()
+        if name in ("Array", "Partial"):
+            self.take("<")
+            inner = self.parse_type()
+            self.take(">")
+            return ["array", inner] if name == "Array" else ["partial", inner]
+        if name in PRIMITIVES:
+            return ["prim", name]
+        return ["ref", name]
+
+
+def parse_types(source):
+    """Parse the interfaces and type aliases of a TS types file into a schema dict."""
+    interfaces, aliases = _Parser(_tokenize(source)).parse_declarations()
+    return {"interfaces": interfaces, "aliases": aliases}
+
+
+def load_schema(path=BLOCK_TYPES_FILE, cache_dir=SCHEMA_DIR):
+    """Return the parsed schema of `path`, reusing the cached parse while the file is unchanged."""
+    with open(path, "rb") as f:
+        source = f.read()
+    digest = hashlib.sha1(source).hexdigest()[:12]
+    cache_path = os.path.join(cache_dir, f"{os.path.splitext(os.path.basename(path))[0]}-{digest}.json")
+    if os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            return json.load(f)
+    schema = parse_types(source.decode("utf-8"))
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=2)
+    os.replace(tmp_path, cache_path)
+    return schema
+
+
+def _describe(value):
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    return "array" if isinstance(value, list) else "object"
+
+
+PRIMITIVE_CHECKS = {
+    "string": lambda value: isinstance(value, str),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+class CompiledSchema:
+    """Validator closures for every type of a parsed schema.
+
+    A validator is called as `check(value, path, errors)` and appends
+    `(path, message)` tuples to `errors`.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._named = {}
+        self.block = self._compile_block()
+
+    def named(self, name):
+        if name not in self._named:
+            definition = self.schema["interfaces"].get(name) or self.schema["aliases"].get(name)
+            if definition is None:
+                raise SchemaError(f"Unknown type {name!r}")
+            # Placeholder first, so self-referencing types compile
+            slot = []
+            self._named[name] = lambda value, path, errors: slot[0](value, path, errors)
+            slot.append(self.compile(definition))
+            self._named[name] = slot[0]
+        return self._named[name]
+
+    def resolve(self, node):
+        while node[0] == "ref":
+            name = node[1]
+            node = self.schema["interfaces"].get(name) or self.schema["aliases"].get(name)
+            if node is None:
+                raise SchemaError(f"Unknown type {name!r}")
+        return node
+
+    def compile(self, node, partial=False):
+        kind = node[0]
+        if kind == "prim":
+            if node[1] in ("any", "unknown"):
+                return lambda value, path, errors: None
+            if node[1] == "undefined":
+                return lambda value, path, errors: errors.append((path, "expected no value"))
+            test = PRIMITIVE_CHECKS[node[1]]
+            expected = node[1]
+
+            def check_primitive(value, path, errors):
+                if not test(value):
+                    errors.append((path, f"expected {expected}, got {_describe(value)}"))
+
+            return check_primitive
+        if kind == "lit":
+            literal = node[1]
+
+            def check_literal(value, path, errors):
+                if value != literal:
+                    errors.append((path, f"expected {json.dumps(literal)}, got {json.dumps(value, ensure_ascii=False)}"))
+
+            return check_literal
+        if kind == "ref":
+            return self.compile(self.resolve(node), partial) if partial else self.named(node[1])
+        if kind == "partial":
+            return self.compile(self.resolve(node[1]), partial=True)
+        if kind == "array":
+            check_item = self.compile(node[1])
+
+            def check_array(value, path, errors):
+                if not isinstance(value, list):
+                    errors.append((path, f"expected array, got {_describe(value)}"))
+                    return
+                for i, item in enumerate(value):
+                    check_item(item, f"{path}[{i}]", errors)
+
+            return check_array
+        if kind == "union":
+            return self._compile_union(node[1], partial)
+        if kind == "object":
+            return self._compile_object(node[1], node[2], partial)
+        raise SchemaError(f"Unsupported type node {kind!r}")
+
+    def _compile_union(self, members, partial):
+        members = [self.resolve(member) for member in members]
+        if all(member[0] == "lit" for member in members):
+            allowed = {member[1] for member in members}
+            expected = ", ".join(json.dumps(literal) for literal in sorted(allowed))
+
+            def check_enum(value, path, errors):
+                if not isinstance(value, str) or value not in allowed:
+                    errors.append((path, f"expected one of {expected}, got {json.dumps(value, ensure_ascii=False)}"))
+
+            return check_enum
+        checks = [self.compile(member, partial) for member in members]
+
+        def check_union(value, path, errors):
+            best = None
+            for check in checks:
+                attempt = []
+                check(value, path, attempt)
+                if not attempt:
+                    return
+                if best is None or len(attempt) < len(best):
+                    best = attempt
+            # Report against the closest member; it is almost always the intended one
+            errors.extend(best)
+
+        return check_union
+
+    def _compile_object(self, fields, index, partial):
+        checks = {name: self.compile(field_type) for name, (field_type, _) in fields.items()}
+        required = [] if partial else [name for name, (_, optional) in fields.items() if not optional]
+        check_index = self.compile(index) if index is not None else None
+
+        def check_object(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append((path, f"expected object, got {_describe(value)}"))
+                return
+            for name in required:
+                if name not in value:
+                    errors.append((f"{path}.{name}", "missing required field"))
+            for key, item in value.items():
+                check = checks.get(key, check_index)
+                if check is None:
+                    errors.append((f"{path}.{key}", "unknown field"))
+                else:
+                    check(item, f"{path}.{key}", errors)
+
+        return check_object
+
+    def _compile_block(self):
+        """`PageBlockNew`, with `content` checked against the member its `type` selects."""
+        envelope = self.resolve(["ref", BLOCK_INTERFACE])
+        fields = {name: field for name, field in envelope[1].items() if name != "content"}
+        check_envelope = self._compile_object(fields, envelope[2], partial=False)
+        check_any_content = self.compile(envelope[1]["content"][0])
+        content_checks = {}
+        for member in self.resolve(["ref", BLOCK_UNION])[1]:
+            member_type = self.resolve(member)[1].get("type")
+            if member_type and member_type[0][0] == "lit":
+                content_checks[member_type[0][1]] = self.compile(["partial", member])
+
+        def check_block(value, path, errors):
+            if not isinstance(value, dict):
+                errors.append((path, f"expected object, got {_describe(value)}"))
+                return
+            check_envelope({key: item for key, item in value.items() if key != "content"}, path, errors)
+            if "content" not in value:
+                errors.append((f"{path}.content", "missing required field"))
+                return
+            check_content = content_checks.get(value.get("type"), check_any_content)
+            check_content(value["content"], f"{path}.content", errors)
+
+        return check_block
+
+    def validate_page(self, page, path="$"):
+        """Return the (path, message) errors of one page document."""
+        errors = []
+        if not isinstance(page, dict):
+            return [(path, f"expected page object, got {_describe(page)}")]
+        blocks = page.get("blocks")
+        if not isinstance(blocks, list):
+            return [(f"{path}.blocks", f"expected array, got {_describe(blocks)}")]
+        seen_ids = set()
+        for i, block in enumerate(blocks):
+            block_path = f"{path}.blocks[{i}]"
+            self.block(block, block_path, errors)
+            block_id = block.get("id") if isinstance(block, dict) else None
+            if block_id in seen_ids:
+                errors.append((f"{block_path}.id", f"duplicate block id {block_id!r}"))
+            seen_ids.add(block_id)
+        return errors
+
+
+_compiled = {}
+
+
+def compiled_schema(path=BLOCK_TYPES_FILE):
+    """The compiled schema of `path`, built once per process."""
+    if path not in _compiled:
+        _compiled[path] = CompiledSchema(load_schema(path))
+    return _compiled[path]
+
+
+def _validate_documents(documents, types_path, presets):
+    """Worker: validate (location, page) pairs; returns (pages checked, [(location, path, message)])."""
+    schema = compiled_schema(types_path)
+    problems = []
+    count = 0
+    for location, page in documents:
+        if presets and isinstance(page, dict):
+            page = expand_page(page, presets)
+        count += 1
+        problems.extend((location, path, message) for path, message in schema.validate_page(page))
+    return count, problems
+
+
+def _iter_units(paths):
+    """Yield (path, first line, lines) work units: whole JSON files, NDJSON files in chunks of lines."""
+    for path in paths:
+        if os.path.isdir(path):
+            yield from _iter_units(list_page_files(path))
+        elif path.endswith(".ndjson"):
+            with open(path, encoding="utf-8") as f:
+                chunk, start = [], 1
+                for number, line in enumerate(f, 1):
+                    chunk.append(line)
+                    if len(chunk) == CHUNK_LINES:
+                        yield path, start, chunk
+                        chunk, start = [], number + 1
+                if chunk:
+                    yield path, start, chunk
+        else:
+            yield path, None, None
+
+
+def _validate_unit(unit, types_path, presets):
+    path, start, lines = unit
+    label = os.path.basename(path)
+    try:
+        if lines is None:
+            with open(path, encoding="utf-8") as f:
+                documents = [(label, json.load(f))]
+        else:
+            documents = [
+                (f"{label}:{number}", json.loads(line)) for number, line in enumerate(lines, start) if line.strip()
+            ]
+    except ValueError as error:
+        return 0, [(label, "$", f"invalid JSON: {error}")]
+    return _validate_documents(documents, types_path, presets)
+
+
+def validate_paths(paths, workers=None, types_path=BLOCK_TYPES_FILE):
+    """Validate page files, directories and NDJSON streams; yields (pages, problems) per work unit.
+
+    Results come back in input order while up to `workers` units are checked in
+    parallel. Style-interned pages are expanded with the preset table found
+    next to them before they are checked.
+    """
+    presets = find_presets(paths)
+    compiled_schema(types_path)  # Parse (or load the cached parse) once, before forking workers
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for unit in _iter_units(paths):
+            yield _validate_unit(unit, types_path, presets)
+        return
+    window = workers * WINDOW_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for unit in _iter_units(paths):
+            pending.append(executor.submit(_validate_unit, unit, types_path, presets))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate generated pages against lib/types/blocks.ts.")
+    parser.add_argument("paths", nargs="+", help="page JSON/NDJSON files or directories")
+    parser.add_argument("--types", default=BLOCK_TYPES_FILE, help="TS file declaring the block interfaces")
+    parser.add_argument("--workers", type=int, help="process pool size (default: CPU count)")
+    parser.add_argument("--max-errors", type=int, default=MAX_PRINTED_ERRORS, help="errors to print (all go to --report)")
+    parser.add_argument("--report", help="write every error as JSON to this file")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    pages = 0
+    problems = []
+    for count, unit_problems in validate_paths(args.paths, args.workers, args.types):
+        pages += count
+        for location, path, message in unit_problems:
+            if len(problems) < args.max_errors:
+                print(f"{location} {path}: {message}")
+            problems.append((location, path, message))
+    seconds = time.perf_counter() - started
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(
+                [{"file": location, "path": path, "message": message} for location, path, message in problems],
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+    if not problems:
+        print(f"✅ {pages} pages match {os.path.relpath(args.types, REPO_ROOT)} ({seconds:.2f}s)")
+        return 0
+    # Paths with the array indexes stripped group the same mistake across pages
+    common = Counter((re.sub(r"\[\d+\]", "[]", path), message) for _, path, message in problems)
+    print(f"❌ {len(problems)} errors in {pages} pages ({seconds:.2f}s); most common:")
+    for (path, message), count in common.most_common(10):
+        print(f"   {count:>7}× {path}: {message}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
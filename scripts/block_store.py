@@ -0,0 +1,279 @@
+"""
+Content-addressed block store for dynamic pages.
+
+Pages embed full copies of their blocks, so the same contact section,
+testimonials or department cards are stored, imported and fetched once per
+page. Packing moves every block into a store keyed by the hash of its
+canonical JSON and leaves the page with ordered references:
+
+    <out>/<page>.json            the page, with `blocks` replaced by `blockRefs`
+    <out>/blocks/blk-<hash>.json one document per distinct block
+    <out>/block-store.json       index: bytes and reference count per block
+
+A reference is {"ref": "blk-…", "id": …, "order": …}: the block id and order
+are page-local, so they stay in the page and identical blocks on different
+pages share one stored document. `blocksAr`/`blocksEn` are packed the same way
+into `blockRefsAr`/`blockRefsEn`. Stored blocks never change (an edit is a new
+hash), so they can be cached indefinitely and fetched independently of the
+pages that use them; each document's `id` is its hash, so the blocks
+directory imports as-is with page_importer.py --collection web_page_blocks.
+
+Unpacking restores the original pages exactly. `gc` deletes stored blocks
+that no page in the directory references any more.
+
+Usage:
+    python scripts/block_store.py pack generated-pages --out packed-pages
+    python scripts/block_store.py unpack packed-pages --out expanded-pages
+    python scripts/block_store.py gc packed-pages --dry-run
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from build_cache import content_hash
+from page_importer import iter_page_files
+from page_writers import BLOCK_STORE_INDEX_FILE as INDEX_FILE, FORMATS, NDJSON_FILE, NdjsonWriter, serialize_page, write_file
+
+STORE_SUBDIR = "blocks"
+INDEX_VERSION = 1
+BLOCKS_COLLECTION = "web_page_blocks"
+REF_PREFIX = "blk-"
+# Page field holding blocks -> page field holding their references
+REF_FIELDS = {"blocks": "blockRefs", "blocksAr": "blockRefsAr", "blocksEn": "blockRefsEn"}
+# Keys that identify a block within its page rather than describing its content
+PAGE_LOCAL_KEYS = ("id", "order")
+
+
+def block_ref(body):
+    return REF_PREFIX + content_hash(body)
+
+
+class BlockStore:
+    """One JSON document per distinct block, written once and never modified."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.known = {name[:-len(".json")] for name in os.listdir(directory) if name.startswith(REF_PREFIX) and name.endswith(".json")}
+        self.written = 0
+        self._loaded = {}
+
+    def path(self, ref):
+        return os.path.join(self.directory, f"{ref}.json")
+
+    def put(self, block):
+        """Store a block's content; returns the page-side reference to it."""
+        body = {key: value for key, value in block.items() if key not in PAGE_LOCAL_KEYS}
+        ref = block_ref(body)
+        if ref not in self.known:
+            write_file(self.path(ref), serialize_page({"id": ref, **body}, "compact").encode("utf-8"))
+            self.known.add(ref)
+            self.written += 1
+        return {"ref": ref, **{key: block[key] for key in PAGE_LOCAL_KEYS if key in block}}
+
+    def get(self, ref):
+        """The stored block content of `ref`; memoized, since shared blocks are read once per page."""
+        body = self._loaded.get(ref)
+        if body is None:
+            try:
+                with open(self.path(ref), encoding="utf-8") as f:
+                    document = json.load(f)
+            except FileNotFoundError:
+                raise ValueError(f"block {ref!r} is missing from the store at {self.directory}") from None
+            body = self._loaded[ref] = {key: value for key, value in document.items() if key != "id"}
+        return body
+
+    def size(self, ref):
+        return os.path.getsize(self.path(ref))
+
+    def remove(self, ref):
+        os.remove(self.path(ref))
+        self.known.discard(ref)
+        self._loaded.pop(ref, None)
+
+
+def pack_page(page, store):
+    """The page with every block list replaced by references into `store`."""
+    packed = {}
+    for key, value in page.items():
+        if key in REF_FIELDS and isinstance(value, list):
+            packed[REF_FIELDS[key]] = [store.put(block) for block in value]
+        else:
+            packed[key] = value
+    return packed
+
+
+def unpack_page(page, store):
+    """Inverse of pack_page: references replaced by full blocks."""
+    fields = {ref_field: field for field, ref_field in REF_FIELDS.items()}
+    unpacked = {}
+    for key, value in page.items():
+        if key in fields:
+            unpacked[fields[key]] = [
+                {**{name: ref[name] for name in PAGE_LOCAL_KEYS if name in ref}, **store.get(ref["ref"])} for ref in value
+            ]
+        else:
+            unpacked[key] = value
+    return unpacked
+
+
+def page_refs(page):
+    """Every block reference of a packed page."""
+    for ref_field in REF_FIELDS.values():
+        for ref in page.get(ref_field) or []:
+            yield ref["ref"]
+
+
+def write_index(out_dir, store, ref_counts):
+    """Record bytes and reference counts of the stored blocks."""
+    index = {
+        "version": INDEX_VERSION,
+        "store": os.path.relpath(store.directory, out_dir),
+        "blocks": {ref: {"bytes": store.size(ref), "refs": ref_counts.get(ref, 0)} for ref in sorted(store.known)},
+    }
+    tmp_path = os.path.join(out_dir, f"{INDEX_FILE}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, os.path.join(out_dir, INDEX_FILE))
+    return index
+
+
+class PageSink:
+    """Writes pages as one file each, or as a single NDJSON stream."""
+
+    def __init__(self, out_dir, fmt="pretty"):
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.bytes = 0
+        self._writer = NdjsonWriter(os.path.join(out_dir, NDJSON_FILE)) if fmt == "ndjson" else None
+
+    def write(self, page):
+        text = serialize_page(page, self.fmt)
+        self.bytes += len(text.encode("utf-8"))
+        if self._writer is not None:
+            self._writer.write(text)
+        else:
+            write_file(os.path.join(self.out_dir, f"{page['id']}.json"), text.encode("utf-8"))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def pack_pages(pages, out_dir, store_dir=None, fmt="pretty"):
+    """Pack (page, serialized size) pairs into `out_dir`; returns stats."""
+    os.makedirs(out_dir, exist_ok=True)
+    store = BlockStore(store_dir or os.path.join(out_dir, STORE_SUBDIR))
+    sink = PageSink(out_dir, fmt)
+    started = time.perf_counter()
+    stats = {"pages": 0, "refs": 0, "before": 0}
+    ref_counts = {}
+    try:
+        for page, size in pages:
+            packed = pack_page(page, store)
+            sink.write(packed)
+            stats["pages"] += 1
+            stats["before"] += size
+            for ref in page_refs(packed):
+                ref_counts[ref] = ref_counts.get(ref, 0) + 1
+                stats["refs"] += 1
+    finally:
+        sink.close()
+    write_index(out_dir, store, ref_counts)
+    stats["blocks"] = len(ref_counts)
+    stats["written"] = store.written
+    stats["pageBytes"] = sink.bytes
+    stats["storeBytes"] = sum(store.size(ref) for ref in ref_counts)
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def unpack_pages(pages, out_dir, store_dir, fmt="pretty"):
+    os.makedirs(out_dir, exist_ok=True)
+    store = BlockStore(store_dir)
+    sink = PageSink(out_dir, fmt)
+    count = 0
+    try:
+        for page, _ in pages:
+            sink.write(unpack_page(page, store))
+            count += 1
+    finally:
+        sink.close()
+    return count
+
+
+def collect_garbage(pages, out_dir, store_dir=None, dry_run=False):
+    """Delete stored blocks no page references; returns (removed refs, freed bytes)."""
+    store = BlockStore(store_dir or os.path.join(out_dir, STORE_SUBDIR))
+    ref_counts = {}
+    for page, _ in pages:
+        for ref in page_refs(page):
+            ref_counts[ref] = ref_counts.get(ref, 0) + 1
+    if store.known and not ref_counts:
+        raise ValueError("no packed pages found; refusing to empty the store")
+    missing = set(ref_counts) - store.known
+    if missing:
+        # Sweeping against a store that does not match the pages would delete live blocks
+        raise ValueError(f"{len(missing)} referenced blocks are missing from the store, e.g. {sorted(missing)[0]}")
+    garbage = sorted(store.known - set(ref_counts))
+    freed = sum(store.size(ref) for ref in garbage)
+    if not dry_run:
+        for ref in garbage:
+            store.remove(ref)
+        write_index(out_dir, store, ref_counts)
+    return garbage, freed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack pages into a content-addressed block store, unpack them, or collect garbage.")
+    parser.add_argument("command", choices=["pack", "unpack", "gc"])
+    parser.add_argument("paths", nargs="+", help="page JSON/NDJSON files or directories (packed pages for unpack/gc)")
+    parser.add_argument("--out", help="output directory (pack/unpack); gc works on the first path")
+    parser.add_argument("--store", help=f"block store directory (default: <packed dir>/{STORE_SUBDIR})")
+    parser.add_argument("--format", choices=FORMATS, default="pretty", help="page output format")
+    parser.add_argument("--dry-run", action="store_true", help="gc: only report what would be deleted")
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        if not args.out:
+            parser.error("pack needs --out")
+        stats = pack_pages(iter_page_files(args.paths), args.out, args.store, args.format)
+        after = stats["pageBytes"] + stats["storeBytes"]
+        print(f"✅ Packed {stats['pages']} pages: {stats['refs']} block references to {stats['blocks']} distinct blocks ({stats['seconds']:.2f}s)")
+        print(f"🧱 {stats['written']} new blocks written to the store")
+        if stats["before"]:
+            print(f"📉 {stats['before']:,} → {after:,} bytes ({after / stats['before']:.0%}), pages alone {stats['pageBytes']:,} bytes")
+        if stats["pages"]:
+            print(f"📄 {stats['pageBytes'] / stats['pages']:,.0f} bytes per page fetch, blocks cached separately")
+        print(f"📁 Packed pages saved to: {args.out}")
+        return 0
+
+    source = args.paths[0] if os.path.isdir(args.paths[0]) else os.path.dirname(os.path.abspath(args.paths[0]))
+    store_dir = args.store or os.path.join(source, STORE_SUBDIR)
+    if args.command == "unpack":
+        if not args.out:
+            parser.error("unpack needs --out")
+        try:
+            count = unpack_pages(iter_page_files(args.paths), args.out, store_dir, args.format)
+        except ValueError as error:
+            print(f"❌ {error}")
+            return 1
+        print(f"✅ Unpacked {count} pages")
+        print(f"📁 Pages saved to: {args.out}")
+        return 0
+
+    try:
+        garbage, freed = collect_garbage(iter_page_files(args.paths), source, store_dir, args.dry_run)
+    except ValueError as error:
+        print(f"❌ {error}")
+        return 1
+    verb = "Would delete" if args.dry_run else "Deleted"
+    print(f"🗑️  {verb} {len(garbage)} unreferenced blocks ({freed:,} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
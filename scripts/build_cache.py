@@ -0,0 +1,176 @@
+"""
+Content-hash build cache for generated pages.
+
+The cache lives next to the generated pages and records, per page id, a hash
+of the build inputs (spec entry, recipe, language, the recipe sources and the
+output format), a hash of the built content, a hash per block and a hash of
+the bytes written with their precompressed variants. A rebuild skips every
+page whose inputs are unchanged and whose files are all on disk, so its cost
+follows the size of the edit rather than the size of the corpus. Rebuilt
+pages keep their `createdAt`, and keep their `updatedAt` too when the content
+turns out identical. Each build writes a manifest listing added, changed and
+removed pages and the changed blocks of each page.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from page_writers import MANIFEST_FILE, remove_file
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = ".build-cache.json"
+TIMESTAMP_KEYS = ("createdAt", "updatedAt")
+# Sources whose edits change what a recipe builds
+RECIPE_SOURCES = ("page_blocks.py", "page_generator.py", "page_writers.py", "style_presets.py")
+
+
+def content_hash(value):
+    text = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def page_hashes(page):
+    """Return (content hash without timestamps, {block id: block hash})."""
+    body = {key: value for key, value in page.items() if key not in TIMESTAMP_KEYS}
+    return content_hash(body), {block["id"]: content_hash(block) for block in page.get("blocks", [])}
+
+
+def recipes_fingerprint(extra=None):
+    digest = hashlib.sha1()
+    for name in RECIPE_SOURCES:
+        with open(os.path.join(SCRIPTS_DIR, name), "rb") as f:
+            digest.update(f.read())
+    if extra is not None:
+        digest.update(json.dumps(extra, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def apply_previous_stamps(page, content_digest, previous):
+    """Carry timestamps over from the previous build of the same page."""
+    if previous:
+        page["createdAt"] = previous["createdAt"]
+        if previous["hash"] == content_digest:
+            page["updatedAt"] = previous["updatedAt"]
+    return page
+
+
+class BuildCache:
+    def __init__(self, out_dir, fingerprint):
+        self.out_dir = out_dir
+        self.fingerprint = fingerprint
+        self.path = os.path.join(out_dir, CACHE_FILE)
+        self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f).get("pages", {})
+        self.seen = set()
+        self.added = []
+        self.changed = []
+        self.unchanged = 0
+
+    def input_hash(self, page, recipe, language):
+        return content_hash([page, recipe, language, self.fingerprint])
+
+    def is_fresh(self, page_id, input_digest):
+        """True if the page was built from identical inputs and its file is still on disk."""
+        self.seen.add(page_id)
+        entry = self.entries.get(page_id)
+        fresh = (
+            entry is not None
+            and entry["input"] == input_digest
+            and self._on_disk(entry["file"], entry.get("variants", []))
+        )
+        if fresh:
+            self.unchanged += 1
+        return fresh
+
+    def _on_disk(self, filename, variants):
+        path = os.path.join(self.out_dir, filename)
+        return all(os.path.exists(path + extension) for extension in ("", *variants))
+
+    def previous(self, page_id):
+        entry = self.entries.get(page_id)
+        if entry is None:
+            return None
+        return {"hash": entry["hash"], "createdAt": entry["createdAt"], "updatedAt": entry["updatedAt"]}
+
+    def record(
+        self, page_id, filename, input_digest, content_digest, block_hashes, created_at, updated_at,
+        output_digest=None, variants=(),
+    ):
+        """Store a rebuilt page; returns True when its file has to be written.
+
+        That is when its content changed, when the bytes to write differ from
+        the file on disk (another format or compression), or when the file or
+        one of its precompressed variants is missing. The manifest still only
+        reports content changes.
+        """
+        entry = self.entries.get(page_id)
+        variants = sorted(variants)
+        write = (
+            entry is None
+            or entry["hash"] != content_digest
+            or entry.get("output") != output_digest
+            or entry.get("variants", []) != variants
+            or not self._on_disk(filename, variants)
+        )
+        if entry is None:
+            self.added.append(page_id)
+        elif entry["hash"] != content_digest:
+            old_blocks = entry.get("blocks", {})
+            self.changed.append({
+                "id": page_id,
+                "blocks": sorted(
+                    block_id for block_id, digest in block_hashes.items() if old_blocks.get(block_id) != digest
+                ),
+                "removedBlocks": sorted(set(old_blocks) - set(block_hashes)),
+            })
+        else:
+            self.unchanged += 1
+        self.entries[page_id] = {
+            "file": filename,
+            "input": input_digest,
+            "hash": content_digest,
+            "blocks": block_hashes,
+            "createdAt": created_at,
+            "updatedAt": updated_at,
+            "output": output_digest,
+            "variants": variants,
+        }
+        return write
+
+    def clear(self):
+        """Delete every page file the cache knows about, the cache and its last manifest."""
+        for entry in self.entries.values():
+            remove_file(os.path.join(self.out_dir, entry["file"]))
+        self.entries = {}
+        for path in (self.path, os.path.join(self.out_dir, MANIFEST_FILE)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def prune(self):
+        """Forget pages the spec no longer produces and delete their files."""
+        removed = sorted(set(self.entries) - self.seen)
+        for page_id in removed:
+            remove_file(os.path.join(self.out_dir, self.entries.pop(page_id)["file"]))
+        return removed
+
+    def save(self):
+        removed = self.prune()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self.fingerprint, "pages": self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+        manifest = {
+            "builtAt": datetime.now().isoformat(),
+            "added": self.added,
+            "changed": self.changed,
+            "removed": removed,
+            "unchanged": self.unchanged,
+        }
+        with open(os.path.join(self.out_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return manifest
@@ -0,0 +1,121 @@
+"""
+Lazily initialized Firestore client for the content scripts.
+
+firebase_admin (and the grpc stack underneath it) is only imported the first
+time a client is requested, so offline page generation never pays for it.
+The client is created once per process and reused by every later call.
+
+Connection settings come from the same environment as the app:
+    NEXT_PUBLIC_FIREBASE_PROJECT_ID             project id
+    FIRESTORE_EMULATOR_HOST                     use the local emulator (no credentials)
+    FIREBASE_CLIENT_EMAIL, FIREBASE_PRIVATE_KEY service account credentials
+    GOOGLE_APPLICATION_CREDENTIALS              fallback to application default credentials
+"""
+
+import os
+import time
+
+# Mirror of FIREBASE_COLLECTIONS in lib/firebase.ts
+FIREBASE_COLLECTIONS = {
+    "EMPLOYEES": "web_employees",
+    "DYNAMIC_PAGES": "web_dynamic_pages",
+    "PAGES": "web_pages",
+    "ACTIVITIES": "web_activities",
+    "NOTIFICATIONS": "web_notifications",
+    "HEADER_SETTINGS": "web_settings",
+    "FOOTER_SETTINGS": "web_settings",
+    "GENERAL_SETTINGS": "web_settings",
+    "SETTINGS": "web_settings",
+    "EMPLOYMENT_APPLICATIONS": "web_applications",
+    "ENHANCED_APPLICATIONS": "web_enhanced_applications",
+    "SERVICE_REQUESTS": "web_service_requests",
+    "CONTACT_MESSAGES": "web_contact_messages",
+    "JOB_POSITIONS": "web_job_positions",
+    "TESTIMONIALS": "web_testimonials",
+    "CONTACT_INFO": "web_settings",
+    "REJECTED_REVIEWS": "web_rejected_reviews",
+    "MEDIA": "web_media",
+    "HERO_SLIDES": "web_hero_slides",
+    "GALLERY_IMAGES": "web_gallery_images",
+    "DEPARTMENTS": "web_departments",
+    "ABOUT_CONTENT": "web_about_content",
+    "DEPARTMENT_CONTENTS": "web_department_contents",
+}
+
+# Error class names (from google.api_core) worth retrying with backoff
+RETRYABLE_ERRORS = {"Aborted", "DeadlineExceeded", "InternalServerError", "ResourceExhausted", "ServiceUnavailable"}
+
+_client = None
+_init_seconds = None
+
+
+def project_id():
+    return os.environ.get("NEXT_PUBLIC_FIREBASE_PROJECT_ID") or os.environ.get("GCLOUD_PROJECT")
+
+
+def using_emulator():
+    return bool(os.environ.get("FIRESTORE_EMULATOR_HOST"))
+
+
+def _create_client():
+    if using_emulator():
+        # The emulator accepts any token, so skip firebase_admin and its credential lookup
+        from google.auth.credentials import AnonymousCredentials
+        from google.cloud import firestore
+
+        return firestore.Client(project=project_id() or "demo-project", credentials=AnonymousCredentials())
+
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    if not firebase_admin._apps:
+        if os.environ.get("FIREBASE_CLIENT_EMAIL") and os.environ.get("FIREBASE_PRIVATE_KEY"):
+            credential = credentials.Certificate({
+                "type": "service_account",
+                "project_id": project_id(),
+                "client_email": os.environ["FIREBASE_CLIENT_EMAIL"],
+                "private_key": os.environ["FIREBASE_PRIVATE_KEY"].replace("\\n", "\n"),
+                "token_uri": "https://oauth2.googleapis.com/token",
+            })
+        else:
+            credential = credentials.ApplicationDefault()
+        firebase_admin.initialize_app(credential, {"projectId": project_id()})
+    return firestore.client()
+
+
+def get_client():
+    """Return the process-wide Firestore client, creating it on first use."""
+    global _client, _init_seconds
+    if _client is None:
+        started = time.perf_counter()
+        _client = _create_client()
+        _init_seconds = time.perf_counter() - started
+    return _client
+
+
+def init_seconds():
+    """Seconds spent importing the SDK and creating the client, or None if never created."""
+    return _init_seconds
+
+
+def is_retryable(error):
+    """True for transient Firestore/network errors, matched by name so google.api_core stays lazy."""
+    return type(error).__name__ in RETRYABLE_ERRORS or isinstance(error, (ConnectionError, TimeoutError))
+
+
+def clean_for_firestore(value):
+    """Python counterpart of cleanForFirestore in lib/storage.ts.
+
+    Firestore rejects nested arrays, so an array containing arrays becomes an
+    object with numeric keys and an `__isNestedArray` marker.
+    """
+    if isinstance(value, list):
+        if any(isinstance(item, list) for item in value):
+            converted = {"__isNestedArray": True}
+            for index, item in enumerate(value):
+                converted[str(index)] = clean_for_firestore(item)
+            return converted
+        return [clean_for_firestore(item) for item in value]
+    if isinstance(value, dict):
+        return {key: clean_for_firestore(item) for key, item in value.items()}
+    return value
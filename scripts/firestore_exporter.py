@@ -0,0 +1,210 @@
+"""
+Streaming, resumable export of every Firestore collection.
+
+Each collection in FIREBASE_COLLECTIONS is read in pages ordered by document
+id (`order_by("__name__")` + `start_after`), so memory stays at one page of
+documents however large the collection grows. Documents are written as
+`{"id": …, "data": …}` lines into gzip-compressed NDJSON shards:
+
+    <out>/<collection>/part-00000.ndjson.gz
+    <out>/<collection>/cursor.json
+    <out>/export-manifest.json
+
+A shard is closed after SHARD_DOCUMENTS documents, and only then is the
+collection's cursor (last exported id, shard count) written. An interrupted
+export therefore resumes from the last closed shard, discarding the partial
+one, and never duplicates or skips documents. Collections are exported
+concurrently on a thread pool.
+
+Usage:
+    python scripts/firestore_exporter.py --out backups/2024-01-31
+    python scripts/firestore_exporter.py --collections web_dynamic_pages --emulator localhost:8080
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from firestore_client import FIREBASE_COLLECTIONS, get_client, is_retryable
+from page_writers import EXPORT_CURSOR_FILE as CURSOR_FILE, EXPORT_MANIFEST_FILE as MANIFEST_FILE
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXPORTS_DIR = os.path.join(REPO_ROOT, "build", "exports")
+PAGE_SIZE = 500
+SHARD_DOCUMENTS = 10_000
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 5
+BACKOFF_SECONDS = 0.5
+GZIP_LEVEL = 6
+
+
+def export_collections():
+    """Collection names to export; several settings keys share one collection."""
+    return sorted(set(FIREBASE_COLLECTIONS.values()))
+
+
+def encode_value(value):
+    """JSON encoding for Firestore types the json module does not know."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return {"__bytes": base64.b64encode(value).decode("ascii")}
+    if hasattr(value, "latitude") and hasattr(value, "longitude"):
+        return {"__geoPoint": [value.latitude, value.longitude]}
+    if hasattr(value, "path") and hasattr(value, "id"):
+        return {"__reference": value.path}
+    raise TypeError(f"Cannot export value of type {type(value).__name__}")
+
+
+def shard_name(number):
+    return f"part-{number:05d}.ndjson.gz"
+
+
+class CollectionCursor:
+    """Resume point of one collection: the last id of the last closed shard."""
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, CURSOR_FILE)
+        self.state = {"lastId": None, "shards": 0, "documents": 0, "done": False}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.state = json.load(f)
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+def _with_retries(call, retries, backoff=BACKOFF_SECONDS):
+    for attempt in range(retries + 1):
+        try:
+            return call()
+        except Exception as error:
+            if attempt == retries or not is_retryable(error):
+                raise
+            time.sleep(random.uniform(0, backoff * 2 ** attempt))
+
+
+def iter_documents(client, collection, after_id=None, page_size=PAGE_SIZE, retries=DEFAULT_RETRIES):
+    """Yield the documents of a collection in id order, one page in memory at a time."""
+    while True:
+        query = client.collection(collection).order_by("__name__").limit(page_size)
+        if after_id is not None:
+            query = query.start_after({"__name__": after_id})
+        page = _with_retries(lambda: list(query.stream()), retries)
+        yield from page
+        if len(page) < page_size:
+            return
+        after_id = page[-1].id
+
+
+def export_collection(
+    client, collection, out_dir, page_size=PAGE_SIZE, shard_documents=SHARD_DOCUMENTS, retries=DEFAULT_RETRIES
+):
+    """Export one collection into gzip NDJSON shards, resuming from its cursor; returns stats."""
+    started = time.perf_counter()
+    directory = os.path.join(out_dir, collection)
+    os.makedirs(directory, exist_ok=True)
+    cursor = CollectionCursor(directory)
+    state = cursor.state
+    resumed = state["documents"]
+    if not state["done"]:
+        # Anything past the cursor belongs to a shard that was never closed
+        for name in os.listdir(directory):
+            if name.startswith("part-") and name >= shard_name(state["shards"]):
+                os.remove(os.path.join(directory, name))
+
+        shard = None
+        in_shard = 0
+        last_id = state["lastId"]
+        for document in iter_documents(client, collection, state["lastId"], page_size, retries):
+            if shard is None:
+                path = os.path.join(directory, shard_name(state["shards"]))
+                shard = gzip.GzipFile(path, "wb", compresslevel=GZIP_LEVEL, mtime=0)
+            line = json.dumps({"id": document.id, "data": document.to_dict()}, ensure_ascii=False, default=encode_value)
+            shard.write(line.encode("utf-8") + b"\n")
+            in_shard += 1
+            last_id = document.id
+            if in_shard == shard_documents:
+                shard.close()
+                shard = None
+                state.update(lastId=last_id, shards=state["shards"] + 1, documents=state["documents"] + in_shard)
+                cursor.save()
+                in_shard = 0
+        if shard is not None:
+            shard.close()
+            state.update(lastId=last_id, shards=state["shards"] + 1, documents=state["documents"] + in_shard)
+        state["done"] = True
+        cursor.save()
+    return {
+        "collection": collection,
+        "documents": state["documents"],
+        "exported": state["documents"] - resumed,
+        "shards": [shard_name(number) for number in range(state["shards"])],
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def export_all(out_dir, collections=None, concurrency=DEFAULT_CONCURRENCY, client=None, **options):
+    """Export collections concurrently and write the export manifest; returns it."""
+    client = client or get_client()
+    collections = collections or export_collections()
+    os.makedirs(out_dir, exist_ok=True)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(export_collection, client, name, out_dir, **options) for name in collections]
+        results = [future.result() for future in futures]
+    manifest = {
+        "exportedAt": datetime.now().isoformat(),
+        "collections": {result.pop("collection"): result for result in results},
+        "seconds": time.perf_counter() - started,
+    }
+    with open(os.path.join(out_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export Firestore collections to compressed NDJSON shards.")
+    parser.add_argument("--out", default=os.path.join(EXPORTS_DIR, date.today().isoformat()), help="export directory")
+    parser.add_argument("--collections", nargs="+", help="collections to export (default: all of FIREBASE_COLLECTIONS)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="collections exported in parallel")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="documents fetched per query")
+    parser.add_argument("--shard-size", type=int, default=SHARD_DOCUMENTS, help="documents per shard")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("--emulator", help="Firestore emulator host:port (sets FIRESTORE_EMULATOR_HOST)")
+    args = parser.parse_args(argv)
+
+    if args.emulator:
+        os.environ["FIRESTORE_EMULATOR_HOST"] = args.emulator
+    manifest = export_all(
+        args.out,
+        args.collections,
+        args.concurrency,
+        page_size=args.page_size,
+        shard_documents=args.shard_size,
+        retries=args.retries,
+    )
+    for name, result in manifest["collections"].items():
+        resumed = result["documents"] - result["exported"]
+        note = f", {resumed} from a previous run" if resumed else ""
+        print(f"  {name:<28} {result['documents']:>8} documents in {len(result['shards'])} shards{note}")
+    total = sum(result["documents"] for result in manifest["collections"].values())
+    print(f"✅ Exported {total} documents from {len(manifest['collections'])} collections in {manifest['seconds']:.2f}s")
+    print(f"📁 Export saved to: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
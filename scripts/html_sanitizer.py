@@ -0,0 +1,429 @@
+"""
+Build-time HTML normalization for generated pages.
+
+Applies the site's DOMPurify policies once, at build time, to every
+HTML-bearing field of a page corpus, so the stored HTML is what the site
+would render: markup a policy strips never reaches Firestore, and diffs,
+search and size budgets see the rendered HTML. Custom HTML blocks (`html`)
+are sanitized under CUSTOM_HTML_POLICY, the one CustomHtmlView renders with;
+page `contentAr`/`contentEn` and block `body`, `bodyAr` and `bodyEn` under
+RICH_TEXT_POLICY. This does not replace sanitizing on render, which still
+runs on every request: pages are editable after import, so nothing stored
+with them can vouch for their HTML.
+
+Both policies (ALLOWED_TAGS, ALLOWED_ATTR, FORBID_TAGS, FORBID_ATTR,
+ALLOW_DATA_ATTR) are read from lib/sanitize-html.ts itself and follow
+DOMPurify's rules where the file leaves them implicit:
+
+    - a disallowed element is removed but its text is kept, except for the
+      elements DOMPurify drops with their content (script, style, iframe, …)
+    - attributes outside ALLOWED_ATTR are removed; data-*/aria-* attributes
+      are kept unless ALLOW_DATA_ATTR/ALLOW_ARIA_ATTR is false
+    - attribute values must not use a script-capable URI scheme
+      (javascript:, vbscript:, …); data: URIs are allowed only in img src
+    - comments, doctypes and processing instructions are removed
+
+Fragments are keyed by policy and content hash in a cache tied to the policy
+id, so an unchanged fragment is sanitized once and never again; cache misses
+are sanitized in a process pool.
+
+Usage:
+    python scripts/html_sanitizer.py generated-pages
+    python scripts/html_sanitizer.py generated-pages --workers 4 --compress gz
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+
+from build_cache import content_hash
+from page_writers import CODECS, NdjsonWriter, check_codecs, compress_variants, list_page_files, serialize_page, write_file
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POLICY_FILE = os.path.join(REPO_ROOT, "lib", "sanitize-html.ts")
+CACHE_FILE = os.path.join(REPO_ROOT, "build", "html-sanitizer", "cache.json")
+CACHE_VERSION = 1
+# Bump when the sanitizer's behaviour changes, so cached output goes stale
+SANITIZER_VERSION = 1
+# Earlier builds marked pages with it; nothing reads it, so it is removed
+STALE_MARKER_KEY = "preSanitized"
+# Policy name -> the exported constant of lib/sanitize-html.ts holding it
+POLICY_CONSTANTS = {"richText": "RICH_TEXT_POLICY", "customHtml": "CUSTOM_HTML_POLICY"}
+# HTML field -> the policy its renderer sanitizes it with
+FIELD_POLICIES = {
+    "html": "customHtml",
+    "body": "richText",
+    "bodyAr": "richText",
+    "bodyEn": "richText",
+    "contentAr": "richText",
+    "contentEn": "richText",
+}
+# Subtrees that never hold HTML; block styles make up half of a page's nodes
+SKIP_FIELDS = {"styles"}
+# Pages per pool task and tasks kept in flight per worker
+CHUNK_SIZE = 64
+WINDOW_PER_WORKER = 4
+
+# DOMPurify defaults the policy file does not override
+DROP_CONTENT_TAGS = {
+    "annotation-xml", "audio", "colgroup", "desc", "foreignobject", "head", "iframe", "math", "mi", "mn", "mo",
+    "ms", "mtext", "noembed", "noframes", "noscript", "plaintext", "script", "style", "svg", "template",
+    "thead", "title", "video", "xmp",
+}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+URI_SAFE_ATTRIBUTES = {
+    "alt", "class", "for", "id", "label", "name", "pattern", "placeholder", "role", "summary", "title", "value",
+    "style", "xmlns",
+}
+DATA_URI_TAGS = {"audio", "video", "img", "source", "image", "track"}
+IS_ALLOWED_URI = re.compile(r"^(?:(?:(?:f|ht)tps?|mailto|tel|callto|sms|cid|xmpp):|[^a-z]|[a-z+.\-]+(?:[^a-z+.\-:]|$))", re.I)
+ATTR_WHITESPACE = re.compile("[\u0000-\u0020\u00a0\u1680\u180e\u2000-\u2029\u205f\u3000]")
+DATA_ATTR = re.compile(r"^data-[\-\w.\u00b7-\uffff]+$")
+ARIA_ATTR = re.compile(r"^aria-[\-\w]+$")
+POLICY_START_RE = re.compile(r"\bexport\s+const\s+(\w+)\s*=\s*\{")
+POLICY_LIST_RE = re.compile(r"\b(ALLOWED_TAGS|ALLOWED_ATTR|FORBID_TAGS|FORBID_ATTR)\s*:\s*\[(.*?)\]", re.S)
+POLICY_FLAG_RE = re.compile(r"\b(ALLOW_DATA_ATTR|ALLOW_ARIA_ATTR)\s*:\s*(true|false)\b")
+STRING_RE = re.compile(r'"([^"]*)"|\'([^\']*)\'')
+
+
+class PolicyError(ValueError):
+    pass
+
+
+def _policy_objects(source):
+    """{constant name: object literal source} for every `export const NAME = {…}`."""
+    objects = {}
+    for match in POLICY_START_RE.finditer(source):
+        depth = 1
+        end = match.end()
+        # The policies hold flat string lists and flags, so braces only delimit the object
+        while depth and end < len(source):
+            depth += {"{": 1, "}": -1}.get(source[end], 0)
+            end += 1
+        objects[match.group(1)] = source[match.end():end - 1]
+    return objects
+
+
+def _parse_policy(source, where):
+    lists = {name: [a or b for a, b in STRING_RE.findall(body)] for name, body in POLICY_LIST_RE.findall(source)}
+    if "ALLOWED_TAGS" not in lists or "ALLOWED_ATTR" not in lists:
+        raise PolicyError(f"{where}: no ALLOWED_TAGS/ALLOWED_ATTR lists found")
+    flags = {name: value == "true" for name, value in POLICY_FLAG_RE.findall(source)}
+    return {
+        "allowedTags": sorted(set(lists["ALLOWED_TAGS"]) - set(lists.get("FORBID_TAGS", []))),
+        "allowedAttr": sorted(set(lists["ALLOWED_ATTR"]) - set(lists.get("FORBID_ATTR", []))),
+        "forbidTags": sorted(lists.get("FORBID_TAGS", [])),
+        "allowDataAttr": flags.get("ALLOW_DATA_ATTR", True),
+        "allowAriaAttr": flags.get("ALLOW_ARIA_ATTR", True),
+    }
+
+
+def load_policies(path=POLICY_FILE):
+    """{policy name: DOMPurify options} for each policy lib/sanitize-html.ts exports."""
+    with open(path, encoding="utf-8") as f:
+        objects = _policy_objects(f.read())
+    policies = {}
+    for name, constant in POLICY_CONSTANTS.items():
+        if constant not in objects:
+            raise PolicyError(f"{path}: no `export const {constant}` found")
+        policies[name] = _parse_policy(objects[constant], f"{path}: {constant}")
+    return policies
+
+
+def policy_id(policies):
+    """Stable id of the policies and sanitizer version; the cache is valid for one id."""
+    return "sp" + str(SANITIZER_VERSION) + "-" + content_hash(policies)[:12]
+
+
+def _escape_text(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _escape_attr(value):
+    return value.replace("&", "&amp;").replace('"', "&quot;")
+
+
+class _Sanitizer(HTMLParser):
+    def __init__(self, policy):
+        super().__init__(convert_charrefs=True)
+        self.allowed_tags = set(policy["allowedTags"])
+        self.allowed_attr = set(policy["allowedAttr"])
+        # Forbidden elements are removed with their content only where DOMPurify would drop it
+        self.drop_content = DROP_CONTENT_TAGS
+        self.allow_data = policy["allowDataAttr"]
+        self.allow_aria = policy["allowAriaAttr"]
+        self.out = []
+        self._open = []
+        self._skip = []
+
+    def _attribute_allowed(self, tag, name, value):
+        if name.startswith("on"):
+            return False
+        if name not in self.allowed_attr:
+            if not (self.allow_data and DATA_ATTR.match(name)) and not (self.allow_aria and ARIA_ATTR.match(name)):
+                return False
+        if name in URI_SAFE_ATTRIBUTES or not value:
+            return True
+        if IS_ALLOWED_URI.match(ATTR_WHITESPACE.sub("", value)):
+            return True
+        return name in ("src", "href", "xlink:href") and value.startswith("data:") and tag in DATA_URI_TAGS
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip:
+            if tag not in VOID_TAGS:
+                self._skip.append(tag)
+            return
+        if tag not in self.allowed_tags:
+            if tag in self.drop_content and tag not in VOID_TAGS:
+                self._skip.append(tag)
+            return
+        kept = "".join(
+            f' {name}="{_escape_attr(value or "")}"' for name, value in attrs if self._attribute_allowed(tag, name, value or "")
+        )
+        self.out.append(f"<{tag}{kept}>")
+        if tag not in VOID_TAGS:
+            self._open.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self._skip:
+            if tag in self._skip:
+                del self._skip[len(self._skip) - 1 - self._skip[::-1].index(tag):]
+            return
+        if tag in self._open:
+            # Closing an outer element closes everything still open inside it, as the DOM would
+            while self._open:
+                open_tag = self._open.pop()
+                self.out.append(f"</{open_tag}>")
+                if open_tag == tag:
+                    break
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.out.append(_escape_text(data))
+
+    def result(self):
+        self.close()
+        self.out.extend(f"</{tag}>" for tag in reversed(self._open))
+        self._open.clear()
+        return "".join(self.out)
+
+
+def sanitize_html(html, policy):
+    """`html` with everything the policy does not allow removed."""
+    parser = _Sanitizer(policy)
+    parser.feed(html)
+    return parser.result()
+
+
+def _sanitize_fragments(fragments, policies):
+    """Worker: sanitized output per (policy name, fragment), or None where it was already clean."""
+    results = []
+    for name, html in fragments:
+        clean = sanitize_html(html, policies[name])
+        results.append(None if clean == html else clean)
+    return results
+
+
+def fragment_key(name, html):
+    """Cache key of a fragment under one policy: the same HTML cleans differently under another."""
+    return name + ":" + hashlib.sha1(html.encode("utf-8")).hexdigest()[:16]
+
+
+def html_fields(page):
+    """(container, key, fragment key) for every HTML string of a page, at any depth."""
+    fields = []
+    stack = [page]
+    while stack:
+        value = stack.pop()
+        items = value.items() if isinstance(value, dict) else enumerate(value)
+        for key, item in items:
+            if isinstance(item, str):
+                if item and key in FIELD_POLICIES:
+                    fields.append((value, key, fragment_key(FIELD_POLICIES[key], item)))
+            elif isinstance(item, (dict, list)) and key not in SKIP_FIELDS:
+                stack.append(item)
+    return fields
+
+
+class SanitizeCache:
+    """Fragment key → sanitized output (None: already clean), valid for one policy id."""
+
+    def __init__(self, path, policy_key):
+        self.path = path
+        self.policy = policy_key
+        self.fragments = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION and data.get("policy") == policy_key:
+                self.fragments = data["fragments"]
+        self.hits = 0
+        self.misses = 0
+        self.used = set()
+
+    def save(self):
+        """Write the cache, keeping only fragments this run used."""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        fragments = {digest: self.fragments[digest] for digest in sorted(self.used)}
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "policy": self.policy, "fragments": fragments}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def sanitize_pages(items, policies, cache, workers=1):
+    """Sanitize (key, page) items in place and yield (key, page, changed) in input order.
+
+    Only fragments missing from the cache are sanitized, each at most once per
+    run even when it repeats across pages in flight. `changed` is True when the
+    page differs from its input.
+    """
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    pending = deque()
+    in_flight = set()
+
+    def finish(chunk, digests, results):
+        for digest, result in zip(digests, results):
+            cache.fragments[digest] = result
+            in_flight.discard(digest)
+            if result is not None:
+                # Sanitizing is idempotent: the output comes back clean on the next build
+                clean_digest = fragment_key(digest.partition(":")[0], result)
+                cache.fragments.setdefault(clean_digest, None)
+                cache.used.add(clean_digest)
+        for key, page, fields in chunk:
+            changed = page.pop(STALE_MARKER_KEY, None) is not None
+            for container, field, digest in fields:
+                cache.used.add(digest)
+                clean = cache.fragments[digest]
+                if clean is not None:
+                    container[field] = clean
+                    changed = True
+            yield key, page, changed
+
+    try:
+        for batch in _chunked(items, CHUNK_SIZE):
+            chunk = [(key, page, html_fields(page)) for key, page in batch]
+            misses = {}
+            for _, _, fields in chunk:
+                for container, field, digest in fields:
+                    if digest in cache.fragments or digest in in_flight or digest in misses:
+                        cache.hits += 1
+                    else:
+                        misses[digest] = (FIELD_POLICIES[field], container[field])
+            cache.misses += len(misses)
+            in_flight.update(misses)
+            fragments = list(misses.values())
+            if executor is None:
+                pending.append((chunk, list(misses), _sanitize_fragments(fragments, policies)))
+            else:
+                pending.append((chunk, list(misses), executor.submit(_sanitize_fragments, fragments, policies)))
+            if len(pending) >= (workers * WINDOW_PER_WORKER if executor else 1):
+                chunk, digests, results = pending.popleft()
+                yield from finish(chunk, digests, results if executor is None else results.result())
+        while pending:
+            chunk, digests, results = pending.popleft()
+            yield from finish(chunk, digests, results if executor is None else results.result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def _iter_json_pages(paths):
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            document = json.load(f)
+        # Manifests and preset tables live next to the pages
+        if isinstance(document, dict) and "blocks" in document:
+            yield path, document
+
+
+def sanitize_page_files(pages_dir, policies=None, cache_file=CACHE_FILE, fmt="pretty", codecs=(), workers=None):
+    """Sanitize a directory of generated pages in place; returns stats."""
+    started = time.perf_counter()
+    policies = policies or load_policies()
+    cache = SanitizeCache(cache_file, policy_id(policies))
+    workers = workers or os.cpu_count() or 1
+    stats = {"pages": 0, "rewritten": 0}
+
+    files = list_page_files(pages_dir)
+    for path in files:
+        if not path.endswith(".ndjson"):
+            continue
+        original = path + ".orig"
+        os.replace(path, original)
+        with open(original, encoding="utf-8") as f, NdjsonWriter(path, codecs) as writer:
+            items = ((None, json.loads(line)) for line in f if line.strip())
+            for _, page, changed in sanitize_pages(items, policies, cache, workers):
+                writer.write(serialize_page(page, "compact"))
+                stats["pages"] += 1
+                stats["rewritten"] += changed
+        os.remove(original)
+
+    json_files = [path for path in files if not path.endswith(".ndjson")]
+    for path, page, changed in sanitize_pages(_iter_json_pages(json_files), policies, cache, workers):
+        stats["pages"] += 1
+        if changed:
+            data = serialize_page(page, fmt).encode("utf-8")
+            write_file(path, data, compress_variants(data, codecs))
+            stats["rewritten"] += 1
+
+    cache.save()
+    stats.update(
+        policy=cache.policy,
+        fragments=cache.hits + cache.misses,
+        sanitized=cache.misses,
+        reused=cache.hits,
+        seconds=time.perf_counter() - started,
+    )
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sanitize the HTML fields of generated pages with the site's DOMPurify policies.")
+    parser.add_argument("pages", help="directory of generated page JSON/NDJSON files")
+    parser.add_argument("--policy", default=POLICY_FILE, help="TS file exporting the DOMPurify policies (default: lib/sanitize-html.ts)")
+    parser.add_argument("--cache", default=CACHE_FILE, help="fragment cache file")
+    parser.add_argument("--format", choices=["pretty", "compact"], default="pretty", help="format of rewritten JSON pages")
+    parser.add_argument("--compress", action="append", choices=CODECS, default=[], help="also write .gz/.br variants (repeatable)")
+    parser.add_argument("--workers", type=int, help="process pool size (default: CPU count)")
+    args = parser.parse_args(argv)
+    try:
+        check_codecs(args.compress)
+        policies = load_policies(args.policy)
+    except ValueError as error:
+        parser.error(str(error))
+
+    stats = sanitize_page_files(args.pages, policies, args.cache, args.format, args.compress, args.workers)
+    print(f"🧼 {stats['fragments']} HTML fragments: {stats['sanitized']} sanitized, {stats['reused']} reused from cache (policy {stats['policy']})")
+    print(f"✅ Normalized the HTML of {stats['pages']} pages, rewrote {stats['rewritten']} in {stats['seconds']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
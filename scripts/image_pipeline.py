@@ -0,0 +1,388 @@
+"""
+Image stage for generated pages.
+
+Generated blocks point their images at `/placeholder.svg?height=…&width=…`
+while public/ holds the real photos at full resolution. This stage:
+
+1. resolves every placeholder to a real asset in public/, scoring file names
+   against the English text around the image (title, description, category)
+   and the block type, without reusing a photo inside the same block;
+2. renders WebP (and AVIF where Pillow supports it) variants at the exact
+   size each block requests, plus a 2x variant when the source is big enough,
+   in a process pool;
+3. skips variants whose source is unchanged, using a content-hash manifest;
+4. rewrites `image`/`url` fields to the 1x WebP variant and adds
+   `<field>SrcSet` / `<field>AvifSrcSet` next to them.
+
+Direct references to files in public/ are optimized too, at their own aspect
+ratio capped to MAX_WIDTH. Needs Pillow.
+
+Usage:
+    python scripts/image_pipeline.py generated-pages
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from page_writers import CODECS, NdjsonWriter, check_codecs, compress_variants, list_page_files, serialize_page, write_file
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Optional: only needed when the image stage runs
+    Image = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PUBLIC_DIR = os.path.join(REPO_ROOT, "public")
+OUTPUT_SUBDIR = "optimized"
+MANIFEST_FILE = "manifest.json"
+
+IMAGE_FIELDS = ("image", "url")
+SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+# Logos, icons and placeholders are never good stand-ins for content photos
+EXCLUDED_PREFIXES = ("placeholder", "icon", "logo", "apple-icon")
+MAX_WIDTH = 1600
+DENSITIES = (1, 2)
+WEBP_QUALITY = 80
+AVIF_QUALITY = 55
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "for", "in", "is", "of", "on", "our", "the", "to", "we", "with",
+    "special", "needs", "student", "students",
+}
+# Extra context for blocks whose text says little about the picture
+BLOCK_HINTS = {
+    "hero": ["school", "building", "exterior", "campus"],
+    "features": ["classroom", "school"],
+    "testimonials": ["parent", "testimonial", "portrait"],
+    "cta": ["workshop", "training", "teacher"],
+    "gallery": ["facilities"],
+}
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _stem_token(token):
+    return token[:-1] if len(token) > 3 and token.endswith("s") else token
+
+
+def tokenize(text):
+    return {_stem_token(token) for token in TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS}
+
+
+def _stable_rank(*parts):
+    return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class AssetIndex:
+    """Real photos in public/, tokenized by file name."""
+
+    def __init__(self, public_dir=PUBLIC_DIR):
+        self.public_dir = public_dir
+        self.assets = {}
+        self._resolved = {}
+        for name in sorted(os.listdir(public_dir)):
+            if name.lower().endswith(SOURCE_EXTENSIONS) and not name.startswith(EXCLUDED_PREFIXES):
+                self.assets[name] = tokenize(os.path.splitext(name)[0].replace("-", " "))
+
+    def resolve(self, context, used=()):
+        """Pick the asset whose name best matches `context`, preferring unused ones; None without assets."""
+        if not self.assets:
+            return None
+        # Generated pages repeat the same blocks, so most lookups are repeats
+        key = (context, frozenset(used))
+        if key not in self._resolved:
+            words = tokenize(context)
+            self._resolved[key] = max(
+                self.assets,
+                key=lambda name: (name not in used, len(words & self.assets[name]), _stable_rank(context, name)),
+            )
+        return self._resolved[key]
+
+
+def parse_placeholder(value):
+    """Return (width, height) for a /placeholder.svg?height=…&width=… URL, else None."""
+    parts = urlsplit(value)
+    if not parts.path.startswith("/placeholder"):
+        return None
+    query = parse_qs(parts.query)
+    try:
+        return int(query["width"][0]), int(query["height"][0])
+    except (KeyError, ValueError):
+        return None
+
+
+def _context(item, block):
+    texts = [str(value) for key, value in item.items() if isinstance(value, str) and not key.endswith("Ar")]
+    texts.append(" ".join(BLOCK_HINTS.get(block.get("type"), [])))
+    texts.append(str(block.get("content", {}).get("title", "")))
+    return " ".join(texts)
+
+
+def _iter_image_slots(block):
+    """Yield (container dict, field) for every image field of a block, in document order."""
+    stack = [block.get("content", {})]
+    while stack:
+        node = stack.pop(0)
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in IMAGE_FIELDS and isinstance(value, str):
+                    yield node, key
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+class ImagePlanner:
+    """Maps image references in pages to (source file, width, height) jobs."""
+
+    def __init__(self, index):
+        self.index = index
+        self._sizes = {}
+
+    def _source_size(self, name):
+        if name not in self._sizes:
+            with Image.open(os.path.join(self.index.public_dir, name)) as image:
+                width, height = image.size
+            if width > MAX_WIDTH:
+                width, height = MAX_WIDTH, round(height * MAX_WIDTH / width)
+            self._sizes[name] = (width, height)
+        return self._sizes[name]
+
+    def plan_block(self, block):
+        """Yield (container, field, job) for each image of the block that should be optimized."""
+        used = set()
+        for container, field in _iter_image_slots(block):
+            value = container[field]
+            size = parse_placeholder(value)
+            if size is not None:
+                name = self.index.resolve(_context(container, block), used)
+                if name is None:
+                    continue  # No photos in public/ to stand in for the placeholder
+            else:
+                name = value.lstrip("/")
+                if name not in self.index.assets:
+                    continue  # External, already optimized, or not a photo
+                size = self._source_size(name)
+            used.add(name)
+            yield container, field, (name, size[0], size[1])
+
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def available_formats():
+    formats = ["webp"]
+    if features.check("avif"):
+        formats.append("avif")
+    return formats
+
+
+def render_job(job):
+    """Worker: render every variant of one (source, width, height) job."""
+    source_path, source_hash, width, height, out_dir, formats = job
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    variants = []
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        for density in DENSITIES:
+            target = (width * density, height * density)
+            # Never upscale for high-density variants; the 1x variant is always produced
+            if density > 1 and (target[0] > image.width or target[1] > image.height):
+                break
+            fitted = ImageOps.fit(image, target, Image.LANCZOS)
+            for fmt in formats:
+                name = f"{stem}.{source_hash[:8]}.{target[0]}x{target[1]}.{fmt}"
+                path = os.path.join(out_dir, name)
+                options = {"quality": WEBP_QUALITY, "method": 6} if fmt == "webp" else {"quality": AVIF_QUALITY}
+                fitted.save(path, fmt.upper(), **options)
+                variants.append({"file": name, "format": fmt, "width": target[0], "bytes": os.path.getsize(path)})
+    return variants
+
+
+class ImagePipeline:
+    def __init__(self, public_dir=PUBLIC_DIR, output_subdir=OUTPUT_SUBDIR, workers=None):
+        if Image is None:
+            raise RuntimeError("The image stage needs Pillow: pip install pillow")
+        self.public_dir = public_dir
+        self.output_subdir = output_subdir
+        self.out_dir = os.path.join(public_dir, output_subdir)
+        self.workers = workers or os.cpu_count() or 1
+        self.planner = ImagePlanner(AssetIndex(public_dir))
+        self.manifest_path = os.path.join(self.out_dir, MANIFEST_FILE)
+        self.manifest = {"sources": {}, "jobs": {}}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        self.formats = available_formats()
+
+    def _source_hash(self, name):
+        """Hash a source file, trusting the manifest while size and mtime are unchanged."""
+        path = os.path.join(self.public_dir, name)
+        stat = os.stat(path)
+        known = self.manifest["sources"].get(name)
+        if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime:
+            return known["hash"]
+        digest = file_digest(path)
+        self.manifest["sources"][name] = {"size": stat.st_size, "mtime": stat.st_mtime, "hash": digest}
+        return digest
+
+    @staticmethod
+    def job_key(job):
+        name, width, height = job
+        return f"{name}@{width}x{height}"
+
+    def _is_fresh(self, key, source_hash):
+        entry = self.manifest["jobs"].get(key)
+        return (
+            entry is not None
+            and entry["hash"] == source_hash
+            and entry["formats"] == self.formats
+            and all(os.path.exists(os.path.join(self.out_dir, v["file"])) for v in entry["variants"])
+        )
+
+    def render(self, jobs):
+        """Render all stale jobs in a process pool; returns (rendered, skipped)."""
+        if not jobs:
+            return 0, 0
+        os.makedirs(self.out_dir, exist_ok=True)
+        stale = []
+        for job in sorted(jobs):
+            source_hash = self._source_hash(job[0])
+            if not self._is_fresh(self.job_key(job), source_hash):
+                stale.append((job, source_hash))
+        work = [
+            (os.path.join(self.public_dir, name), source_hash, width, height, self.out_dir, self.formats)
+            for (name, width, height), source_hash in stale
+        ]
+        if len(work) > 1 and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(render_job, work))
+        else:
+            results = [render_job(item) for item in work]
+        for (job, source_hash), variants in zip(stale, results):
+            self.manifest["jobs"][self.job_key(job)] = {
+                "hash": source_hash,
+                "formats": self.formats,
+                "variants": variants,
+            }
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+        return len(stale), len(jobs) - len(stale)
+
+    def _url(self, file_name):
+        return f"/{self.output_subdir}/{file_name}"
+
+    def rewrite_block(self, block):
+        """Point the block's images at their variants; returns True if anything changed."""
+        changed = False
+        for container, field, job in list(self.planner.plan_block(block)):
+            variants = self.manifest["jobs"][self.job_key(job)]["variants"]
+            srcsets = {}
+            for variant in variants:
+                srcsets.setdefault(variant["format"], []).append(f"{self._url(variant['file'])} {variant['width']}w")
+            container[field] = self._url(next(v["file"] for v in variants if v["format"] == "webp"))
+            container[f"{field}SrcSet"] = ", ".join(srcsets["webp"])
+            if "avif" in srcsets:
+                container[f"{field}AvifSrcSet"] = ", ".join(srcsets["avif"])
+            changed = True
+        return changed
+
+    def plan_pages(self, pages):
+        jobs = set()
+        for page in pages:
+            for block in page.get("blocks", []):
+                jobs.update(job for _, _, job in self.planner.plan_block(block))
+        return jobs
+
+
+def _iter_pages(path, ndjson=False):
+    """Yield the page documents of a JSON or NDJSON file, skipping build artifacts."""
+    with open(path, encoding="utf-8") as f:
+        documents = (json.loads(line) for line in f if line.strip()) if ndjson else [json.load(f)]
+        for document in documents:
+            if isinstance(document, dict) and "blocks" in document:
+                yield document
+
+
+def _rewrite_pages(pipeline, pages):
+    changed = False
+    for page in pages:
+        for block in page.get("blocks", []):
+            changed = pipeline.rewrite_block(block) or changed
+    return changed
+
+
+def optimize_page_images(pages_dir, fmt="pretty", codecs=(), public_dir=PUBLIC_DIR, workers=None):
+    """Run the image stage over a directory of generated pages, rewriting them in place."""
+    started = time.perf_counter()
+    pipeline = ImagePipeline(public_dir, workers=workers)
+    files = list_page_files(pages_dir)
+
+    # Pass 1: collect the unique (source, size) jobs across the corpus
+    jobs = set()
+    for path in files:
+        jobs |= pipeline.plan_pages(_iter_pages(path, path.endswith(".ndjson")))
+    rendered, skipped = pipeline.render(jobs)
+
+    # Pass 2: rewrite only the pages that referenced something optimizable
+    rewritten = 0
+    for path in files:
+        if path.endswith(".ndjson"):
+            original = path + ".orig"
+            os.replace(path, original)
+            with NdjsonWriter(path, codecs) as writer:
+                for page in _iter_pages(original, ndjson=True):
+                    _rewrite_pages(pipeline, [page])
+                    writer.write(serialize_page(page, "compact"))
+            os.remove(original)
+            rewritten += 1
+            continue
+        pages = list(_iter_pages(path))
+        if pages and _rewrite_pages(pipeline, pages):
+            data = serialize_page(pages[0], fmt).encode("utf-8")
+            write_file(path, data, compress_variants(data, codecs))
+            rewritten += 1
+
+    return {
+        "jobs": len(jobs),
+        "rendered": rendered,
+        "skipped": skipped,
+        "pages": rewritten,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve, resize and rewrite the images of generated pages.")
+    parser.add_argument("pages", help="directory of generated page JSON/NDJSON files")
+    parser.add_argument("--format", choices=["pretty", "compact"], default="pretty", help="format of rewritten JSON pages")
+    parser.add_argument("--compress", action="append", choices=CODECS, default=[], help="also write .gz/.br variants (repeatable)")
+    parser.add_argument("--public", default=PUBLIC_DIR, help="directory with the source images")
+    parser.add_argument("--workers", type=int, help="process pool size (default: CPU count)")
+    args = parser.parse_args(argv)
+    try:
+        check_codecs(args.compress)
+    except ValueError as error:
+        parser.error(str(error))
+
+    stats = optimize_page_images(args.pages, fmt=args.format, codecs=args.compress, public_dir=args.public, workers=args.workers)
+    print(f"🖼️  {stats['jobs']} image variants: {stats['rendered']} rendered, {stats['skipped']} unchanged")
+    print(f"✅ Rewrote {stats['pages']} page files in {stats['seconds']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
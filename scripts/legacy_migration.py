@@ -0,0 +1,403 @@
+"""
+Offline bulk migration of legacy site content to block-based pages.
+
+Python counterpart of runMigration / createMigratedHomepage /
+createDepartmentPages in lib/migration.ts, for many sites at once. Each site
+snapshot holds the legacy sections in any of the shapes the app produces:
+
+    createBackup():     heroSlides, aboutContent, galleryImages, departments
+    collection dumps:   web_hero_slides, web_about_content, web_gallery_images,
+                        web_department_contents (and web_pages, to detect an
+                        existing homepage)
+    SiteContent rows:   siteContent: [{section: "hero" | "about" | …, …}]
+
+Sites are converted in a process pool into the same block kinds and `data`
+fields lib/migration.ts builds (hero-basic, section-header, image-with-text,
+icon-points, image-albums, rich-text) and streamed to `<out>/<site>.ndjson`,
+one DynamicPage per line, ready for page_importer.py. `<out>/migration-report.json` records a
+MigrationResult per site. Page ids are derived from the site and slug, so a
+re-run overwrites the same pages instead of duplicating them.
+
+Usage:
+    python scripts/legacy_migration.py snapshots/ --out migrated
+    python scripts/legacy_migration.py sites.ndjson --out migrated --workers 8
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime
+
+from firestore_client import FIREBASE_COLLECTIONS
+from page_writers import CODECS, MIGRATION_REPORT_FILE as REPORT_FILE, NdjsonWriter, check_codecs, list_page_files, remove_file, serialize_page
+
+MIGRATION_VERSION = "1.0.0"  # lib/migration.ts MIGRATION_VERSION
+WINDOW_PER_WORKER = 4
+
+# Snapshot keys accepted for each legacy section, in order of preference
+SECTION_KEYS = {
+    "heroSlides": ("heroSlides", FIREBASE_COLLECTIONS["HERO_SLIDES"]),
+    "aboutContent": ("aboutContent", FIREBASE_COLLECTIONS["ABOUT_CONTENT"]),
+    "galleryImages": ("galleryImages", FIREBASE_COLLECTIONS["GALLERY_IMAGES"]),
+    "departments": ("departments", FIREBASE_COLLECTIONS["DEPARTMENT_CONTENTS"]),
+    "pages": ("pages", FIREBASE_COLLECTIONS["PAGES"], FIREBASE_COLLECTIONS["DYNAMIC_PAGES"]),
+}
+
+
+def _first(*values):
+    """JS `a || b`: the first truthy value, else the last one."""
+    for value in values:
+        if value:
+            return value
+    return values[-1]
+
+
+def _slug(text):
+    return "-".join("".join(char if char.isalnum() else " " for char in str(text).lower()).split())
+
+
+def migrated_page_id(site, slug):
+    digest = hashlib.sha1(f"{site}\0{slug}".encode("utf-8")).hexdigest()[:12]
+    return f"page-{digest}"
+
+
+def site_sections(snapshot):
+    """Normalize a snapshot into the legacy sections lib/migration.ts reads."""
+    sections = {}
+    for name, keys in SECTION_KEYS.items():
+        sections[name] = next((snapshot[key] for key in keys if snapshot.get(key)), None)
+    about = sections["aboutContent"]
+    if isinstance(about, list):
+        # Collection dumps hold the single about document as a one-item list
+        sections["aboutContent"] = about[0] if about else None
+
+    # SiteContent rows fill in any section the snapshot does not have directly
+    rows = sorted(snapshot.get("siteContent") or [], key=lambda row: row.get("order", 0))
+    by_section = {}
+    for row in rows:
+        by_section.setdefault(row.get("section"), []).append(row)
+    if not sections["heroSlides"] and by_section.get("hero"):
+        sections["heroSlides"] = by_section["hero"]
+    if not sections["aboutContent"] and by_section.get("about"):
+        sections["aboutContent"] = dict(by_section["about"][0], features=[])
+    if not sections["galleryImages"] and by_section.get("gallery"):
+        sections["galleryImages"] = by_section["gallery"]
+    if not sections["departments"] and by_section.get("departments"):
+        sections["departments"] = [dict(row, type=row.get("type") or row["id"]) for row in by_section["departments"]]
+    return sections
+
+
+def _defined(data):
+    """Drop None values, as JSON.stringify drops the undefined fields of lib/migration.ts."""
+    return {key: value for key, value in data.items() if value is not None}
+
+
+def _block(prefix, order, kind, data):
+    # lib/migration.ts ids are `${prefix}-${Date.now()}`; the position keeps them unique and stable
+    return {"id": f"{prefix}-{order}", "kind": kind, "data": _defined(data)}
+
+
+def convert_hero_slides(hero_slides, order):
+    """First slide → hero-basic block (convertHeroSlides)."""
+    if not hero_slides:
+        return []
+    slide = hero_slides[0]
+    return [_block("hero", order, "hero-basic", {
+        "heading": _first(slide.get("titleAr"), slide.get("titleEn")),
+        "headingEn": slide.get("titleEn"),
+        "subheading": _first(slide.get("descriptionAr"), slide.get("descriptionEn")),
+        "subheadingEn": slide.get("descriptionEn"),
+        "backgroundImage": slide.get("image"),
+        "overlay": True,
+        "cta": {"text": "اكتشف المزيد", "textEn": "Learn More", "link": "#about"},
+    })]
+
+
+def convert_about_content(about, order):
+    """About content → section-header, image-with-text and icon-points blocks (convertAboutContent)."""
+    if not about:
+        return []
+    blocks = [
+        _block("header", order, "section-header", {
+            "title": _first(about.get("titleAr"), "من نحن"),
+            "titleEn": _first(about.get("titleEn"), "About Us"),
+            "subtitle": "",
+            "subtitleEn": "",
+            "alignment": "center",
+        }),
+        _block("image-text", order + 1, "image-with-text", {
+            "image": _first(about.get("image"), ""),
+            "imagePosition": "right",
+            "title": about.get("titleAr"),
+            "titleEn": about.get("titleEn"),
+            "content": about.get("descriptionAr"),
+            "contentEn": about.get("descriptionEn"),
+        }),
+    ]
+    features = about.get("features") or []
+    if features:
+        blocks.append(_block("features", order + 2, "icon-points", {
+            "title": "مميزاتنا",
+            "titleEn": "Our Features",
+            "points": [
+                _defined({
+                    "id": f"feature-{index}",
+                    "icon": "✓",
+                    "title": feature.get("titleAr"),
+                    "titleEn": feature.get("titleEn"),
+                    "description": feature.get("descriptionAr"),
+                    "descriptionEn": feature.get("descriptionEn"),
+                })
+                for index, feature in enumerate(features)
+            ],
+        }))
+    return blocks
+
+
+def convert_gallery(gallery_images, order):
+    """Gallery images → image-albums block with one album per category (convertGallery)."""
+    if not gallery_images:
+        return []
+    albums = {}
+    for image in gallery_images:
+        albums.setdefault(image.get("category") or "default", []).append(image)
+    return [_block("gallery", order, "image-albums", {
+        "title": "معرض الصور",
+        "titleEn": "Photo Gallery",
+        "albums": [
+            {
+                "id": f"album-{index}",
+                "title": "المعرض" if category == "default" else category,
+                "titleEn": "Gallery" if category == "default" else category,
+                "images": [
+                    _defined({
+                        # The TS falls back to the album index too
+                        "id": _first(image.get("id"), f"img-{index}"),
+                        "url": image.get("image"),
+                        "caption": image.get("titleAr"),
+                        "captionEn": image.get("titleEn"),
+                    })
+                    for image in images
+                ],
+            }
+            for index, (category, images) in enumerate(albums.items())
+        ],
+    })]
+
+
+def _page(site, slug, fields, blocks, migrated_from, is_home, timestamp):
+    """DynamicPage envelope as lib/migration.ts builds it; both languages start from the same blocks."""
+    return {
+        "id": migrated_page_id(site, slug),
+        "slug": slug,
+        **fields,
+        "contentAr": "",
+        "contentEn": "",
+        "blocksAr": blocks,
+        "blocksEn": blocks,
+        "blocks": blocks,
+        "isPublished": True,
+        "isHome": is_home,
+        "migratedFrom": migrated_from,
+        "createdAt": timestamp,
+        "updatedAt": timestamp,
+    }
+
+
+def create_migrated_homepage(site, sections, timestamp):
+    """Return (homepage id, page or None when the site already has a homepage)."""
+    existing = next((page for page in sections["pages"] or [] if page.get("isHome")), None)
+    if existing:
+        return existing.get("id"), None
+    blocks = []
+    for convert, section in (
+        (convert_hero_slides, sections["heroSlides"]),
+        (convert_about_content, sections["aboutContent"]),
+        (convert_gallery, sections["galleryImages"]),
+    ):
+        blocks.extend(convert(section, len(blocks)))
+    page = _page(site, "home", {
+        "titleAr": "الصفحة الرئيسية",
+        "titleEn": "Home",
+        "descriptionAr": "الصفحة الرئيسية للموقع",
+        "descriptionEn": "Website Homepage",
+        "seoDescriptionAr": "المدرسة النموذجية للتربية الخاصة - الصفحة الرئيسية",
+        "seoDescriptionEn": "Al Namothajia School - Home Page",
+    }, blocks, "legacy_homepage", True, timestamp)
+    return page["id"], page
+
+
+def create_department_page(site, department, timestamp):
+    """One department → page under /departments/<type> (createDepartmentPages)."""
+    blocks = [
+        _block("header", 0, "section-header", {
+            "title": department.get("titleAr"),
+            "titleEn": department.get("titleEn"),
+            "subtitle": department.get("descriptionAr"),
+            "subtitleEn": department.get("descriptionEn"),
+            "alignment": "center",
+        }),
+        _block("content", 1, "rich-text", {
+            "content": department.get("descriptionAr"),
+            "contentEn": department.get("descriptionEn"),
+        }),
+    ]
+    if department.get("image"):
+        blocks.append(_block("image", 2, "image-with-text", {
+            "image": department["image"],
+            "imagePosition": "right",
+            "title": department.get("titleAr"),
+            "titleEn": department.get("titleEn"),
+            "content": department.get("descriptionAr"),
+            "contentEn": department.get("descriptionEn"),
+        }))
+    return _page(site, f"departments/{_slug(department['type'])}", {
+        "titleAr": department.get("titleAr", ""),
+        "titleEn": department.get("titleEn", ""),
+        "descriptionAr": department.get("descriptionAr", ""),
+        "descriptionEn": department.get("descriptionEn", ""),
+    }, blocks, "legacy_departments", False, timestamp)
+
+
+def migrate_site(site, snapshot, out_dir, timestamp, codecs=()):
+    """Convert one site snapshot and stream its pages to `<out_dir>/<site>.ndjson`; returns its report."""
+    started = time.perf_counter()
+    result = {"site": site, "success": False, "departmentPageIds": [], "warnings": []}
+    path = os.path.join(out_dir, f"{site}.ndjson")
+    try:
+        sections = site_sections(snapshot)
+        homepage_id, homepage = create_migrated_homepage(site, sections, timestamp)
+        result["homepageId"] = homepage_id
+        if homepage is None:
+            result["warnings"].append("homepage already exists, skipped")
+        pages = 0
+        with NdjsonWriter(path, codecs) as writer:
+            if homepage is not None:
+                writer.write(serialize_page(homepage, "compact"))
+                pages += 1
+            for department in sections["departments"] or []:
+                if not department.get("type"):
+                    result["warnings"].append(f"department {department.get('id')!r} has no type, skipped")
+                    continue
+                page = create_department_page(site, department, timestamp)
+                writer.write(serialize_page(page, "compact"))
+                result["departmentPageIds"].append(page["id"])
+                pages += 1
+        result.update(success=True, pages=pages)
+    except Exception as error:  # One broken snapshot must not stop the other sites
+        result["error"] = f"{type(error).__name__}: {error}"
+        remove_file(path)
+    result["seconds"] = time.perf_counter() - started
+    return result
+
+
+def _site_name(snapshot, fallback):
+    return _slug(snapshot.get("site") or snapshot.get("siteId") or fallback) or fallback
+
+
+def _parse_snapshot(text, location):
+    """(snapshot, None) or (None, error) for one JSON document."""
+    try:
+        snapshot = json.loads(text)
+    except ValueError as error:
+        return None, f"{location}: {type(error).__name__}: {error}"
+    if not isinstance(snapshot, dict):
+        return None, f"{location}: expected a snapshot object, got {type(snapshot).__name__}"
+    return snapshot, None
+
+
+def iter_snapshots(paths):
+    """Yield (site, snapshot, error) from snapshot JSON files, NDJSON files and directories of them.
+
+    A file or NDJSON line that cannot be read yields (fallback site, None,
+    error) instead of raising, so it is reported like any other failed site.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            yield from iter_snapshots(list_page_files(path))
+            continue
+        stem = os.path.splitext(os.path.basename(path))[0]
+        try:
+            with open(path, encoding="utf-8") as f:
+                if path.endswith(".ndjson"):
+                    for number, line in enumerate(f, 1):
+                        if line.strip():
+                            snapshot, error = _parse_snapshot(line, f"{path}:{number}")
+                            fallback = f"{stem}-{number}"
+                            yield (_site_name(snapshot, fallback) if snapshot else fallback), snapshot, error
+                    continue
+                text = f.read()
+        except (OSError, UnicodeDecodeError) as error:
+            yield stem, None, f"{path}: {type(error).__name__}: {error}"
+            continue
+        snapshot, error = _parse_snapshot(text, path)
+        yield (_site_name(snapshot, stem) if snapshot else stem), snapshot, error
+
+
+def _failed_site(site, error):
+    """The report entry of a snapshot that could not even be read."""
+    future = Future()
+    future.set_result({"site": site, "success": False, "departmentPageIds": [], "warnings": [], "error": error, "seconds": 0.0})
+    return future
+
+
+def migrate_sites(paths, out_dir, workers=None, codecs=()):
+    """Migrate every snapshot in parallel, writing the report; returns the list of site results."""
+    check_codecs(codecs)
+    os.makedirs(out_dir, exist_ok=True)
+    timestamp = datetime.now().isoformat()
+    workers = workers or os.cpu_count() or 1
+    results = []
+    seen = set()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for site, snapshot, error in iter_snapshots(paths):
+            if site in seen:
+                raise ValueError(f"Duplicate site {site!r}; give each snapshot a unique `site`")
+            seen.add(site)
+            if error is not None:
+                # Queued in order, so the report lists sites as they appear in the input
+                pending.append(_failed_site(site, error))
+            else:
+                pending.append(executor.submit(migrate_site, site, snapshot, out_dir, timestamp, tuple(codecs)))
+            if len(pending) >= workers * WINDOW_PER_WORKER:
+                results.append(pending.popleft().result())
+        while pending:
+            results.append(pending.popleft().result())
+
+    report = {"version": MIGRATION_VERSION, "migratedAt": timestamp, "sites": results}
+    with open(os.path.join(out_dir, REPORT_FILE), "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate legacy site snapshots to block-based pages.")
+    parser.add_argument("paths", nargs="+", help="snapshot JSON/NDJSON files or directories")
+    parser.add_argument("--out", required=True, help="output directory (one NDJSON file per site)")
+    parser.add_argument("--workers", type=int, help="process pool size (default: CPU count)")
+    parser.add_argument("--compress", action="append", choices=CODECS, default=[], help="also write .gz/.br variants (repeatable)")
+    args = parser.parse_args(argv)
+    try:
+        check_codecs(args.compress)
+    except ValueError as error:
+        parser.error(str(error))
+
+    started = time.perf_counter()
+    results = migrate_sites(args.paths, args.out, args.workers, args.compress)
+    failed = [result for result in results if not result["success"]]
+    pages = sum(result.get("pages", 0) for result in results)
+    for result in failed:
+        print(f"❌ {result['site']}: {result['error']}")
+    print(f"✅ Migrated {len(results) - len(failed)} of {len(results)} sites into {pages} pages ({time.perf_counter() - started:.2f}s)")
+    print(f"📁 Pages saved to: {args.out} (report: {REPORT_FILE})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,455 @@
+"""
+Block recipes for generated pages.
+
+Each recipe returns a fresh block dict so callers can mutate the result
+without affecting other pages built in the same run. `build_block` names the
+block `<recipe>-<order>`, so a recipe may use the same block more than once.
+"""
+
+
+# Block 1: Hero Slider
+def hero_block(order=0):
+    return {
+        "type": "hero",
+        "order": order,
+        "content": {
+            "title": "Welcome to Our School",
+            "titleAr": "مرحباً بكم في مدرستنا",
+            "subtitle": "Excellence in Education",
+            "subtitleAr": "التميز في التعليم",
+            "description": "Building tomorrow's leaders today with quality education",
+            "descriptionAr": "بناء قادة الغد اليوم من خلال تعليم عالي الجودة",
+            "image": "/placeholder.svg?height=800&width=1600",
+            "ctaText": "Explore More",
+            "ctaTextAr": "استكشف المزيد",
+            "ctaLink": "#about"
+        },
+        "styles": {
+            "backgroundColor": "gradient",
+            "backgroundGradient": "from-primary/80 via-background/70 to-background/90",
+            "textColor": "foreground",
+            "padding": "none",
+            "margin": "none",
+            "borderRadius": "none",
+            "borderWidth": "0",
+            "borderColor": "border",
+            "shadow": "none",
+            "animation": "fade-in",
+            "animationDuration": "1000",
+            "animationDelay": "0",
+            "hoverScale": "none",
+            "hoverRotate": "0",
+            "hoverTranslateX": "0",
+            "hoverTranslateY": "0",
+            "hoverShadow": "none",
+            "textAlign": "center",
+            "maxWidth": "full",
+            "backdropBlur": "none",
+            "opacity": "100"
+        }
+    }
+
+
+# Block 2: About Section
+def about_block(order=0):
+    return {
+        "type": "features",
+        "order": order,
+        "content": {
+            "title": "About Us",
+            "titleAr": "من نحن",
+            "subtitle": "Excellence in Education",
+            "subtitleAr": "التميز في التعليم",
+            "description": "We are committed to providing the highest quality education",
+            "descriptionAr": "نحن ملتزمون بتقديم أعلى مستويات الجودة في التعليم",
+            "image": "/placeholder.svg?height=600&width=800",
+            "items": [
+                {
+                    "title": "Our Mission",
+                    "titleAr": "مهمتنا",
+                    "description": "To provide excellent education and nurture future leaders",
+                    "descriptionAr": "تقديم تعليم متميز ورعاية قادة المستقبل",
+                    "icon": "target"
+                },
+                {
+                    "title": "Our Vision",
+                    "titleAr": "رؤيتنا",
+                    "description": "To be the leading educational institution in the region",
+                    "descriptionAr": "أن نكون المؤسسة التعليمية الرائدة في المنطقة",
+                    "icon": "heart"
+                },
+                {
+                    "title": "Our Values",
+                    "titleAr": "قيمنا",
+                    "description": "Excellence, integrity, and innovation in everything we do",
+                    "descriptionAr": "التميز والنزاهة والابتكار في كل ما نقوم به",
+                    "icon": "award"
+                },
+                {
+                    "title": "Our Community",
+                    "titleAr": "مجتمعنا",
+                    "description": "A diverse and inclusive learning environment",
+                    "descriptionAr": "بيئة تعليمية متنوعة وشاملة",
+                    "icon": "users"
+                }
+            ]
+        },
+        "styles": {
+            "backgroundColor": "gradient",
+            "backgroundGradient": "from-primary/5 via-accent/5 to-secondary/5",
+            "textColor": "foreground",
+            "padding": "32",
+            "margin": "0",
+            "borderRadius": "3xl",
+            "borderWidth": "0",
+            "borderColor": "border",
+            "shadow": "2xl",
+            "animation": "fade-in-up",
+            "animationDuration": "700",
+            "animationDelay": "200",
+            "hoverScale": "105",
+            "hoverRotate": "0",
+            "hoverTranslateX": "0",
+            "hoverTranslateY": "-4",
+            "hoverShadow": "2xl",
+            "textAlign": "left",
+            "maxWidth": "7xl",
+            "backdropBlur": "sm",
+            "opacity": "100"
+        }
+    }
+
+
+# Block 3: Departments Section
+def departments_block(order=0):
+    return {
+        "type": "cards",
+        "order": order,
+        "content": {
+            "title": "Our Departments",
+            "titleAr": "أقسامنا",
+            "subtitle": "Specialized Excellence",
+            "subtitleAr": "التميز المتخصص",
+            "description": "Explore our specialized departments offering comprehensive services",
+            "descriptionAr": "استكشف أقسامنا المتخصصة التي تقدم خدمات شاملة",
+            "items": [
+                {
+                    "title": "Medical Department",
+                    "titleAr": "القسم الطبي",
+                    "description": "Complete healthcare services for students",
+                    "descriptionAr": "خدمات رعاية صحية كاملة للطلاب",
+                    "image": "/placeholder.svg?height=400&width=600",
+                    "link": "/departments/medical"
+                },
+                {
+                    "title": "Science Department",
+                    "titleAr": "القسم العلمي",
+                    "description": "Advanced scientific education and labs",
+                    "descriptionAr": "تعليم علمي متقدم ومختبرات حديثة",
+                    "image": "/placeholder.svg?height=400&width=600",
+                    "link": "/departments/science"
+                },
+                {
+                    "title": "Experimental Department",
+                    "titleAr": "القسم التجريبي",
+                    "description": "Innovation and experimentation",
+                    "descriptionAr": "الابتكار والتجربة",
+                    "image": "/placeholder.svg?height=400&width=600",
+                    "link": "/departments/experimental"
+                }
+            ]
+        },
+        "styles": {
+            "backgroundColor": "gradient",
+            "backgroundGradient": "from-background via-muted/30 to-background",
+            "textColor": "foreground",
+            "padding": "32",
+            "margin": "0",
+            "borderRadius": "2xl",
+            "borderWidth": "2",
+            "borderColor": "primary/30",
+            "shadow": "2xl",
+            "animation": "fade-in-up",
+            "animationDuration": "700",
+            "animationDelay": "150",
+            "hoverScale": "105",
+            "hoverRotate": "0",
+            "hoverTranslateX": "0",
+            "hoverTranslateY": "-16",
+            "hoverShadow": "2xl",
+            "textAlign": "center",
+            "maxWidth": "6xl",
+            "backdropBlur": "sm",
+            "opacity": "100"
+        }
+    }
+
+
+# Block 4: Gallery Section
+def gallery_block(order=0):
+    return {
+        "type": "gallery",
+        "order": order,
+        "content": {
+            "title": "Photo Gallery",
+            "titleAr": "معرض الصور",
+            "subtitle": "Explore Our Facilities",
+            "subtitleAr": "استكشف مرافقنا",
+            "description": "A visual tour of our school facilities and activities",
+            "descriptionAr": "جولة مصورة في مرافق المدرسة وأنشطتها",
+            "images": [
+                {
+                    "url": "/placeholder.svg?height=400&width=600",
+                    "title": "Modern Classrooms",
+                    "titleAr": "فصول دراسية حديثة",
+                    "description": "State-of-the-art learning spaces",
+                    "descriptionAr": "مساحات تعليمية حديثة",
+                    "category": "Facilities"
+                },
+                {
+                    "url": "/placeholder.svg?height=400&width=600",
+                    "title": "Library",
+                    "titleAr": "المكتبة",
+                    "description": "Extensive collection of books and resources",
+                    "descriptionAr": "مجموعة واسعة من الكتب والموارد",
+                    "category": "Facilities"
+                },
+                {
+                    "url": "/placeholder.svg?height=400&width=600",
+                    "title": "Sports Facilities",
+                    "titleAr": "المرافق الرياضية",
+                    "description": "Modern sports and recreation areas",
+                    "descriptionAr": "مناطق رياضية وترفيهية حديثة",
+                    "category": "Activities"
+                },
+                {
+                    "url": "/placeholder.svg?height=400&width=600",
+                    "title": "Science Labs",
+                    "titleAr": "المختبرات العلمية",
+                    "description": "Fully equipped laboratories",
+                    "descriptionAr": "مختبرات مجهزة بالكامل",
+                    "category": "Facilities"
+                },
+                {
+                    "url": "/placeholder.svg?height=400&width=600",
+                    "title": "Cafeteria",
+                    "titleAr": "الكافتيريا",
+                    "description": "Healthy and delicious meals",
+                    "descriptionAr": "وجبات صحية ولذيذة",
+                    "category": "Facilities"
+                },
+                {
+                    "url": "/placeholder.svg?height=400&width=600",
+                    "title": "Playground",
+                    "titleAr": "الملعب",
+                    "description": "Safe and fun play areas",
+                    "descriptionAr": "مناطق لعب آمنة وممتعة",
+                    "category": "Activities"
+                }
+            ]
+        },
+        "styles": {
+            "backgroundColor": "gradient",
+            "backgroundGradient": "from-background via-muted/20 to-background",
+            "textColor": "foreground",
+            "padding": "24",
+            "margin": "0",
+            "borderRadius": "2xl",
+            "borderWidth": "1",
+            "borderColor": "border/50",
+            "shadow": "2xl",
+            "animation": "fade-in-up",
+            "animationDuration": "500",
+            "animationDelay": "100",
+            "hoverScale": "102",
+            "hoverRotate": "0",
+            "hoverTranslateX": "0",
+            "hoverTranslateY": "-12",
+            "hoverShadow": "2xl",
+            "textAlign": "center",
+            "maxWidth": "full",
+            "backdropBlur": "sm",
+            "opacity": "100"
+        }
+    }
+
+
+# Block 5: Testimonials Section
+def testimonials_block(order=0):
+    return {
+        "type": "testimonials",
+        "order": order,
+        "content": {
+            "title": "What Parents Say",
+            "titleAr": "آراء أولياء الأمور",
+            "subtitle": "Parent Reviews",
+            "subtitleAr": "تقييمات أولياء الأمور",
+            "description": "We are proud of the trust and satisfaction of parents",
+            "descriptionAr": "نفخر بثقة أولياء الأمور ورضاهم",
+            "items": [
+                {
+                    "name": "Ahmed Al-Mansouri",
+                    "nameAr": "أحمد المنصوري",
+                    "image": "/placeholder.svg?height=100&width=100",
+                    "rating": 5,
+                    "comment": "Excellent school with dedicated teachers and modern facilities",
+                    "commentAr": "مدرسة ممتازة مع معلمين متفانين ومرافق حديثة"
+                },
+                {
+                    "name": "Fatima Al-Khatib",
+                    "nameAr": "فاطمة الخطيب",
+                    "image": "/placeholder.svg?height=100&width=100",
+                    "rating": 5,
+                    "comment": "My children love going to school every day",
+                    "commentAr": "أطفالي يحبون الذهاب إلى المدرسة كل يوم"
+                },
+                {
+                    "name": "Omar Al-Rashid",
+                    "nameAr": "عمر الراشد",
+                    "image": "/placeholder.svg?height=100&width=100",
+                    "rating": 5,
+                    "comment": "Great communication and excellent academic results",
+                    "commentAr": "تواصل رائع ونتائج أكاديمية ممتازة"
+                }
+            ]
+        },
+        "styles": {
+            "backgroundColor": "gradient",
+            "backgroundGradient": "from-primary/5 via-accent/5 to-secondary/5",
+            "textColor": "foreground",
+            "padding": "24",
+            "margin": "0",
+            "borderRadius": "2xl",
+            "borderWidth": "0",
+            "borderColor": "border",
+            "shadow": "2xl",
+            "animation": "fade-in-up",
+            "animationDuration": "300",
+            "animationDelay": "100",
+            "hoverScale": "105",
+            "hoverRotate": "0",
+            "hoverTranslateX": "0",
+            "hoverTranslateY": "-8",
+            "hoverShadow": "2xl",
+            "textAlign": "center",
+            "maxWidth": "6xl",
+            "backdropBlur": "sm",
+            "opacity": "100"
+        }
+    }
+
+
+# Block 6: Jobs/Services Section
+def jobs_block(order=0):
+    return {
+        "type": "cta",
+        "order": order,
+        "content": {
+            "title": "Career Opportunities",
+            "titleAr": "فرص العمل",
+            "subtitle": "Join Our Team",
+            "subtitleAr": "انضم إلى فريقنا",
+            "description": "Explore our job openings and service requests",
+            "descriptionAr": "استكشف فرص العمل وطلبات الخدمة المتاحة",
+            "ctaText": "View Opportunities",
+            "ctaTextAr": "عرض الفرص",
+            "ctaLink": "/jobs",
+            "image": "/placeholder.svg?height=500&width=800"
+        },
+        "styles": {
+            "backgroundColor": "gradient",
+            "backgroundGradient": "from-background via-muted/30 to-background",
+            "textColor": "foreground",
+            "padding": "24",
+            "margin": "0",
+            "borderRadius": "2xl",
+            "borderWidth": "1",
+            "borderColor": "border/50",
+            "shadow": "xl",
+            "animation": "fade-in-up",
+            "animationDuration": "500",
+            "animationDelay": "150",
+            "hoverScale": "105",
+            "hoverRotate": "0",
+            "hoverTranslateX": "0",
+            "hoverTranslateY": "0",
+            "hoverShadow": "xl",
+            "textAlign": "center",
+            "maxWidth": "5xl",
+            "backdropBlur": "none",
+            "opacity": "100"
+        }
+    }
+
+
+# Block 7: Contact Section
+def contact_block(order=0):
+    return {
+        "type": "contact",
+        "order": order,
+        "content": {
+            "title": "Contact Us",
+            "titleAr": "تواصل معنا",
+            "subtitle": "We're Here to Help",
+            "subtitleAr": "نحن هنا لمساعدتك",
+            "description": "Get in touch with us for any inquiries or questions",
+            "descriptionAr": "تواصل معنا لأي استفسارات أو أسئلة",
+            "phone": "+962 6 4122002",
+            "email": "info@namothajia.com",
+            "address": "Amman - Airport Road",
+            "addressAr": "عمان - طريق المطار",
+            "hours": "Sunday - Thursday: 7:00 AM - 3:00 PM",
+            "hoursAr": "الأحد - الخميس: 7:00 صباحاً - 3:00 مساءً"
+        },
+        "styles": {
+            "backgroundColor": "gradient",
+            "backgroundGradient": "from-slate-50 via-blue-50/30 to-purple-50/20",
+            "textColor": "foreground",
+            "padding": "32",
+            "margin": "0",
+            "borderRadius": "3xl",
+            "borderWidth": "2",
+            "borderColor": "blue-500/20",
+            "shadow": "2xl",
+            "animation": "fade-in-up",
+            "animationDuration": "500",
+            "animationDelay": "0",
+            "hoverScale": "103",
+            "hoverRotate": "0",
+            "hoverTranslateX": "0",
+            "hoverTranslateY": "0",
+            "hoverShadow": "2xl",
+            "textAlign": "left",
+            "maxWidth": "7xl",
+            "backdropBlur": "xl",
+            "opacity": "100"
+        }
+    }
+
+
+
+# Recipe name -> builder. Page specs refer to blocks by these names.
+BLOCK_RECIPES = {
+    "hero": hero_block,
+    "about": about_block,
+    "departments": departments_block,
+    "gallery": gallery_block,
+    "testimonials": testimonials_block,
+    "jobs": jobs_block,
+    "contact": contact_block,
+}
+
+# The block order of the original home page template
+HOME_RECIPE = ["hero", "about", "departments", "gallery", "testimonials", "jobs", "contact"]
+
+
+def build_block(name, order, overrides=None):
+    """Build one block from its recipe, merging `overrides` into its content."""
+    try:
+        builder = BLOCK_RECIPES[name]
+    except KeyError:
+        raise ValueError(f"Unknown block recipe: {name!r}") from None
+    block = {"id": f"{name}-{order}", **builder(order)}
+    if overrides:
+        block["content"].update(overrides)
+    return block
@@ -0,0 +1,296 @@
+"""
+Bulk page generation from a page spec.
+
+A spec lists the pages to build, the block recipes each page is made of and
+the languages to emit:
+
+    {
+      "languages": ["ar", "en"],
+      "recipes": {"department": ["hero", "about", "gallery", "contact"]},
+      "pages": [
+        {"slug": "medical", "recipe": "department",
+         "titleAr": "القسم الطبي", "titleEn": "Medical Department",
+         "content": {"hero": {"titleAr": "القسم الطبي"}}}
+      ]
+    }
+
+`pages` may also be a path (relative to the spec file) to an NDJSON file with
+one page entry per line, so very large page lists are never loaded at once.
+Pages are built lazily and streamed to disk one at a time.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+
+from build_cache import BuildCache, apply_previous_stamps, page_hashes, recipes_fingerprint
+from page_blocks import HOME_RECIPE, build_block
+from page_writers import NDJSON_FILE, NdjsonWriter, check_codecs, compress_variants, remove_file, serialize_page, write_file
+from style_presets import PRESETS_FILE, canonical_json, derive_presets, intern_page, write_presets
+
+# Specs with at least this many pages are built in a process pool
+POOL_THRESHOLD = 500
+# Pages handed to a worker per task, and tasks kept in flight per worker
+POOL_CHUNK_SIZE = 64
+POOL_WINDOW_PER_WORKER = 4
+
+DEFAULT_LANGUAGES = ["ar"]
+
+BuildTask = namedtuple("BuildTask", "page recipe language timestamp previous input_hash", defaults=(None, None))
+RenderedPage = namedtuple(
+    "RenderedPage", "id filename text variants blocks hash block_hashes input_hash created_at updated_at output_hash"
+)
+
+# The page the script produced before specs existed
+HOME_TEMPLATE_PAGE = {
+    "slug": "home-template",
+    "title": "Home Page Template",
+    "titleAr": "قالب الصفحة الرئيسية",
+    "titleEn": "Home Page Template",
+    "recipe": "home",
+}
+
+
+def page_id(slug, language):
+    """Deterministic page id: unique per (slug, language), stable across runs."""
+    digest = hashlib.sha1(f"{slug}\0{language}".encode("utf-8")).hexdigest()[:10]
+    return f"{slug.strip('/').replace('/', '-')}-{language}-{digest}"
+
+
+def load_spec(path):
+    with open(path, encoding="utf-8") as f:
+        spec = json.load(f)
+    pages = spec.get("pages")
+    if isinstance(pages, str) and not os.path.isabs(pages):
+        spec["pages"] = os.path.join(os.path.dirname(os.path.abspath(path)), pages)
+    return spec
+
+
+def iter_page_entries(spec):
+    """Yield the page entries of a spec without materializing an NDJSON page list."""
+    pages = spec.get("pages", [])
+    if isinstance(pages, str):
+        with open(pages, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        yield from pages
+
+
+def count_page_entries(spec):
+    pages = spec.get("pages", [])
+    if isinstance(pages, str):
+        with open(pages, "rb") as f:
+            return sum(1 for line in f if line.strip())
+    return len(pages)
+
+
+def resolve_recipe(spec, page):
+    recipe = page.get("recipe", "home")
+    if isinstance(recipe, list):
+        return recipe
+    recipes = spec.get("recipes", {})
+    if recipe in recipes:
+        return recipes[recipe]
+    if recipe == "home":
+        return HOME_RECIPE
+    raise ValueError(f"Page {page.get('slug')!r} uses unknown recipe {recipe!r}")
+
+
+def iter_tasks(spec, timestamp):
+    """Expand pages x languages into build tasks, rejecting duplicate pages."""
+    default_languages = spec.get("languages", DEFAULT_LANGUAGES)
+    seen = set()
+    for page in iter_page_entries(spec):
+        if not page.get("slug"):
+            raise ValueError(f"Page entry without a slug: {page!r}")
+        recipe = resolve_recipe(spec, page)
+        for language in page.get("languages", default_languages):
+            key = (page["slug"], language)
+            if key in seen:
+                raise ValueError(f"Duplicate page {page['slug']!r} for language {language!r}")
+            seen.add(key)
+            yield BuildTask(page, recipe, language, timestamp)
+
+
+def build_page(page, recipe, language, timestamp):
+    overrides = page.get("content", {})
+    return {
+        "id": page_id(page["slug"], language),
+        "title": page.get("title") or page.get("titleEn") or page["slug"],
+        "titleAr": page.get("titleAr", ""),
+        "titleEn": page.get("titleEn", ""),
+        "slug": page["slug"],
+        "language": language,
+        "status": page.get("status", "draft"),  # Drafts don't interfere with live pages
+        "createdAt": timestamp,
+        "updatedAt": timestamp,
+        "blocks": [
+            build_block(name, order, overrides.get(name))
+            for order, name in enumerate(recipe)
+        ],
+    }
+
+
+def spec_style_presets(spec):
+    """Derive style presets for a spec from its recipes, weighted by page count.
+
+    Styles come only from recipes (page content overrides never touch them),
+    so this reads the page entries without building a single block.
+    """
+    recipe_counts = Counter()
+    languages = spec.get("languages", DEFAULT_LANGUAGES)
+    for page in iter_page_entries(spec):
+        for name in resolve_recipe(spec, page):
+            recipe_counts[name] += len(page.get("languages", languages))
+    style_counts = Counter()
+    for name, count in recipe_counts.items():
+        style_counts[canonical_json(build_block(name, 0)["styles"])] += count
+    return derive_presets(style_counts)
+
+
+def render_page(task, presets=None, fmt="pretty", codecs=()):
+    """Build one page and serialize it.
+
+    Per-file formats are also compressed here, so that work is spread over the
+    process pool; NDJSON output is compressed as one stream by the writer.
+    """
+    page = build_page(task.page, task.recipe, task.language, task.timestamp)
+    if presets:
+        page = intern_page(page, presets)
+    digest, block_hashes = page_hashes(page)
+    apply_previous_stamps(page, digest, task.previous)
+    text = serialize_page(page, fmt)
+    data = text.encode("utf-8")
+    return RenderedPage(
+        id=page["id"],
+        filename=f"{page['id']}.json",
+        text=text,
+        variants=compress_variants(data, codecs) if fmt != "ndjson" else {},
+        blocks=len(page["blocks"]),
+        hash=digest,
+        block_hashes=block_hashes,
+        input_hash=task.input_hash,
+        created_at=page["createdAt"],
+        updated_at=page["updatedAt"],
+        output_hash=hashlib.sha1(data).hexdigest()[:16],
+    )
+
+
+def _render_chunk(tasks, options):
+    return [render_page(task, **options) for task in tasks]
+
+
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _pooled_render(tasks, workers, options):
+    """Render tasks in a process pool, keeping only a bounded window in flight."""
+    window = workers * POOL_WINDOW_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunked(tasks, POOL_CHUNK_SIZE):
+            pending.append(executor.submit(_render_chunk, chunk, options))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _stale_tasks(tasks, cache):
+    """Drop tasks whose inputs match the cache; attach cache state to the rest."""
+    for task in tasks:
+        key = page_id(task.page["slug"], task.language)
+        digest = cache.input_hash(task.page, task.recipe, task.language)
+        if not cache.is_fresh(key, digest):
+            yield task._replace(previous=cache.previous(key), input_hash=digest)
+
+
+def render_pages(spec, timestamp=None, workers=None, presets=None, cache=None, fmt="pretty", codecs=()):
+    """Yield a RenderedPage for every page of the spec that needs building, in spec order."""
+    timestamp = timestamp or datetime.now().isoformat()
+    tasks = iter_tasks(spec, timestamp)
+    if cache is not None:
+        tasks = _stale_tasks(tasks, cache)
+    options = {"presets": presets, "fmt": fmt, "codecs": tuple(codecs)}
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and count_page_entries(spec) >= POOL_THRESHOLD:
+        return _pooled_render(tasks, workers, options)
+    return map(partial(render_page, **options), tasks)
+
+
+def generate(spec, out_dir, workers=None, intern_styles=False, use_cache=True, fmt="pretty", codecs=()):
+    """Stream every page of the spec into `out_dir`.
+
+    `fmt` is one of page_writers.FORMATS and `codecs` adds precompressed
+    siblings. With `intern_styles`, blocks reference a shared preset table
+    written to `out_dir/style-presets.json` instead of carrying full styles.
+    With `use_cache`, only pages whose inputs changed since the last build are
+    rebuilt, and only files whose bytes changed are rewritten; NDJSON output
+    is a single stream, so it is always rebuilt in full. Switching between
+    NDJSON and per-file output removes the other layout's files, which
+    readers of the directory would otherwise load twice.
+    """
+    check_codecs(codecs)
+    os.makedirs(out_dir, exist_ok=True)
+    started = time.perf_counter()
+    presets = None
+    if intern_styles:
+        presets = spec_style_presets(spec)
+        write_presets(presets, os.path.join(out_dir, PRESETS_FILE))
+    cache = None
+    if fmt == "ndjson":
+        BuildCache(out_dir, None).clear()
+    else:
+        remove_file(os.path.join(out_dir, NDJSON_FILE))
+        if use_cache:
+            cache = BuildCache(out_dir, recipes_fingerprint([presets, fmt, sorted(codecs)]))
+    rendered_pages = render_pages(spec, workers=workers, presets=presets, cache=cache, fmt=fmt, codecs=codecs)
+
+    pages = blocks = written = 0
+    if fmt == "ndjson":
+        with NdjsonWriter(os.path.join(out_dir, NDJSON_FILE), codecs) as writer:
+            for rendered in rendered_pages:
+                writer.write(rendered.text)
+                pages += 1
+                blocks += rendered.blocks
+        written = 1
+    else:
+        for rendered in rendered_pages:
+            path = os.path.join(out_dir, rendered.filename)
+            write = cache is None or cache.record(
+                rendered.id,
+                rendered.filename,
+                rendered.input_hash,
+                rendered.hash,
+                rendered.block_hashes,
+                rendered.created_at,
+                rendered.updated_at,
+                rendered.output_hash,
+                rendered.variants,
+            )
+            if write:
+                write_file(path, rendered.text.encode("utf-8"), rendered.variants)
+                written += 1
+            pages += 1
+            blocks += rendered.blocks
+
+    stats = {"pages": pages, "blocks": blocks, "written": written}
+    if cache is not None:
+        stats["manifest"] = cache.save()
+    stats["seconds"] = time.perf_counter() - started
+    return stats
@@ -0,0 +1,206 @@
+"""
+Batched, concurrent importer for generated pages.
+
+Pushes page JSON produced by create-home-page-template.py into the dynamic
+pages collection using Firestore batched writes. Several batches are committed
+in parallel with bounded concurrency, failed commits are retried with
+exponential backoff, and every committed batch is appended to a checkpoint
+file so an interrupted run resumes where it stopped.
+
+Usage:
+    python scripts/page_importer.py generated-pages --checkpoint import.checkpoint
+    python scripts/page_importer.py pages.ndjson --emulator localhost:8080
+    python scripts/page_importer.py generated-pages --validate
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from firestore_client import FIREBASE_COLLECTIONS, clean_for_firestore, get_client, is_retryable
+from page_writers import list_page_files
+
+# Firestore limits: 500 writes and 10 MiB per commit (keep headroom for field names/metadata)
+MAX_BATCH_OPS = 500
+MAX_BATCH_BYTES = 9 * 1024 * 1024
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 5
+BACKOFF_SECONDS = 0.5
+
+
+def iter_page_files(paths):
+    """Yield (page, serialized size) from JSON files, NDJSON files and directories of them."""
+    for path in paths:
+        if os.path.isdir(path):
+            yield from iter_page_files(list_page_files(path))
+        elif path.endswith((".ndjson", ".ndjson.gz")):
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line), len(line.encode("utf-8"))
+        else:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            data = json.loads(text)
+            if isinstance(data, list):
+                for page in data:
+                    yield page, len(json.dumps(page, ensure_ascii=False).encode("utf-8"))
+            else:
+                yield data, len(text.encode("utf-8"))
+
+
+def sized(pages):
+    """Attach a serialized size to in-memory pages so they can be batched."""
+    for page in pages:
+        yield page, len(json.dumps(page, ensure_ascii=False).encode("utf-8"))
+
+
+class Checkpoint:
+    """Append-only log of committed page ids; one JSON line per committed batch."""
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self.done.update(json.loads(line)["ids"])
+
+    def record(self, batch_number, ids):
+        self.done.update(ids)
+        if not self.path:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"batch": batch_number, "ids": ids}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def iter_batches(sized_pages, skip_ids, max_ops=MAX_BATCH_OPS, max_bytes=MAX_BATCH_BYTES):
+    batch = []
+    batch_bytes = 0
+    for page, size in sized_pages:
+        if page["id"] in skip_ids:
+            continue
+        if batch and (len(batch) == max_ops or batch_bytes + size > max_bytes):
+            yield batch
+            batch = []
+            batch_bytes = 0
+        batch.append(page)
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+def commit_batch(client, collection, pages, retries=DEFAULT_RETRIES, backoff=BACKOFF_SECONDS):
+    """Commit one batch of page writes; returns the number of retries it needed."""
+    for attempt in range(retries + 1):
+        batch = client.batch()
+        for page in pages:
+            batch.set(client.collection(collection).document(page["id"]), clean_for_firestore(page))
+        try:
+            batch.commit()
+            return attempt
+        except Exception as error:
+            if attempt == retries or not is_retryable(error):
+                raise
+            # Full jitter keeps parallel batches from retrying in lockstep
+            time.sleep(random.uniform(0, backoff * 2 ** attempt))
+
+
+def import_pages(
+    sized_pages,
+    collection=FIREBASE_COLLECTIONS["DYNAMIC_PAGES"],
+    concurrency=DEFAULT_CONCURRENCY,
+    checkpoint=None,
+    retries=DEFAULT_RETRIES,
+    client=None,
+    max_ops=MAX_BATCH_OPS,
+    max_bytes=MAX_BATCH_BYTES,
+    commit=commit_batch,
+):
+    """Commit pages in parallel batches; returns import stats.
+
+    Only `concurrency` batches are held in memory at once, so the input can be
+    an arbitrarily long stream. `commit(client, collection, items, retries)`
+    writes one batch; the default sets each page in full.
+    """
+    client = client or get_client()
+    checkpoint = checkpoint or Checkpoint(None)
+    started = time.perf_counter()
+    stats = {"pages": 0, "batches": 0, "retries": 0, "skipped": len(checkpoint.done)}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = {}
+
+        def collect(futures):
+            for future in futures:
+                number, ids = pending.pop(future)
+                stats["retries"] += future.result()
+                checkpoint.record(number, ids)
+                stats["pages"] += len(ids)
+                stats["batches"] += 1
+
+        batches = iter_batches(sized_pages, checkpoint.done, max_ops=max_ops, max_bytes=max_bytes)
+        for number, pages in enumerate(batches):
+            if len(pending) >= concurrency:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            future = executor.submit(commit, client, collection, pages, retries)
+            pending[future] = (number, [page["id"] for page in pages])
+        collect(list(pending))
+
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import generated pages into Firestore in batches.")
+    parser.add_argument("paths", nargs="+", help="page JSON/NDJSON files or directories")
+    parser.add_argument("--collection", default=FIREBASE_COLLECTIONS["DYNAMIC_PAGES"])
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="batches committed in parallel")
+    parser.add_argument("--batch-size", type=int, default=MAX_BATCH_OPS, help=f"writes per batch (max {MAX_BATCH_OPS})")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("--checkpoint", help="resume file; committed batches are appended to it")
+    parser.add_argument("--emulator", help="Firestore emulator host:port (sets FIRESTORE_EMULATOR_HOST)")
+    parser.add_argument("--validate", action="store_true", help="refuse to import pages that fail the block schema")
+    args = parser.parse_args(argv)
+
+    if args.validate:
+        from block_schema import validate_paths
+
+        errors = sum(len(problems) for _, problems in validate_paths(args.paths))
+        if errors:
+            print(f"❌ {errors} schema errors; run scripts/block_schema.py for details")
+            return 1
+
+    if args.emulator:
+        os.environ["FIRESTORE_EMULATOR_HOST"] = args.emulator
+    checkpoint = Checkpoint(args.checkpoint)
+    if checkpoint.done:
+        print(f"↩️  Resuming: {len(checkpoint.done)} pages already imported")
+
+    stats = import_pages(
+        iter_page_files(args.paths),
+        collection=args.collection,
+        concurrency=args.concurrency,
+        checkpoint=checkpoint,
+        retries=args.retries,
+        max_ops=min(args.batch_size, MAX_BATCH_OPS),
+    )
+    rate = stats["pages"] / stats["seconds"] if stats["seconds"] else 0
+    print(f"✅ Imported {stats['pages']} pages in {stats['batches']} batches ({stats['seconds']:.2f}s, {rate:,.0f} pages/s)")
+    if stats["retries"]:
+        print(f"🔁 {stats['retries']} retried commits")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
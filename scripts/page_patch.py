@@ -0,0 +1,328 @@
+"""
+Minimal patches between deployed pages and a new build.
+
+Each generated page is compared with the version currently deployed (a
+firestore_exporter.py export or an earlier build output) and reduced to
+
+    patch     RFC 6902 operations that turn the deployed page into the new one
+    set       Firestore field-path updates ({"seo.titleAr": …})
+    delete    Firestore field paths to remove
+
+Blocks are matched by their stable `id`, so the RFC 6902 patch of a copy
+edit inside one block is a handful of operations. The Firestore update is
+not: Firestore cannot address array elements, so any change inside `blocks`
+rewrites the whole array, which is most of a page's bytes. A block edit
+therefore saves little over rewriting the page; the saving is in pages that
+are not written at all and in edits outside the block arrays (titles, SEO,
+status). To write only the edited blocks, diff pages packed with
+block_store.py: their `blockRefs` arrays hold short references, and an
+edited block is a new document in the blocks collection. Pages missing from
+the deployed set are written in full, unchanged pages are not written at all.
+
+Usage:
+    python scripts/page_patch.py generated-pages --previous backups/2024-01-31/web_dynamic_pages
+    python scripts/page_patch.py generated-pages --previous deployed-pages --out patches.ndjson
+    python scripts/page_patch.py generated-pages --previous deployed-pages --apply --emulator localhost:8080
+"""
+
+import argparse
+import copy
+import json
+import os
+import random
+import re
+import sys
+import time
+
+from firestore_client import FIREBASE_COLLECTIONS, clean_for_firestore, is_retryable
+from page_importer import (
+    BACKOFF_SECONDS,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_RETRIES,
+    MAX_BATCH_OPS,
+    import_pages,
+    iter_page_files,
+    sized,
+)
+
+SHARD_PREFIX = "part-"
+SIMPLE_FIELD_RE = re.compile(r"^[A-Za-z_][A-Za-z_0-9]*$")
+
+
+def _pointer(tokens):
+    return "".join("/" + str(token).replace("~", "~0").replace("/", "~1") for token in tokens)
+
+
+def _same(old, new):
+    # True == 1 in Python, but a boolean turning into a number is still a change
+    return type(old) is type(new) and old == new
+
+
+def _keyed_ids(items):
+    """Ids of a list of blocks/items, or None when they cannot be matched by id."""
+    if not all(isinstance(item, dict) and "id" in item for item in items):
+        return None
+    ids = [item["id"] for item in items]
+    return ids if len(set(ids)) == len(ids) else None
+
+
+def _diff_list(old, new, tokens, ops):
+    old_ids = _keyed_ids(old) if old else None
+    new_ids = _keyed_ids(new) if new else None
+    if old_ids is None or new_ids is None:
+        ops.append({"op": "replace", "path": _pointer(tokens), "value": new})
+        return
+    new_set = set(new_ids)
+    old_set = set(old_ids)
+    kept = [item_id for item_id in old_ids if item_id in new_set]
+    if kept != [item_id for item_id in new_ids if item_id in old_set]:
+        # Reordered blocks: moves would cost as much as rewriting the array
+        ops.append({"op": "replace", "path": _pointer(tokens), "value": new})
+        return
+    for index in range(len(old) - 1, -1, -1):
+        if old_ids[index] not in new_set:
+            ops.append({"op": "remove", "path": _pointer([*tokens, index])})
+    # Walking the new list in order keeps every index valid as the operations are applied
+    old_by_id = dict(zip(old_ids, old))
+    for index, item in enumerate(new):
+        if item["id"] in old_by_id:
+            _diff(old_by_id[item["id"]], item, [*tokens, index], ops)
+        else:
+            ops.append({"op": "add", "path": _pointer([*tokens, index]), "value": item})
+
+
+def _diff(old, new, tokens, ops):
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer([*tokens, key])})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer([*tokens, key]), "value": value})
+            else:
+                _diff(old[key], value, [*tokens, key], ops)
+    elif isinstance(old, list) and isinstance(new, list):
+        if old != new:
+            _diff_list(old, new, tokens, ops)
+    elif not _same(old, new):
+        ops.append({"op": "replace", "path": _pointer(tokens), "value": new})
+
+
+def diff_pages(old, new):
+    """RFC 6902 operations turning `old` into `new`, matching list items by `id`."""
+    ops = []
+    _diff(old, new, [], ops)
+    return ops
+
+
+def _parse_pointer(path):
+    return [token.replace("~1", "/").replace("~0", "~") for token in path.split("/")[1:]]
+
+
+def apply_patch(document, ops):
+    """Apply add/remove/replace operations to a copy of `document`."""
+    document = copy.deepcopy(document)
+    for op in ops:
+        *parents, last = _parse_pointer(op["path"])
+        target = document
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+        if isinstance(target, list):
+            index = int(last)
+            if op["op"] == "add":
+                target.insert(index, op["value"])
+            elif op["op"] == "remove":
+                del target[index]
+            else:
+                target[index] = op["value"]
+        elif op["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = op["value"]
+    return document
+
+
+def field_path(tokens):
+    """Firestore field path, backtick-quoting segments that are not plain identifiers."""
+    return ".".join(
+        token if SIMPLE_FIELD_RE.match(token) else "`" + token.replace("\\", "\\\\").replace("`", "\\`") + "`"
+        for token in tokens
+    )
+
+
+def firestore_updates(ops, new):
+    """Collapse patch operations into Firestore ({field path: value}, [deleted field paths]).
+
+    Paths stop at the first array, since Firestore only addresses map fields,
+    so a change anywhere inside an array rewrites that array in full;
+    overlapping paths are merged into the shortest one.
+    """
+    prefixes = {}
+    for op in ops:
+        tokens = _parse_pointer(op["path"])
+        value = new
+        prefix = []
+        for token in tokens:
+            if not isinstance(value, dict) or token not in value:
+                break
+            prefix.append(token)
+            value = value[token]
+        # A removed map field is absent from `new`, which leaves the prefix one token short
+        if op["op"] == "remove" and prefix == tokens[:-1] and isinstance(value, dict):
+            prefixes[tuple(tokens)] = False
+        else:
+            prefixes[tuple(prefix)] = True
+    updates = {}
+    deletes = []
+    covered = []
+    for tokens in sorted(prefixes):
+        if any(tokens[:len(parent)] == parent for parent in covered):
+            continue
+        covered.append(tokens)
+        if not prefixes[tokens]:
+            deletes.append(field_path(tokens))
+            continue
+        value = new
+        for token in tokens:
+            value = value[token]
+        updates[field_path(tokens)] = value
+    return updates, deletes
+
+
+def _expand_previous(paths):
+    """Export collection directories contribute their gzip shards, other paths are read as pages."""
+    for path in paths:
+        shards = []
+        if os.path.isdir(path):
+            shards = sorted(
+                name for name in os.listdir(path) if name.startswith(SHARD_PREFIX) and name.endswith(".ndjson.gz")
+            )
+        if shards:
+            yield from (os.path.join(path, name) for name in shards)
+        else:
+            yield path
+
+
+def iter_deployed_pages(paths):
+    """Stream pages from exports ({"id", "data"} lines) or page files."""
+    for page, _ in iter_page_files(_expand_previous(paths)):
+        if set(page) == {"id", "data"}:
+            page = {"id": page["id"], **page["data"]}
+        yield page
+
+
+def load_previous(paths):
+    """Deployed pages by id."""
+    return {page["id"]: page for page in iter_deployed_pages(paths)}
+
+
+def plan_updates(new_pages, previous):
+    """Yield one write per new or changed page: a full `page` or a `patch` with its Firestore updates."""
+    for page in new_pages:
+        page = clean_for_firestore(page)
+        old = previous.get(page["id"])
+        if old is None:
+            yield {"id": page["id"], "page": page}
+            continue
+        ops = diff_pages(clean_for_firestore(old), page)
+        if ops:
+            updates, deletes = firestore_updates(ops, page)
+            yield {"id": page["id"], "patch": ops, "set": updates, "delete": deletes}
+
+
+def commit_writes(client, collection, writes, retries=DEFAULT_RETRIES, backoff=BACKOFF_SECONDS):
+    """page_importer commit callback: full pages are set, patches become field updates."""
+    from google.cloud.firestore import DELETE_FIELD
+
+    for attempt in range(retries + 1):
+        batch = client.batch()
+        for write in writes:
+            reference = client.collection(collection).document(write["id"])
+            if "page" in write:
+                batch.set(reference, write["page"])
+            else:
+                batch.update(reference, {**write["set"], **{path: DELETE_FIELD for path in write["delete"]}})
+        try:
+            batch.commit()
+            return attempt
+        except Exception as error:
+            if attempt == retries or not is_retryable(error):
+                raise
+            time.sleep(random.uniform(0, backoff * 2 ** attempt))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff generated pages against deployed ones and write only the changes.")
+    parser.add_argument("paths", nargs="+", help="generated page JSON/NDJSON files or directories")
+    parser.add_argument("--previous", nargs="+", required=True, help="deployed pages: export collection directories or page files")
+    parser.add_argument("--out", help="write one NDJSON line per changed page")
+    parser.add_argument("--apply", action="store_true", help="commit the updates to Firestore")
+    parser.add_argument("--collection", default=FIREBASE_COLLECTIONS["DYNAMIC_PAGES"])
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="batches committed in parallel")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("--emulator", help="Firestore emulator host:port (sets FIRESTORE_EMULATOR_HOST)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    previous = load_previous(args.previous)
+    stats = {"pages": 0, "new": 0, "patched": 0, "operations": 0, "fields": 0, "arrays": 0, "patch_bytes": 0, "full_bytes": 0}
+
+    def planned(out):
+        for page, size in iter_page_files(args.paths):
+            stats["pages"] += 1
+            for write in plan_updates([page], previous):
+                line = json.dumps(write, ensure_ascii=False)
+                if out:
+                    out.write(line + "\n")
+                if "page" in write:
+                    stats["new"] += 1
+                else:
+                    stats["patched"] += 1
+                    stats["operations"] += len(write["patch"])
+                    stats["fields"] += len(write["set"]) + len(write["delete"])
+                    stats["arrays"] += sum(isinstance(value, list) for value in write["set"].values())
+                    stats["patch_bytes"] += len(json.dumps([write["set"], write["delete"]], ensure_ascii=False).encode("utf-8"))
+                    stats["full_bytes"] += size
+                yield write
+
+    if args.emulator:
+        os.environ["FIRESTORE_EMULATOR_HOST"] = args.emulator
+    result = None
+    out = open(args.out, "w", encoding="utf-8") if args.out else None
+    try:
+        if args.apply:
+            # Writes stream straight into the importer's bounded batch window
+            result = import_pages(
+                sized(planned(out)),
+                collection=args.collection,
+                concurrency=args.concurrency,
+                retries=args.retries,
+                max_ops=MAX_BATCH_OPS,
+                commit=commit_writes,
+            )
+        else:
+            for _ in planned(out):
+                pass
+    finally:
+        if out:
+            out.close()
+    seconds = time.perf_counter() - started
+
+    unchanged = stats["pages"] - stats["new"] - stats["patched"]
+    print(f"🔎 {stats['pages']} pages: {stats['new']} new, {stats['patched']} changed, {unchanged} unchanged ({seconds:.2f}s)")
+    if stats["patched"]:
+        print(
+            f"✂️  {stats['operations']} patch operations → {stats['fields']} field writes, "
+            f"{stats['patch_bytes']:,} bytes instead of {stats['full_bytes']:,}"
+        )
+        if stats["arrays"]:
+            print(f"⚠️  {stats['arrays']} of those writes replace a whole array (Firestore cannot update array elements)")
+    if args.out:
+        print(f"📁 Patches saved to: {args.out}")
+    if result:
+        print(f"✅ Wrote {result['pages']} pages in {result['batches']} batches ({result['seconds']:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Output formats for generated pages.
+
+    pretty   one indented JSON file per page (the original output)
+    compact  one minified JSON file per page
+    ndjson   a single pages.ndjson stream with one minified page per line
+
+Any format can also be precompressed: `.gz` and/or `.br` siblings are written
+next to each output file so static hosting can serve them directly. Brotli
+needs the optional `brotli` package.
+"""
+
+import gzip
+import json
+import os
+
+try:
+    import brotli
+except ImportError:  # Optional: only needed for .br output
+    brotli = None
+
+FORMATS = ("pretty", "compact", "ndjson")
+CODECS = ("gz", "br")
+NDJSON_FILE = "pages.ndjson"
+PAGE_FILE_EXTENSIONS = (".json", ".ndjson")
+# Build artifacts written next to pages but not pages themselves; the modules
+# that write them import their names from here, so the filter cannot drift
+MANIFEST_FILE = "build-manifest.json"
+PRESETS_FILE = "style-presets.json"
+MIGRATION_REPORT_FILE = "migration-report.json"
+BLOCK_STORE_INDEX_FILE = "block-store.json"
+EXPORT_MANIFEST_FILE = "export-manifest.json"
+EXPORT_CURSOR_FILE = "cursor.json"
+NON_PAGE_FILES = {
+    MANIFEST_FILE,
+    PRESETS_FILE,
+    MIGRATION_REPORT_FILE,
+    BLOCK_STORE_INDEX_FILE,
+    EXPORT_MANIFEST_FILE,
+    EXPORT_CURSOR_FILE,
+}
+GZIP_LEVEL = 9
+# Precompressed assets are built once and served many times, so use the maximum quality
+BROTLI_QUALITY = 11
+
+
+def check_codecs(codecs):
+    for codec in codecs:
+        if codec not in CODECS:
+            raise ValueError(f"Unknown compression {codec!r} (expected one of {', '.join(CODECS)})")
+        if codec == "br" and brotli is None:
+            raise ValueError("Brotli output needs the brotli package: pip install brotli")
+
+
+def list_page_files(directory, extensions=PAGE_FILE_EXTENSIONS):
+    """Sorted paths of the page files in `directory`.
+
+    Dotfiles (the build cache and other state) and the artifacts in
+    NON_PAGE_FILES are skipped.
+    """
+    return [
+        os.path.join(directory, name)
+        for name in sorted(os.listdir(directory))
+        if name.endswith(extensions) and not name.startswith(".") and name not in NON_PAGE_FILES
+    ]
+
+
+def serialize_page(page, fmt="pretty"):
+    if fmt == "pretty":
+        return json.dumps(page, ensure_ascii=False, indent=2)
+    return json.dumps(page, ensure_ascii=False, separators=(",", ":"))
+
+
+def compress_variants(data, codecs):
+    """Return {extension: compressed bytes} for every requested codec."""
+    variants = {}
+    for codec in codecs:
+        if codec == "gz":
+            # mtime=0 keeps the output byte-identical across rebuilds
+            variants[".gz"] = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+        elif codec == "br":
+            variants[".br"] = brotli.compress(data, quality=BROTLI_QUALITY)
+    return variants
+
+
+def remove_stale_variants(path, extensions):
+    """Remove precompressed siblings of `path` other than `extensions`; a stale one would be served instead."""
+    for codec in CODECS:
+        extension = f".{codec}"
+        if extension not in extensions and os.path.exists(path + extension):
+            os.remove(path + extension)
+
+
+def write_file(path, data, variants=None):
+    with open(path, "wb") as f:
+        f.write(data)
+    remove_stale_variants(path, variants or {})
+    for extension, compressed in (variants or {}).items():
+        with open(path + extension, "wb") as f:
+            f.write(compressed)
+
+
+def remove_file(path):
+    """Remove an output file together with its precompressed siblings."""
+    for candidate in (path, *(f"{path}.{codec}" for codec in CODECS)):
+        if os.path.exists(candidate):
+            os.remove(candidate)
+
+
+class NdjsonWriter:
+    """Streams pages into one NDJSON file plus compressed copies, one line at a time."""
+
+    def __init__(self, path, codecs=()):
+        self.path = path
+        self.lines = 0
+        self._file = open(path, "wb")
+        remove_stale_variants(path, {f".{codec}" for codec in codecs})
+        self._gzip = gzip.GzipFile(path + ".gz", "wb", compresslevel=GZIP_LEVEL, mtime=0) if "gz" in codecs else None
+        self._brotli = None
+        if "br" in codecs:
+            self._brotli_file = open(path + ".br", "wb")
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def write(self, text):
+        data = text.encode("utf-8") + b"\n"
+        self._file.write(data)
+        if self._gzip is not None:
+            self._gzip.write(data)
+        if self._brotli is not None:
+            self._brotli_file.write(self._brotli.process(data))
+        self.lines += 1
+
+    def close(self):
+        self._file.close()
+        if self._gzip is not None:
+            self._gzip.close()
+        if self._brotli is not None:
+            self._brotli_file.write(self._brotli.finish())
+            self._brotli_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,356 @@
+"""
+Cache warming and latency measurement for generated routes.
+
+Reads generated pages (or an export), derives their routes the way
+sitemap_generator.py does, and requests every route from a running Next.js
+server through a pool of keep-alive connections with bounded concurrency.
+Each request records
+
+    ttfb    time until the first byte of the response
+    total   time until the whole body (chunked or sized) has arrived
+
+With --repeat N the route list is requested N times: the first pass hits cold
+caches and warms them, later passes show the warm latency. The report gives
+p50/p95/p99 and a latency histogram per pass, per block type (a page's sample
+counts for every block type on it) and per page, plus the slowest pages, so a
+block mix that renders slowly stands out.
+
+The client speaks plain HTTP/1.1 over asyncio streams, so no HTTP library is
+needed and TTFB is measured at the socket.
+
+Usage:
+    python scripts/route_warmer.py generated-pages
+    python scripts/route_warmer.py generated-pages --base-url http://localhost:3000 --concurrency 16 --repeat 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from urllib.parse import quote, urlsplit
+
+from page_patch import iter_deployed_pages
+from sitemap_generator import is_published, page_routes
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT_FILE = os.path.join(REPO_ROOT, "build", "benchmarks", "latency.json")
+DEFAULT_BASE_URL = "http://localhost:3000"
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 60.0
+PERCENTILES = (50, 95, 99)
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+SLOWEST_PAGES = 10
+READ_SIZE = 64 * 1024
+# Statuses whose responses never carry a body, whatever their headers say (RFC 9112 §6.3)
+BODILESS_STATUSES = (204, 304)
+
+
+def parse_status(status_line):
+    """Status code of an HTTP/1.x status line; ConnectionError when it is not one."""
+    parts = status_line.split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith(b"HTTP/") or not parts[1].isdigit():
+        raise ConnectionError(f"malformed status line {status_line[:80]!r}")
+    return int(parts[1])
+
+
+async def _read_headers(reader):
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _read_body(reader, headers):
+    """Read a chunked, sized or close-delimited body; returns its size."""
+    size = 0
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            chunk_size = int((await reader.readline()).split(b";")[0], 16)
+            if chunk_size == 0:
+                while await reader.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            size += len(await reader.readexactly(chunk_size))
+            await reader.readline()
+    elif "content-length" in headers:
+        size = len(await reader.readexactly(int(headers["content-length"])))
+    else:
+        while data := await reader.read(READ_SIZE):
+            size += len(data)
+    return size
+
+
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections to one origin, at most `size` of them open."""
+
+    def __init__(self, base_url, size, timeout=DEFAULT_TIMEOUT):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = parts.scheme == "https"
+        self.host_header = parts.netloc
+        self.timeout = timeout
+        self.opened = 0
+        self.retried = 0
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def _connection(self):
+        """An idle connection if there is one, else a new one; returns (reader, writer, reused)."""
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        return (*await self._open(), False)
+
+    async def _open(self):
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl or None)
+
+    async def request(self, path, method="GET"):
+        """Request `path`; returns (status, ttfb seconds, total seconds, body bytes)."""
+        async with self._slots:
+            reader, writer, reused = await self._connection()
+            try:
+                return await self._timed_exchange(reader, writer, path, method)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not reused:
+                    raise
+            # The server may drop an idle keep-alive connection as it is reused; GET and HEAD are safe to resend
+            self.retried += 1
+            reader, writer = await self._open()
+            return await self._timed_exchange(reader, writer, path, method)
+
+    async def _timed_exchange(self, reader, writer, path, method):
+        try:
+            return await asyncio.wait_for(self._exchange(reader, writer, path, method), self.timeout)
+        except BaseException:
+            writer.close()
+            raise
+
+    async def _exchange(self, reader, writer, path, method):
+        started = time.perf_counter()
+        writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host_header}\r\n"
+            "Accept: text/html\r\nAccept-Encoding: identity\r\nConnection: keep-alive\r\n\r\n".encode("ascii")
+        )
+        await writer.drain()
+        ttfb = None
+        while True:
+            status_line = await reader.readline()
+            if ttfb is None:
+                ttfb = time.perf_counter() - started
+            if not status_line:
+                raise ConnectionError("connection closed before the response")
+            status = parse_status(status_line)
+            headers = await _read_headers(reader)
+            # Interim responses (100 Continue, 103 Early Hints) have no body and precede the final one
+            if status >= 200:
+                break
+
+        if method == "HEAD" or status in BODILESS_STATUSES:
+            size = 0
+        else:
+            size = await _read_body(reader, headers)
+        total = time.perf_counter() - started
+
+        if headers.get("connection", "").lower() == "close" or reader.at_eof():
+            writer.close()
+        else:
+            self._idle.append((reader, writer))
+        return status, ttfb, total, size
+
+    def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+def load_targets(paths, include_drafts=False):
+    """(route, page id, block types) for every route of the pages.
+
+    Unpublished slugs do not render, so drafts would only measure 404s;
+    they are left out unless `include_drafts` is set, as in the sitemap.
+    """
+    targets = []
+    seen = set()
+    for page in iter_deployed_pages(paths):
+        if not include_drafts and not is_published(page):
+            continue
+        block_types = sorted({block.get("type", "unknown") for block in page.get("blocks") or []})
+        for route in page_routes(page):
+            if route not in seen:
+                seen.add(route)
+                targets.append((route, page.get("id", route), block_types))
+    return targets
+
+
+async def run_pass(pool, targets, concurrency):
+    """Request every target once; returns one sample per target, in target order."""
+    samples = [None] * len(targets)
+    queue = iter(range(len(targets)))
+
+    async def worker():
+        # Workers pull from a shared iterator, so only `concurrency` requests exist at a time
+        for index in queue:
+            route = targets[index][0]
+            try:
+                status, ttfb, total, size = await pool.request(quote(route, safe="/"))
+                samples[index] = {"route": route, "status": status, "ttfb": ttfb, "total": total, "bytes": size}
+            except (OSError, asyncio.TimeoutError, ValueError, asyncio.IncompleteReadError) as error:
+                samples[index] = {"route": route, "error": f"{type(error).__name__}: {error}"}
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+def percentile(sorted_values, rank):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, -(-rank * len(sorted_values) // 100) - 1))
+    return sorted_values[index]
+
+
+def summarize(values):
+    """Count, percentiles and histogram (in ms) of latency samples in seconds."""
+    values = sorted(value * 1000 for value in values)
+    histogram = [0] * (len(BUCKETS_MS) + 1)
+    bucket = 0
+    for value in values:
+        while bucket < len(BUCKETS_MS) and value > BUCKETS_MS[bucket]:
+            bucket += 1
+        histogram[bucket] += 1
+    return {
+        "count": len(values),
+        **{f"p{rank}": round(percentile(values, rank), 2) if values else None for rank in PERCENTILES},
+        "histogram": histogram,
+    }
+
+
+def _succeeded(sample):
+    return "error" not in sample and sample["status"] < 400
+
+
+def pass_report(samples, targets):
+    ok = [sample for sample in samples if _succeeded(sample)]
+    by_type = {}
+    for sample, (_, _, block_types) in zip(samples, targets):
+        if _succeeded(sample):
+            for block_type in block_types:
+                by_type.setdefault(block_type, []).append(sample)
+    return {
+        "requests": len(samples),
+        "failed": len(samples) - len(ok),
+        "ttfb": summarize([sample["ttfb"] for sample in ok]),
+        "total": summarize([sample["total"] for sample in ok]),
+        "blockTypes": {
+            block_type: {
+                "ttfb": summarize([sample["ttfb"] for sample in group]),
+                "total": summarize([sample["total"] for sample in group]),
+            }
+            for block_type, group in sorted(by_type.items())
+        },
+    }
+
+
+async def warm(targets, base_url, concurrency, repeat, timeout=DEFAULT_TIMEOUT):
+    """Run `repeat` passes over the targets; returns the samples of each pass and the connection counts."""
+    pool = ConnectionPool(base_url, concurrency, timeout)
+    passes = []
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            samples = await run_pass(pool, targets, concurrency)
+            passes.append({"samples": samples, "seconds": time.perf_counter() - started})
+    finally:
+        pool.close()
+    return passes, {"opened": pool.opened, "retried": pool.retried}
+
+
+def build_report(targets, passes, base_url, concurrency, connections):
+    pages = {}
+    for number, run in enumerate(passes):
+        for sample, (route, page_id, block_types) in zip(run["samples"], targets):
+            entry = pages.setdefault(route, {"page": page_id, "blockTypes": block_types, "passes": []})
+            entry["passes"].append(
+                {"error": sample["error"]} if "error" in sample else {
+                    "status": sample["status"],
+                    "ttfbMs": round(sample["ttfb"] * 1000, 2),
+                    "totalMs": round(sample["total"] * 1000, 2),
+                    "bytes": sample["bytes"],
+                }
+            )
+    last = passes[-1]["samples"]
+    slowest = sorted(
+        (sample for sample in last if "error" not in sample), key=lambda sample: sample["total"], reverse=True
+    )[:SLOWEST_PAGES]
+    return {
+        "measuredAt": datetime.now().isoformat(),
+        "baseUrl": base_url,
+        "concurrency": concurrency,
+        "connections": connections["opened"],
+        "retries": connections["retried"],
+        "passes": [
+            {"pass": number + 1, "seconds": round(run["seconds"], 3), **pass_report(run["samples"], targets)}
+            for number, run in enumerate(passes)
+        ],
+        "slowest": [
+            {"route": sample["route"], "totalMs": round(sample["total"] * 1000, 2), "blockTypes": pages[sample["route"]]["blockTypes"]}
+            for sample in slowest
+        ],
+        "pages": pages,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm generated routes on a running server and measure their latency.")
+    parser.add_argument("paths", nargs="+", help="page JSON/NDJSON files or directories, or export collection directories")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help=f"server origin (default: {DEFAULT_BASE_URL})")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="requests (and connections) in flight")
+    parser.add_argument("--repeat", type=int, default=2, help="passes over every route; the first one is the cold pass")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per request")
+    parser.add_argument("--include-drafts", action="store_true", help="also request unpublished pages (they render only in preview setups)")
+    parser.add_argument("--out", default=REPORT_FILE, help="where to write the JSON report")
+    args = parser.parse_args(argv)
+
+    targets = load_targets(args.paths, include_drafts=args.include_drafts)
+    if not targets:
+        print("❌ No routes found" if args.include_drafts else "❌ No published routes found (use --include-drafts to warm drafts)")
+        return 1
+    print(f"🔥 Warming {len(targets)} routes on {args.base_url} ({args.concurrency} concurrent, {args.repeat} passes)")
+    passes, connections = asyncio.run(warm(targets, args.base_url, args.concurrency, args.repeat, args.timeout))
+    report = build_report(targets, passes, args.base_url, args.concurrency, connections)
+
+    for run in report["passes"]:
+        label = "cold" if run["pass"] == 1 else "warm"
+        ttfb, total = run["ttfb"], run["total"]
+        print(
+            f"  pass {run['pass']} ({label}): ttfb p50/p95/p99 {ttfb['p50']}/{ttfb['p95']}/{ttfb['p99']} ms, "
+            f"total {total['p50']}/{total['p95']}/{total['p99']} ms, {run['failed']} failed ({run['seconds']:.2f}s)"
+        )
+    if len(report["passes"]) > 1 and report["passes"][0]["total"]["p50"] and report["passes"][-1]["total"]["p50"]:
+        speedup = report["passes"][0]["total"]["p50"] / report["passes"][-1]["total"]["p50"]
+        print(f"⚡ Warm median is {speedup:.1f}x faster than cold")
+    for block_type, stats in report["passes"][-1]["blockTypes"].items():
+        print(f"  {block_type:<16} total p50 {stats['total']['p50']} ms, p95 {stats['total']['p95']} ms ({stats['total']['count']} pages)")
+    for entry in report["slowest"][:3]:
+        print(f"🐢 {entry['route']}: {entry['totalMs']} ms ({', '.join(entry['blockTypes'])})")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📁 Report saved to: {args.out}")
+    return 1 if report["passes"][-1]["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
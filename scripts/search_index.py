@@ -0,0 +1,277 @@
+"""
+Precomputed search index for generated pages.
+
+Page titles and descriptions and the text fields of every block (including
+the items of lists such as departments, gallery images and testimonials) are
+analyzed per language and written as one index shard per language. A page
+goes into the shard of its `language`, and into the other shard too when it
+has text in that language and no sibling page of that language shares its
+slug:
+
+    <out>/search-ar.json     {"version", "language", "analyzer", "docs", "terms"}
+    <out>/search-en.json
+    <out>/search-manifest.json
+
+`docs` lists [id, slug, title] per indexed page and `terms` maps each
+analyzed term to the ascending doc numbers containing it, delta-encoded
+([3, 9, 10] is stored as [3, 6, 1]). The frontend fetches only the shard of
+the current language and applies the same analysis to the query.
+
+Arabic text is folded with normalize_arabic (diacritics, tatweel, alef/yaa
+forms) and lightly stemmed by stripping one common prefix (و, ال, بال, …) and
+one common suffix (ات, ون, ها, نا, ة, …); English text is lowercased and plural
+`s` is dropped. Stop words are not indexed.
+
+Usage:
+    python scripts/search_index.py generated-pages
+    python scripts/search_index.py generated-pages --out public/search --compress gz
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+from page_importer import iter_page_files
+from page_writers import CODECS, check_codecs, compress_variants, write_file
+from translation_engine import has_arabic, normalize_arabic
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEARCH_DIR = os.path.join(REPO_ROOT, "public", "search")
+MANIFEST_FILE = "search-manifest.json"
+INDEX_VERSION = 1
+LANGUAGES = ("ar", "en")
+PAGE_FIELDS = {"ar": ("titleAr", "descriptionAr"), "en": ("titleEn", "descriptionEn", "title", "description")}
+# Content keys holding links, media, contact details or enums rather than prose
+NON_TEXT_KEYS = {"id", "type", "icon", "image", "images", "url", "link", "ctaLink", "email", "phone", "category", "variant"}
+MIN_TOKEN_LENGTH = 2
+# Arabic stems shorter than this are kept unstemmed; stripping further merges unrelated words
+MIN_STEM_LENGTH = 3
+TOKEN_RE = re.compile(r"\w+")
+# Longest first, so "وال" is stripped before "و"
+ARABIC_PREFIXES = ("وال", "بال", "كال", "فال", "لل", "ال", "و")
+ARABIC_SUFFIXES = ("ها", "هم", "نا", "كم", "ان", "ات", "ون", "ين", "يه", "ية", "ه", "ة", "ي")
+STOP_WORDS = {
+    "ar": {normalize_arabic(word) for word in (
+        "في", "من", "على", "إلى", "عن", "مع", "أن", "إن", "ما", "لا", "هذا", "هذه", "ذلك", "التي", "الذي",
+        "كل", "أو", "ثم", "قد", "هو", "هي", "نحن", "لكم", "لكل", "عند",
+    )},
+    "en": {
+        "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on", "or",
+        "our", "the", "to", "we", "with", "you", "your",
+    },
+}
+
+_analyzed = {}
+
+
+def stem_arabic(token):
+    for prefix in ARABIC_PREFIXES:
+        if token.startswith(prefix) and len(token) - len(prefix) >= MIN_STEM_LENGTH:
+            token = token[len(prefix):]
+            break
+    for suffix in ARABIC_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+            return token[:-len(suffix)]
+    return token
+
+
+def stem_english(token):
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith("s") and not token.endswith("ss") and len(token) > 3:
+        return token[:-1]
+    return token
+
+
+def analyze(text, language):
+    """Index terms of `text`; memoized, since template copy repeats on every page."""
+    key = (text, language)
+    terms = _analyzed.get(key)
+    if terms is None:
+        stop_words = STOP_WORDS[language]
+        terms = []
+        for token in TOKEN_RE.findall(normalize_arabic(text).lower()):
+            if len(token) < MIN_TOKEN_LENGTH or token in stop_words:
+                continue
+            terms.append(stem_arabic(token) if has_arabic(token) else stem_english(token))
+        terms = _analyzed[key] = tuple(terms)
+    return terms
+
+
+def _field_language(key):
+    # The page builder keeps Arabic copy in *Ar fields and English in *En or unsuffixed ones
+    return "ar" if key.endswith("Ar") else "en"
+
+
+def content_texts(value, language):
+    """Yield the prose strings of block content for one language."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in NON_TEXT_KEYS:
+                continue
+            if isinstance(item, str):
+                if _field_language(key) == language and not item.startswith(("/", "#", "http")):
+                    yield item
+            else:
+                yield from content_texts(item, language)
+    elif isinstance(value, list):
+        for item in value:
+            yield from content_texts(item, language)
+
+
+def page_terms(page, language):
+    terms = set()
+    for field in PAGE_FIELDS[language]:
+        terms.update(analyze(page.get(field) or "", language))
+    for block in page.get("blocks") or []:
+        for text in content_texts(block.get("content") or {}, language):
+            terms.update(analyze(text, language))
+    return terms
+
+
+def page_title(page, language):
+    if language == "ar":
+        return page.get("titleAr") or page.get("title") or page.get("slug", "")
+    return page.get("titleEn") or page.get("title") or page.get("slug", "")
+
+
+def delta_encode(numbers):
+    previous = 0
+    encoded = []
+    for number in numbers:
+        encoded.append(number - previous)
+        previous = number
+    return encoded
+
+
+def delta_decode(deltas):
+    numbers = []
+    total = 0
+    for delta in deltas:
+        total += delta
+        numbers.append(total)
+    return numbers
+
+
+def build_index(pages):
+    """Build {language: shard} from an iterable of pages, streaming over them once.
+
+    A page goes into the shard of its own `language`. Its text in the other
+    language only stands in for a missing sibling: it is indexed there when
+    no page of that language exists for the same slug, so a spec that builds
+    both an ar and an en page gets one hit per language, not two.
+    """
+    docs = {language: [] for language in LANGUAGES}
+    postings = {language: {} for language in LANGUAGES}
+    own_slugs = {language: set() for language in LANGUAGES}
+    # (language, slug) -> (doc, terms) of pages standing in for a sibling not seen yet
+    stand_ins = {}
+
+    def add(language, doc, terms):
+        number = len(docs[language])
+        docs[language].append(doc)
+        for term in terms:
+            postings[language].setdefault(term, []).append(number)
+
+    for page in pages:
+        if not page.get("blocks") and not page.get("titleAr") and not page.get("titleEn"):
+            continue
+        slug = page.get("slug") or page.get("id", "")
+        own = page.get("language")
+        for language in LANGUAGES:
+            terms = page_terms(page, language)
+            if not terms:
+                continue
+            doc = [page.get("id", ""), page.get("slug", ""), page_title(page, language)]
+            if own not in LANGUAGES or language == own:
+                add(language, doc, terms)
+                own_slugs[language].add(slug)
+                stand_ins.pop((language, slug), None)
+            elif slug not in own_slugs[language]:
+                stand_ins.setdefault((language, slug), (doc, terms))
+    # Appended after every own-language doc, so posting lists stay ascending
+    for (language, _), (doc, terms) in stand_ins.items():
+        add(language, doc, terms)
+    return {
+        language: {
+            "version": INDEX_VERSION,
+            "language": language,
+            "analyzer": {
+                "minTokenLength": MIN_TOKEN_LENGTH,
+                "minStemLength": MIN_STEM_LENGTH,
+                "prefixes": list(ARABIC_PREFIXES),
+                "suffixes": list(ARABIC_SUFFIXES),
+                "stopWords": sorted(STOP_WORDS[language]),
+            },
+            "docs": docs[language],
+            # Doc numbers are appended in order, so every posting list is already ascending
+            "terms": {term: delta_encode(numbers) for term, numbers in sorted(postings[language].items())},
+        }
+        for language in LANGUAGES
+    }
+
+
+def search(shard, query):
+    """Doc entries matching every query term, as the frontend would answer from a shard."""
+    matches = None
+    for term in analyze(query, shard["language"]):
+        numbers = set(delta_decode(shard["terms"].get(term, [])))
+        matches = numbers if matches is None else matches & numbers
+    return [shard["docs"][number] for number in sorted(matches or ())]
+
+
+def write_index(shards, out_dir, codecs=()):
+    """Write one shard per language plus a manifest; returns the manifest."""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {"version": INDEX_VERSION, "shards": {}}
+    for language, shard in shards.items():
+        name = f"search-{language}.json"
+        data = json.dumps(shard, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        variants = compress_variants(data, codecs)
+        write_file(os.path.join(out_dir, name), data, variants)
+        manifest["shards"][language] = {
+            "file": name,
+            "docs": len(shard["docs"]),
+            "terms": len(shard["terms"]),
+            "bytes": len(data),
+            **{f"{codec}Bytes": len(variant) for codec, variant in zip(codecs, variants.values())},
+        }
+    with open(os.path.join(out_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build per-language search index shards for generated pages.")
+    parser.add_argument("paths", nargs="+", help="page JSON/NDJSON files or directories")
+    parser.add_argument("--out", default=SEARCH_DIR, help="output directory for the shards")
+    parser.add_argument("--compress", action="append", choices=CODECS, default=[], help="also write .gz/.br variants (repeatable)")
+    parser.add_argument("--query", help="run a query against the built shards and print the matches")
+    args = parser.parse_args(argv)
+    try:
+        check_codecs(args.compress)
+    except ValueError as error:
+        parser.error(str(error))
+
+    started = time.perf_counter()
+    shards = build_index(page for page, _ in iter_page_files(args.paths))
+    manifest = write_index(shards, args.out, args.compress)
+    seconds = time.perf_counter() - started
+
+    for language, info in manifest["shards"].items():
+        compressed = "".join(f", {info[f'{codec}Bytes']:,} bytes {codec}" for codec in args.compress)
+        print(f"  {language}: {info['docs']} pages, {info['terms']} terms, {info['bytes']:,} bytes{compressed}")
+    print(f"✅ Indexed {sum(info['docs'] for info in manifest['shards'].values())} page entries in {seconds:.2f}s")
+    print(f"📁 Index saved to: {args.out}")
+    if args.query:
+        for language, shard in shards.items():
+            matches = search(shard, args.query)
+            print(f"🔎 {language}: {len(matches)} matches" + "".join(f"\n   {doc[1]}  {doc[2]}" for doc in matches[:10]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Sitemaps and a route-prefetch manifest for dynamic pages.
+
+Streams over generated pages or a firestore_exporter.py export and writes
+
+    <out>/sitemap.xml                 sitemap index pointing at every shard
+    <out>/sitemap-1.xml.gz            up to 50,000 URLs each, `lastmod` from updatedAt
+    <out>/prefetch-manifest.json      {route: {"images": [...], "routes": [...]}}
+
+Routes follow the app's routing: home pages live at /<lang>, pages whose
+slug starts with a non-localized section (departments/, jobs/, pages/) at
+/<slug>, every other page at /<lang>/<slug>. Bilingual pages without a
+`language` get a URL per language. Only published pages are listed unless
+--include-drafts is given.
+
+The prefetch manifest lists, per route, the images of the first blocks
+(what renders above the fold) and the internal routes linked from block
+content (`ctaLink`, `link`), so the app can prefetch without discovering
+them at runtime.
+
+Usage:
+    python scripts/sitemap_generator.py generated-pages --base-url https://example.org
+    python scripts/sitemap_generator.py backups/2024-01-31/web_dynamic_pages --out public --compress gz
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote, urlsplit
+from xml.sax.saxutils import escape
+
+from page_patch import iter_deployed_pages
+from page_writers import CODECS, GZIP_LEVEL, check_codecs, compress_variants, write_file
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PUBLIC_DIR = os.path.join(REPO_ROOT, "public")
+SITEMAP_INDEX_FILE = "sitemap.xml"
+PREFETCH_FILE = "prefetch-manifest.json"
+# Sitemap protocol limits per file
+MAX_URLS = 50_000
+MAX_BYTES = 50 * 1024 * 1024
+LANGUAGES = ("ar", "en")
+HOME_SLUGS = {"", "home"}
+# Sections the middleware serves without a language prefix
+UNLOCALIZED_SECTIONS = ("departments", "jobs", "pages")
+CRITICAL_BLOCKS = 2
+LINK_KEYS = ("ctaLink", "link")
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_END = "</urlset>\n"
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def is_published(page):
+    return page.get("isPublished") is True or page.get("status") == "published"
+
+
+def page_routes(page):
+    """Routes serving a page, one per language it is available in."""
+    slug = (page.get("slug") or "").strip("/")
+    if slug.split("/")[0] in UNLOCALIZED_SECTIONS:
+        return [f"/{slug}"]
+    language = page.get("language")
+    languages = (language,) if language in LANGUAGES else LANGUAGES
+    if page.get("isHome") or slug in HOME_SLUGS:
+        return [f"/{language}" for language in languages]
+    return [f"/{language}/{slug}" for language in languages]
+
+
+def lastmod(value):
+    """W3C datetime for a sitemap from an ISO string or exported Firestore timestamp."""
+    if isinstance(value, dict):
+        seconds = value.get("seconds", value.get("_seconds"))
+        return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ") if seconds is not None else None
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    # Without a timezone only the date is unambiguous
+    return parsed.isoformat(timespec="seconds") if parsed.tzinfo else parsed.date().isoformat()
+
+
+def _walk(value, key=None):
+    """Yield (key, string) for every string in a block's content."""
+    if isinstance(value, dict):
+        for child_key, item in value.items():
+            yield from _walk(item, child_key)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _walk(item, key)
+    elif isinstance(value, str) and value:
+        yield key, value
+
+
+def internal_route(link):
+    """Path of an internal link, or None for anchors, external URLs and mailto/tel links."""
+    parts = urlsplit(link)
+    if parts.scheme or parts.netloc or not parts.path.startswith("/"):
+        return None
+    return parts.path.rstrip("/") or "/"
+
+
+def prefetch_entry(page):
+    """Critical images and linked routes of one page, in block order."""
+    images = {}
+    routes = {}
+    blocks = sorted(page.get("blocks") or [], key=lambda block: block.get("order", 0))
+    for position, block in enumerate(blocks):
+        for key, value in _walk(block.get("content") or {}):
+            if key in LINK_KEYS:
+                route = internal_route(value)
+                if route:
+                    routes[route] = None
+            elif key in ("image", "url") and position < CRITICAL_BLOCKS and value.startswith(("/", "http")):
+                images[value] = None
+    return {"images": list(images), "routes": list(routes)}
+
+
+class SitemapWriter:
+    """Streams <url> entries into gzipped sitemap shards, starting a new one at the protocol limits."""
+
+    def __init__(self, out_dir, base_url):
+        self.out_dir = out_dir
+        self.base_url = base_url.rstrip("/")
+        self.shards = []
+        self._file = None
+
+    def _open(self):
+        name = f"sitemap-{len(self.shards) + 1}.xml.gz"
+        path = os.path.join(self.out_dir, name)
+        self._file = gzip.GzipFile(path, "wb", compresslevel=GZIP_LEVEL, mtime=0)
+        self.shards.append({"file": name, "urls": 0, "bytes": 0, "lastmod": None})
+        self._write(f'{XML_HEADER}<urlset xmlns="{SITEMAP_NS}">\n')
+
+    def _write(self, text):
+        data = text.encode("utf-8")
+        self._file.write(data)
+        self.shards[-1]["bytes"] += len(data)
+
+    def _close(self):
+        if self._file is not None:
+            self._write(URLSET_END)
+            self._file.close()
+            self._file = None
+
+    def add(self, route, modified=None):
+        location = escape(self.base_url + quote(route, safe="/"))
+        entry = f"  <url><loc>{location}</loc>" + (f"<lastmod>{modified}</lastmod>" if modified else "") + "</url>\n"
+        shard = self.shards[-1] if self._file is not None else None
+        if shard is None or shard["urls"] == MAX_URLS or shard["bytes"] + len(entry) + len(URLSET_END) > MAX_BYTES:
+            self._close()
+            self._open()
+            shard = self.shards[-1]
+        self._write(entry)
+        shard["urls"] += 1
+        if modified and (shard["lastmod"] is None or modified > shard["lastmod"]):
+            shard["lastmod"] = modified
+
+    def close(self):
+        """Finish the last shard and write the sitemap index."""
+        self._close()
+        lines = [f'{XML_HEADER}<sitemapindex xmlns="{SITEMAP_NS}">\n']
+        for shard in self.shards:
+            modified = f"<lastmod>{shard['lastmod']}</lastmod>" if shard["lastmod"] else ""
+            lines.append(f"  <sitemap><loc>{escape(self.base_url)}/{shard['file']}</loc>{modified}</sitemap>\n")
+        lines.append("</sitemapindex>\n")
+        with open(os.path.join(self.out_dir, SITEMAP_INDEX_FILE), "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        # Shards beyond this run's count belong to an earlier, larger corpus
+        current = {shard["file"] for shard in self.shards}
+        for name in os.listdir(self.out_dir):
+            if name.startswith("sitemap-") and name.endswith(".xml.gz") and name not in current:
+                os.remove(os.path.join(self.out_dir, name))
+
+
+def generate_sitemaps(pages, out_dir, base_url, include_drafts=False, codecs=()):
+    """Write sitemap shards, the sitemap index and the prefetch manifest; returns stats."""
+    os.makedirs(out_dir, exist_ok=True)
+    started = time.perf_counter()
+    stats = {"pages": 0, "skipped": 0, "duplicates": 0, "urls": 0}
+    seen = set()
+    sitemap = SitemapWriter(out_dir, base_url)
+    manifest_path = os.path.join(out_dir, PREFETCH_FILE)
+    tmp_path = f"{manifest_path}.tmp"
+    # The manifest object is written entry by entry so it never has to be held in memory
+    with open(tmp_path, "w", encoding="utf-8") as manifest:
+        manifest.write("{")
+        for page in pages:
+            stats["pages"] += 1
+            if not include_drafts and not is_published(page):
+                stats["skipped"] += 1
+                continue
+            modified = lastmod(page.get("updatedAt"))
+            entry = None
+            for route in page_routes(page):
+                if route in seen:
+                    stats["duplicates"] += 1
+                    continue
+                seen.add(route)
+                sitemap.add(route, modified)
+                entry = entry or json.dumps(prefetch_entry(page), ensure_ascii=False, separators=(",", ":"))
+                manifest.write(("," if stats["urls"] else "") + f"\n{json.dumps(route, ensure_ascii=False)}:{entry}")
+                stats["urls"] += 1
+        manifest.write("\n}\n")
+    sitemap.close()
+    os.replace(tmp_path, manifest_path)
+    if codecs:
+        with open(manifest_path, "rb") as f:
+            data = f.read()
+        write_file(manifest_path, data, compress_variants(data, codecs))
+    stats["shards"] = sitemap.shards
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write sitemaps and a prefetch manifest for dynamic pages.")
+    parser.add_argument("paths", nargs="+", help="page JSON/NDJSON files or directories, or export collection directories")
+    parser.add_argument("--base-url", default=os.environ.get("NEXT_PUBLIC_SITE_URL"), help="site origin (default: $NEXT_PUBLIC_SITE_URL)")
+    parser.add_argument("--out", default=PUBLIC_DIR, help="output directory (default: public/)")
+    parser.add_argument("--include-drafts", action="store_true", help="also list unpublished pages")
+    parser.add_argument("--compress", action="append", choices=CODECS, default=[], help="also write .gz/.br variants of the prefetch manifest")
+    args = parser.parse_args(argv)
+    if not args.base_url:
+        parser.error("--base-url is required when NEXT_PUBLIC_SITE_URL is not set")
+    try:
+        check_codecs(args.compress)
+    except ValueError as error:
+        parser.error(str(error))
+
+    stats = generate_sitemaps(iter_deployed_pages(args.paths), args.out, args.base_url, args.include_drafts, args.compress)
+    print(f"✅ {stats['urls']} URLs from {stats['pages']} pages in {len(stats['shards'])} sitemap files ({stats['seconds']:.2f}s)")
+    if stats["skipped"]:
+        print(f"⏭️  {stats['skipped']} unpublished pages left out (use --include-drafts to list them)")
+    if stats["duplicates"]:
+        print(f"⚠️  {stats['duplicates']} routes served by more than one page; the first one was kept")
+    print(f"📁 Sitemaps and {PREFETCH_FILE} saved to: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Style preset interning for generated pages.
+
+Every generated block carries a full `styles` dict and most of those dicts are
+nearly identical. Interning derives a small table of named presets from the
+styles actually in use, then stores each block as `stylePreset` plus a sparse
+`styles` diff holding only the keys that differ from the preset (`None` marks
+a key the block does not have). `expand_block` rebuilds the original styles
+exactly, so interned pages round-trip losslessly.
+
+Usage:
+    python scripts/style_presets.py intern generated-pages --out interned-pages
+    python scripts/style_presets.py expand interned-pages --out expanded-pages
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import Counter
+
+from page_writers import PRESETS_FILE, list_page_files
+
+MAX_PRESETS = 8
+
+
+def canonical_json(value):
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def preset_name(styles):
+    """Content-hashed preset name, stable for the same styles across runs."""
+    return "sp-" + hashlib.sha1(canonical_json(styles).encode("utf-8")).hexdigest()[:10]
+
+
+def style_diff(styles, preset):
+    diff = {key: value for key, value in styles.items() if key not in preset or preset[key] != value}
+    diff.update({key: None for key in preset if key not in styles})
+    return diff
+
+
+def _mode_styles(counts):
+    """Per-key most common value, weighted by how many blocks use each style."""
+    values = {}
+    for styles_json, count in counts.items():
+        for key, value in json.loads(styles_json).items():
+            values.setdefault(key, Counter())[canonical_json(value)] += count
+    return {key: json.loads(counter.most_common(1)[0][0]) for key, counter in sorted(values.items())}
+
+
+def derive_presets(style_counts, max_presets=MAX_PRESETS):
+    """Pick up to `max_presets` presets that minimize the total size of all diffs.
+
+    `style_counts` maps canonical styles JSON to the number of blocks using it.
+    Starts from the per-key mode and greedily adds the observed style that
+    saves the most override keys, stopping when another preset no longer pays
+    for itself.
+    """
+    if not style_counts:
+        return {}
+    distinct = [(json.loads(styles_json), count) for styles_json, count in style_counts.items()]
+    chosen = [_mode_styles(style_counts)]
+    best_cost = [len(style_diff(styles, chosen[0])) for styles, _ in distinct]
+
+    while len(chosen) < max_presets:
+        best_gain = 0
+        best_candidate = None
+        for candidate, _ in distinct:
+            gain = sum(
+                count * max(0, cost - len(style_diff(styles, candidate)))
+                for (styles, count), cost in zip(distinct, best_cost)
+            )
+            if gain > best_gain:
+                best_gain, best_candidate = gain, candidate
+        # A preset costs roughly its own size once, in the preset table
+        if best_candidate is None or best_gain <= len(best_candidate):
+            break
+        chosen.append(best_candidate)
+        best_cost = [
+            min(cost, len(style_diff(styles, best_candidate)))
+            for (styles, _), cost in zip(distinct, best_cost)
+        ]
+    return {preset_name(preset): preset for preset in chosen}
+
+
+def count_styles(pages):
+    counts = Counter()
+    for page in pages:
+        for block in page.get("blocks", []):
+            if "styles" in block and "stylePreset" not in block:
+                counts[canonical_json(block["styles"])] += 1
+    return counts
+
+
+def intern_block(block, presets):
+    if "styles" not in block or "stylePreset" in block or not presets:
+        return block
+    styles = block["styles"]
+    name, diff = min(
+        ((name, style_diff(styles, preset)) for name, preset in presets.items()),
+        key=lambda item: len(item[1]),
+    )
+    interned = {key: value for key, value in block.items() if key != "styles"}
+    interned["stylePreset"] = name
+    if diff:
+        interned["styles"] = diff
+    return interned
+
+
+def intern_page(page, presets):
+    page = dict(page)
+    page["blocks"] = [intern_block(block, presets) for block in page.get("blocks", [])]
+    return page
+
+
+def expand_block(block, presets):
+    name = block.get("stylePreset")
+    if name is None:
+        return block
+    try:
+        styles = dict(presets[name])
+    except KeyError:
+        raise ValueError(f"Block {block.get('id')!r} references unknown style preset {name!r}") from None
+    for key, value in block.get("styles", {}).items():
+        if value is None:
+            styles.pop(key, None)
+        else:
+            styles[key] = value
+    expanded = {key: value for key, value in block.items() if key not in ("stylePreset", "styles")}
+    expanded["styles"] = styles
+    return expanded
+
+
+def expand_page(page, presets):
+    page = dict(page)
+    page["blocks"] = [expand_block(block, presets) for block in page.get("blocks", [])]
+    return page
+
+
+def load_presets(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def find_presets(paths):
+    """The style presets stored next to the given pages, if any."""
+    for path in paths:
+        candidate = os.path.join(path if os.path.isdir(path) else os.path.dirname(path), PRESETS_FILE)
+        if os.path.exists(candidate):
+            return load_presets(candidate)
+    return None
+
+
+def write_presets(presets, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(presets, f, ensure_ascii=False, indent=2)
+
+
+def _read_page(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _rewrite(files, out_dir, transform):
+    os.makedirs(out_dir, exist_ok=True)
+    before = after = 0
+    for path in files:
+        before += os.path.getsize(path)
+        target = os.path.join(out_dir, os.path.basename(path))
+        with open(target, "w", encoding="utf-8") as f:
+            json.dump(transform(_read_page(path)), f, ensure_ascii=False, indent=2)
+        after += os.path.getsize(target)
+    return before, after
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Intern or expand block style presets in page JSON.")
+    parser.add_argument("command", choices=["intern", "expand"])
+    parser.add_argument("pages", help="directory of page JSON files")
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--presets", help=f"preset table (default: <dir>/{PRESETS_FILE})")
+    parser.add_argument("--max-presets", type=int, default=MAX_PRESETS)
+    args = parser.parse_args(argv)
+
+    files = list_page_files(args.pages, (".json",))
+    if args.command == "intern":
+        # Two streaming passes: count styles, then rewrite with the derived table
+        presets = derive_presets(count_styles(map(_read_page, files)), args.max_presets)
+        before, after = _rewrite(files, args.out, lambda page: intern_page(page, presets))
+        write_presets(presets, args.presets or os.path.join(args.out, PRESETS_FILE))
+        print(f"✅ Interned {len(files)} pages with {len(presets)} style presets")
+        print(f"📉 {before:,} → {after:,} bytes ({after / before:.0%})" if before else "📉 No pages found")
+    else:
+        presets = load_presets(args.presets or os.path.join(args.pages, PRESETS_FILE))
+        _rewrite(files, args.out, lambda page: expand_page(page, presets))
+        print(f"✅ Expanded {len(files)} pages")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,24 @@
 """
 Script to add English versions of all Arabic block templates.
 This reads the existing templates and creates English duplicates.
+
+Usage:
+    python scripts/template-translations.py pages build/pages/*.json --out build/pages-en
+    python scripts/template-translations.py ts --out lib/types/block-templates.en.ts
 """
 
+import argparse
+import json
+import os
+import sys
+import time
+
+from translation_catalog import CatalogError
+from translation_engine import Translator
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BLOCK_TEMPLATES_FILE = os.path.join(REPO_ROOT, "lib", "types", "block-templates.ts")
+
 # English translations mapping
 translations = {
     # Hero Slider
@@ -26,7 +42,6 @@ translations = {
     "منهج صارم مصمم لتحدي وإلهام الطلاب": "Rigorous curriculum designed to challenge and inspire students",
     "تطوير الشخصية": "Character Development",
     "بناء القيم والأخلاق ومهارات القيادة": "Building values, ethics, and leadership skills",
-    "مرافق حديثة": "Modern Facilities",
     "فصول دراسية ومختبرات ومرافق رياضية حديثة": "State-of-the-art classrooms, labs, and sports facilities",
     "هيئة تدريس متخصصة": "Dedicated Faculty",
     "معلمون مؤهلون وذوو خبرة عالية": "Highly qualified and experienced educators",
@@ -58,7 +73,6 @@ translations = {
     "اكتشف ما يجعل مدرستنا مميزة": "Discover what makes our school special",
     "منهج معتمد": "Accredited Curriculum",
     "برامج تعليمية معترف بها دولياً": "Internationally recognized educational programs",
-    "معلمون خبراء": "Expert Teachers",
     "مربون مؤهلون وذوو خبرة عالية": "Highly qualified and experienced educators",
     "حائزة على جوائز": "Award-Winning",
     "معترف بها للتميز في التعليم": "Recognized for excellence in education",
@@ -90,7 +104,6 @@ translations = {
     "تصفح الوظائف": "Browse Jobs",
     
     # Contact
-    "تواصل معنا": "Contact Us",
     "عمان - طريق المطار - ضاحية الأمير علي": "Amman - Airport Road - Prince Ali District",
     "+962 6 4122002": "+962 6 4122002",
     "info@namothajia.com": "info@namothajia.com",
@@ -131,5 +144,73 @@ translations = {
     "الصيدلية": "Pharmacy",
 }
 
-print("Translation mapping created with", len(translations), "entries")
-print("Note: This is a reference. Manual implementation needed in TypeScript file.")
+
+
+def translate_page_files(translator, files, out_dir, overwrite=False):
+    """Translate page JSON (one page or a list) and NDJSON files into `out_dir`."""
+    os.makedirs(out_dir, exist_ok=True)
+    pages = 0
+    for path in files:
+        target = os.path.join(out_dir, os.path.basename(path))
+        with open(path, encoding="utf-8") as src, open(target, "w", encoding="utf-8") as dst:
+            if path.endswith(".ndjson"):
+                for line in src:
+                    if line.strip():
+                        page = translator.translate_page(json.loads(line), overwrite)
+                        dst.write(json.dumps(page, ensure_ascii=False) + "\n")
+                        pages += 1
+            else:
+                data = translator.translate_page(json.load(src), overwrite)
+                json.dump(data, dst, ensure_ascii=False, indent=2)
+                pages += len(data) if isinstance(data, list) else 1
+    return pages
+
+
+def translate_ts_file(translator, source_file, out_file):
+    with open(source_file, encoding="utf-8") as f:
+        source = f.read()
+    with open(out_file, "w", encoding="utf-8") as f:
+        f.write(translator.translate_ts_source(source))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply the Arabic -> English translation table.")
+    commands = parser.add_subparsers(dest="command")
+
+    pages = commands.add_parser("pages", help="fill *En fields from *Ar fields of page JSON/NDJSON files")
+    pages.add_argument("files", nargs="+")
+    pages.add_argument("--out", required=True, help="output directory")
+    pages.add_argument("--overwrite", action="store_true", help="replace existing English values")
+
+    ts = commands.add_parser("ts", help="translate the Arabic string literals of a TS source file")
+    ts.add_argument("--source", default=BLOCK_TEMPLATES_FILE)
+    ts.add_argument("--out", required=True, help="output TS file")
+
+    args = parser.parse_args(argv)
+    print("Translation mapping created with", len(translations), "entries")
+    if args.command is None:
+        parser.print_usage()
+        return 0
+
+    started = time.perf_counter()
+    try:
+        translator = Translator.load()
+    except CatalogError as error:
+        print("❌ Conflicting translations:", file=sys.stderr)
+        print(error, file=sys.stderr)
+        return 1
+    if args.command == "pages":
+        count = translate_page_files(translator, args.files, args.out, args.overwrite)
+        print(f"✅ Translated {count} pages into {args.out}")
+    else:
+        translate_ts_file(translator, args.source, args.out)
+        print(f"✅ Translated {args.source} into {args.out}")
+    if translator.untranslated:
+        print(f"⚠️  {len(translator.untranslated)} strings are not fully covered by the table")
+    info = translator.cache_info()
+    print(f"⚡ {info['cachedStrings']} unique strings in {time.perf_counter() - started:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
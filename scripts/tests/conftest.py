@@ -0,0 +1,38 @@
+import json
+import os
+import sys
+
+import pytest
+
+# The scripts are flat modules run as `python scripts/<name>.py`, so import them the same way
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRIPTS_DIR)
+
+
+@pytest.fixture
+def write_json(tmp_path):
+    """Write a JSON document under tmp_path and return its path."""
+
+    def write(name, document):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(document, ensure_ascii=False), encoding="utf-8")
+        return str(path)
+
+    return write
+
+
+@pytest.fixture
+def spec(tmp_path):
+    """A small two-language department spec, written to disk."""
+    document = {
+        "languages": ["ar", "en"],
+        "recipes": {"department": ["hero", "about", "contact"]},
+        "pages": [
+            {"slug": f"dept-{i}", "recipe": "department", "titleAr": f"قسم {i}", "titleEn": f"Department {i}"}
+            for i in range(3)
+        ],
+    }
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(document, ensure_ascii=False), encoding="utf-8")
+    return str(path)
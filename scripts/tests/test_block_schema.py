@@ -0,0 +1,92 @@
+import copy
+import json
+import os
+
+import pytest
+
+import block_schema
+from page_writers import PRESETS_FILE
+from style_presets import main as presets_main
+
+STYLES = {"backgroundColor": "#ffffff", "padding": "4rem 0", "margin": "0"}
+PAGE = {
+    "id": "about-us",
+    "blocks": [
+        {
+            "id": "about-0",
+            "type": "about",
+            "order": 0,
+            "content": {
+                "type": "about",
+                "titleAr": "من نحن",
+                "titleEn": "About us",
+                "stats": [{"number": "25", "labelAr": "عاماً", "labelEn": "years"}],
+            },
+            "styles": STYLES,
+        },
+        {
+            "id": "contact-1",
+            "type": "contact-section",
+            "order": 1,
+            "content": {"type": "contact-section", "phone": "+20 100", "email": "info@example.com"},
+            "styles": {**STYLES, "padding": "2rem 0"},
+            "blockStyles": {"textAlign": "center"},
+        },
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def schema_cache(tmp_path, monkeypatch):
+    # Keep the parsed schema out of the repo's build directory
+    load_schema = block_schema.load_schema
+    monkeypatch.setattr(block_schema, "load_schema", lambda path: load_schema(path, str(tmp_path / "schema")))
+    monkeypatch.setattr(block_schema, "_compiled", {})
+
+
+def _problems(paths):
+    units = list(block_schema.validate_paths(paths, workers=1))
+    return sum(count for count, _ in units), [problem for _, problems in units for problem in problems]
+
+
+def test_a_page_matching_the_block_types_passes(write_json, capsys):
+    path = write_json("pages/about-us.json", PAGE)
+    assert _problems([path]) == (1, [])
+    assert block_schema.main([os.path.dirname(path), "--workers", "1"]) == 0
+    assert "1 pages match" in capsys.readouterr().out
+
+
+def test_unknown_block_types_and_fields_are_reported(tmp_path, capsys):
+    page = copy.deepcopy(PAGE)
+    page["blocks"][0]["type"] = "hero"
+    page["blocks"][0]["content"]["titel"] = "typo"
+    page["blocks"][1]["order"] = "1"
+    page["blocks"][1]["blockStyles"]["textAlign"] = "middle"
+    page["blocks"][1]["id"] = "about-0"
+    path = tmp_path / "pages.ndjson"
+    path.write_text(json.dumps(PAGE, ensure_ascii=False) + "\n" + json.dumps(page, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    count, problems = _problems([str(path)])
+    assert count == 2 and {location for location, _, _ in problems} == {"pages.ndjson:2"}
+    messages = {problem_path: message for _, problem_path, message in problems}
+    assert messages["$.blocks[0].type"].startswith('expected one of "about", ')
+    assert messages["$.blocks[0].content.titel"] == "unknown field"
+    assert messages["$.blocks[1].order"] == "expected number, got string"
+    assert messages["$.blocks[1].blockStyles.textAlign"] == 'expected one of "center", "left", "right", got "middle"'
+    assert messages["$.blocks[1].id"] == "duplicate block id 'about-0'"
+
+    report = tmp_path / "report.json"
+    assert block_schema.main([str(path), "--workers", "1", "--report", str(report)]) == 1
+    assert len(json.loads(report.read_text(encoding="utf-8"))) == len(problems)
+
+
+def test_interned_pages_are_expanded_with_the_presets_next_to_them(write_json, tmp_path):
+    pages = os.path.dirname(write_json("pages/about-us.json", PAGE))
+    interned = str(tmp_path / "interned")
+    assert presets_main(["intern", pages, "--out", interned]) == 0
+    assert _problems([interned]) == (1, [])
+
+    # Without the table the interned blocks are not valid PageBlockNew objects
+    os.remove(os.path.join(interned, PRESETS_FILE))
+    count, problems = _problems([interned])
+    assert count == 1 and any(path.endswith(".stylePreset") for _, path, _ in problems)
@@ -0,0 +1,88 @@
+import copy
+import json
+import os
+
+import pytest
+
+from block_store import STORE_SUBDIR, BlockStore, collect_garbage, main, pack_page, unpack_page
+from page_generator import generate, load_spec
+from page_importer import iter_page_files
+from page_writers import BLOCK_STORE_INDEX_FILE, list_page_files
+
+
+def _pages(directory):
+    pages = {}
+    for path in list_page_files(directory, (".json",)):
+        with open(path, encoding="utf-8") as f:
+            page = json.load(f)
+        pages[page["id"]] = page
+    return pages
+
+
+@pytest.fixture
+def built(spec, tmp_path):
+    directory = tmp_path / "built"
+    generate(load_spec(spec), str(directory), workers=1)
+    return str(directory)
+
+
+def test_pack_shares_identical_blocks_and_unpack_restores_the_pages(built, tmp_path, capsys):
+    packed = str(tmp_path / "packed")
+    assert main(["pack", built, "--out", packed]) == 0
+    pages = _pages(packed)
+    assert len(pages) == 6 and all("blocks" not in page and len(page["blockRefs"]) == 3 for page in pages.values())
+    with open(os.path.join(packed, BLOCK_STORE_INDEX_FILE), encoding="utf-8") as f:
+        index = json.load(f)["blocks"]
+    # The generated pages differ only outside their blocks, so every page shares the same three
+    assert len(index) == 3 and {entry["refs"] for entry in index.values()} == {6}
+
+    unpacked = str(tmp_path / "unpacked")
+    assert main(["unpack", packed, "--out", unpacked]) == 0
+    assert _pages(unpacked) == _pages(built)
+
+
+def test_pack_page_keeps_page_local_keys_out_of_the_store(tmp_path):
+    store = BlockStore(str(tmp_path / "store"))
+    block = {"id": "hero-0", "order": 0, "type": "hero", "content": {"title": "Hi"}}
+    page = {"id": "p", "blocks": [block, {**block, "id": "hero-1", "order": 1}]}
+    packed = pack_page(page, store)
+    assert packed["blockRefs"][0]["ref"] == packed["blockRefs"][1]["ref"] and store.written == 1
+    assert unpack_page(packed, BlockStore(store.directory)) == page
+
+
+def test_gc_deletes_only_unreferenced_blocks(tmp_path):
+    packed = str(tmp_path / "packed")
+    store_dir = os.path.join(packed, STORE_SUBDIR)
+    store = BlockStore(store_dir)
+    shared = {"type": "contact", "content": {"email": "a@b.c"}}
+    pages = [
+        pack_page({"id": "a", "blocks": [{"id": "x", **shared}, {"id": "y", "type": "hero", "content": {"title": "A"}}]}, store),
+        pack_page({"id": "b", "blocks": [{"id": "x", **shared}]}, store),
+    ]
+    os.makedirs(packed, exist_ok=True)
+    for page in pages:
+        with open(os.path.join(packed, f"{page['id']}.json"), "w", encoding="utf-8") as f:
+            json.dump(page, f)
+    assert len(store.known) == 2
+
+    os.remove(os.path.join(packed, "a.json"))
+    garbage, freed = collect_garbage(iter_page_files([packed]), packed, dry_run=True)
+    assert garbage == [pages[0]["blockRefs"][1]["ref"]] and freed > 0
+    assert len(BlockStore(store_dir).known) == 2
+
+    assert collect_garbage(iter_page_files([packed]), packed)[0] == garbage
+    assert BlockStore(store_dir).known == {pages[1]["blockRefs"][0]["ref"]}
+
+
+def test_gc_refuses_to_sweep_a_store_that_does_not_match_the_pages(tmp_path):
+    packed = str(tmp_path / "packed")
+    store = BlockStore(os.path.join(packed, STORE_SUBDIR))
+    page = pack_page({"id": "a", "blocks": [{"id": "x", "type": "hero"}]}, store)
+    with pytest.raises(ValueError, match="refusing to empty"):
+        collect_garbage([], packed)
+
+    orphan = copy.deepcopy(page)
+    orphan["blockRefs"][0]["ref"] = "blk-missing"
+    with pytest.raises(ValueError, match="missing from the store"):
+        collect_garbage([(orphan, 0)], packed)
+    assert len(BlockStore(store.directory).known) == 1
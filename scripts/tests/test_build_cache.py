@@ -0,0 +1,58 @@
+import json
+import os
+
+from page_generator import generate, load_spec, page_id
+
+PAGE = page_id("dept-0", "ar")
+
+
+def _files(directory):
+    return sorted(name for name in os.listdir(directory) if not name.startswith("."))
+
+
+def test_unchanged_rebuild_writes_nothing_and_keeps_timestamps(spec, tmp_path):
+    out_dir = str(tmp_path / "out")
+    generate(load_spec(spec), out_dir, workers=1)
+    with open(os.path.join(out_dir, f"{PAGE}.json"), encoding="utf-8") as f:
+        first = json.load(f)
+    stats = generate(load_spec(spec), out_dir, workers=1)
+    assert stats["written"] == 0
+    assert stats["manifest"]["unchanged"] == 6
+    with open(os.path.join(out_dir, f"{PAGE}.json"), encoding="utf-8") as f:
+        assert json.load(f) == first
+
+
+def test_switching_format_and_compression_rewrites_every_file(spec, tmp_path):
+    out_dir = str(tmp_path / "out")
+    generate(load_spec(spec), out_dir, workers=1)
+    stats = generate(load_spec(spec), out_dir, workers=1, fmt="compact", codecs=("gz",))
+    assert stats["written"] == 6
+    # Only content changes are reported as changes
+    assert stats["manifest"]["changed"] == []
+    path = os.path.join(out_dir, f"{PAGE}.json")
+    with open(path, encoding="utf-8") as f:
+        assert "\n" not in f.read()
+    assert os.path.exists(path + ".gz")
+
+    stats = generate(load_spec(spec), out_dir, workers=1, fmt="compact")
+    assert stats["written"] == 6
+    assert not os.path.exists(path + ".gz")
+
+
+def test_missing_variant_is_rewritten(spec, tmp_path):
+    out_dir = str(tmp_path / "out")
+    generate(load_spec(spec), out_dir, workers=1, codecs=("gz",))
+    os.remove(os.path.join(out_dir, f"{PAGE}.json.gz"))
+    stats = generate(load_spec(spec), out_dir, workers=1, codecs=("gz",))
+    assert stats["written"] == 1
+    assert os.path.exists(os.path.join(out_dir, f"{PAGE}.json.gz"))
+
+
+def test_switching_to_ndjson_and_back_leaves_one_layout(spec, tmp_path):
+    out_dir = str(tmp_path / "out")
+    generate(load_spec(spec), out_dir, workers=1)
+    generate(load_spec(spec), out_dir, workers=1, fmt="ndjson")
+    assert _files(out_dir) == ["pages.ndjson"]
+    stats = generate(load_spec(spec), out_dir, workers=1)
+    assert stats["written"] == 6
+    assert "pages.ndjson" not in _files(out_dir)
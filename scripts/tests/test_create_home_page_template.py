@@ -0,0 +1,40 @@
+import importlib.util
+import json
+import os
+
+import pytest
+
+from page_writers import list_page_files
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "create-home-page-template.py")
+
+
+@pytest.fixture
+def template_script(monkeypatch):
+    """create-home-page-template.py, with publishing captured instead of sent to Firestore."""
+    spec = importlib.util.spec_from_file_location("create_home_page_template", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    published = []
+    monkeypatch.setattr(module, "publish_pages", lambda sized_pages: published.extend(page for page, _ in sized_pages))
+    module.published = published
+    return module
+
+
+def _first_page(directory):
+    with open(list_page_files(str(directory), (".json",))[0], encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_interned_builds_publish_full_styles(template_script, spec, tmp_path, capsys):
+    assert template_script.write_spec_pages(spec, str(tmp_path / "interned"), 1, publish=True, intern_styles=True)
+    assert any("stylePreset" in block for block in _first_page(tmp_path / "interned")["blocks"])
+    interned = {page["id"]: page for page in template_script.published}
+    template_script.published.clear()
+    assert template_script.write_spec_pages(spec, str(tmp_path / "plain"), 1, publish=True)
+    plain = {page["id"]: page for page in template_script.published}
+
+    assert len(interned) == 6 and interned.keys() == plain.keys()
+    for page_id, page in interned.items():
+        assert all("stylePreset" not in block for block in page["blocks"])
+        assert [block["styles"] for block in page["blocks"]] == [block["styles"] for block in plain[page_id]["blocks"]]
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from html_sanitizer import STALE_MARKER_KEY, load_policies, sanitize_html, sanitize_page_files
+
+POLICIES = load_policies()
+
+VECTORS = [
+    ("<script>alert(1)</script><p>x</p>", "<p>x</p>"),
+    ("<img src=x onerror=alert(1)>", '<img src="x">'),
+    ('<a href="javascript:alert(1)">x</a>', "<a>x</a>"),
+    ('<a href=" jav&#x09;ascript:alert(1)">x</a>', "<a>x</a>"),
+    ('<a href="https://example.com" target="_blank" onclick="steal()">x</a>', '<a href="https://example.com" target="_blank">x</a>'),
+    ('<img src="data:image/png;base64,AAAA">', '<img src="data:image/png;base64,AAAA">'),
+    ('<a href="data:text/html,<script>alert(1)</script>">x</a>', "<a>x</a>"),
+    ("<svg><script>alert(1)</script><circle/></svg>after", "after"),
+    ("<style>p { color: red }</style><p>ok</p>", "<p>ok</p>"),
+    ("<!-- note --><p>ok</p>", "<p>ok</p>"),
+    ("<form><input value=x>text</form>", "text"),
+    ("<p><strong>open", "<p><strong>open</strong></p>"),
+    ("<p>1 &lt; 2 &amp; 3</p>", "<p>1 &lt; 2 &amp; 3</p>"),
+    ("<table><thead><tr><th>h</th></tr></thead><tbody><tr><td>d</td></tr></tbody></table>",
+     "<table><thead><tr><th>h</th></tr></thead><tbody><tr><td>d</td></tr></tbody></table>"),
+]
+
+
+@pytest.mark.parametrize("name", sorted(POLICIES))
+@pytest.mark.parametrize("html, expected", VECTORS)
+def test_vectors(name, html, expected):
+    assert sanitize_html(html, POLICIES[name]) == expected
+
+
+def test_custom_html_policy_is_narrower_than_rich_text():
+    html = '<blockquote data-x="1">q</blockquote><pre><code>c</code></pre>'
+    assert sanitize_html(html, POLICIES["richText"]) == html
+    assert sanitize_html(html, POLICIES["customHtml"]) == "qc"
+
+
+def test_pages_are_sanitized_per_field_policy(tmp_path):
+    pages = tmp_path / "pages"
+    pages.mkdir()
+    page = {
+        "id": "p",
+        "contentAr": "<blockquote>اقتباس</blockquote>",
+        STALE_MARKER_KEY: "sp1-0123456789ab",
+        "blocks": [{"id": "b", "type": "custom-html", "content": {"html": "<blockquote>q</blockquote><img src=x onerror=1>"}}],
+    }
+    (pages / "p.json").write_text(json.dumps(page, ensure_ascii=False), encoding="utf-8")
+    cache = str(tmp_path / "cache.json")
+
+    stats = sanitize_page_files(str(pages), POLICIES, cache, workers=1)
+    assert (stats["pages"], stats["rewritten"], stats["sanitized"]) == (1, 1, 2)
+    result = json.loads((pages / "p.json").read_text(encoding="utf-8"))
+    assert result["contentAr"] == "<blockquote>اقتباس</blockquote>"
+    assert result["blocks"][0]["content"]["html"] == 'q<img src="x">'
+    assert STALE_MARKER_KEY not in result
+
+    again = sanitize_page_files(str(pages), POLICIES, cache, workers=1)
+    assert (again["rewritten"], again["sanitized"]) == (0, 0)
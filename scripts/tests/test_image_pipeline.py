@@ -0,0 +1,83 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("PIL")
+from PIL import Image
+
+from image_pipeline import MANIFEST_FILE, AssetIndex, ImagePipeline, ImagePlanner, optimize_page_images
+
+
+def _photo(directory, name, size, color="steelblue"):
+    directory.mkdir(exist_ok=True)
+    Image.new("RGB", size, color).save(directory / name)
+
+
+def _block(*sizes, title="Our campus"):
+    return {
+        "type": "hero",
+        "content": {"title": title, "slides": [{"image": f"/placeholder.svg?height={h}&width={w}"} for w, h in sizes]},
+    }
+
+
+@pytest.fixture
+def public(tmp_path):
+    directory = tmp_path / "public"
+    _photo(directory, "school-building.jpg", (800, 600))
+    _photo(directory, "classroom-reading.jpg", (800, 600), "tan")
+    _photo(directory, "logo.png", (64, 64))
+    return directory
+
+
+def test_placeholders_are_left_alone_without_public_photos(tmp_path, write_json):
+    public = tmp_path / "public"
+    _photo(public, "logo.png", (64, 64))
+    _photo(public, "icon.png", (32, 32))
+    page = {"id": "p", "blocks": [_block((300, 200))]}
+    path = write_json("pages/p.json", page)
+
+    stats = optimize_page_images(os.path.dirname(path), public_dir=str(public), workers=1)
+    assert (stats["jobs"], stats["rendered"], stats["pages"]) == (0, 0, 0)
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == page
+    assert not (public / "optimized").exists()
+
+
+def test_placeholders_resolve_to_the_best_unused_photo(public):
+    index = AssetIndex(str(public))
+    assert sorted(index.assets) == ["classroom-reading.jpg", "school-building.jpg"]
+    assert index.resolve("reading in the classroom") == "classroom-reading.jpg"
+    assert index.resolve("reading in the classroom", {"classroom-reading.jpg"}) == "school-building.jpg"
+
+    jobs = [job for _, _, job in ImagePlanner(index).plan_block(_block((300, 200), (300, 200)))]
+    assert sorted(name for name, _, _ in jobs) == ["classroom-reading.jpg", "school-building.jpg"]
+
+
+def test_variants_stop_at_the_source_resolution(public):
+    pipeline = ImagePipeline(str(public), workers=1)
+    block = _block((300, 200), (500, 400), title="school building")
+    assert pipeline.render(pipeline.plan_pages([{"blocks": [block]}])) == (2, 0)
+    assert pipeline.rewrite_block(block)
+
+    small, large = block["content"]["slides"]
+    assert small["image"].startswith("/optimized/school-building.") and small["image"].endswith(".300x200.webp")
+    assert [entry.rsplit(" ", 1)[1] for entry in small["imageSrcSet"].split(", ")] == ["300w", "600w"]
+    # 2x of 500x400 would upscale the 800x600 source, so only the 1x variant exists
+    assert [entry.rsplit(" ", 1)[1] for entry in large["imageSrcSet"].split(", ")] == ["500w"]
+    if "avif" in pipeline.formats:
+        assert small["imageAvifSrcSet"].count("w") == 2
+
+
+def test_unchanged_variants_are_skipped(public):
+    jobs = {("school-building.jpg", 300, 200), ("classroom-reading.jpg", 300, 200)}
+    assert ImagePipeline(str(public), workers=1).render(jobs) == (2, 0)
+    # A new run reads the manifest back and trusts it while the sources are unchanged
+    assert ImagePipeline(str(public), workers=1).render(jobs) == (0, 2)
+
+    _photo(public, "school-building.jpg", (900, 600), "crimson")
+    pipeline = ImagePipeline(str(public), workers=1)
+    assert pipeline.render(jobs) == (1, 1)
+    with open(public / "optimized" / MANIFEST_FILE, encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert manifest["jobs"]["school-building.jpg@300x200"]["hash"] == manifest["sources"]["school-building.jpg"]["hash"]
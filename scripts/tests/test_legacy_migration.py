@@ -0,0 +1,103 @@
+import json
+import os
+
+from legacy_migration import REPORT_FILE, main, migrate_sites
+
+SNAPSHOT = {
+    "site": "north",
+    "heroSlides": [{"titleAr": "مرحبا", "titleEn": "Welcome", "image": "/a.jpg"}],
+    "departments": [{"id": "d1", "type": "medical", "titleAr": "القسم الطبي", "titleEn": "Medical"}],
+}
+
+
+def test_malformed_snapshots_are_reported_per_site(tmp_path):
+    snapshots = tmp_path / "snapshots"
+    snapshots.mkdir()
+    (snapshots / "good.json").write_text(json.dumps(SNAPSHOT), encoding="utf-8")
+    (snapshots / "broken.json").write_text('{"site": "broken", ', encoding="utf-8")
+    (snapshots / "list.json").write_text("[]", encoding="utf-8")
+    (snapshots / "more.ndjson").write_text(
+        json.dumps({**SNAPSHOT, "site": "south"}) + "\n{not json\n" + json.dumps({**SNAPSHOT, "site": "east"}) + "\n",
+        encoding="utf-8",
+    )
+    out_dir = tmp_path / "out"
+
+    results = migrate_sites([str(snapshots)], str(out_dir), workers=1)
+
+    by_site = {result["site"]: result for result in results}
+    assert [result["site"] for result in results] == ["broken", "north", "list", "south", "more-2", "east"]
+    assert {site for site, result in by_site.items() if result["success"]} == {"north", "south", "east"}
+    assert "broken.json: JSONDecodeError" in by_site["broken"]["error"]
+    assert "more.ndjson:2: JSONDecodeError" in by_site["more-2"]["error"]
+    assert "expected a snapshot object" in by_site["list"]["error"]
+    with open(out_dir / REPORT_FILE, encoding="utf-8") as f:
+        assert len(json.load(f)["sites"]) == 6
+    assert sorted(os.listdir(out_dir)) == ["east.ndjson", "migration-report.json", "north.ndjson", "south.ndjson"]
+
+
+def test_department_pages_are_written_with_the_homepage(tmp_path):
+    (tmp_path / "north.json").write_text(json.dumps(SNAPSHOT), encoding="utf-8")
+    assert main([str(tmp_path / "north.json"), "--out", str(tmp_path / "out"), "--workers", "1"]) == 0
+    with open(tmp_path / "out" / "north.ndjson", encoding="utf-8") as f:
+        pages = [json.loads(line) for line in f]
+    assert [page["slug"] for page in pages] == ["home", "departments/medical"]
+
+
+def test_blocks_match_the_shape_lib_migration_ts_builds(tmp_path):
+    snapshot = {
+        "site": "full",
+        "heroSlides": [{"titleAr": "مرحبا", "titleEn": "Welcome", "descriptionEn": "Hi", "image": "/a.jpg"}],
+        "aboutContent": {
+            "titleAr": "عنا",
+            "descriptionAr": "نص",
+            "descriptionEn": "Text",
+            "features": [{"titleAr": "ميزة", "titleEn": "Feature", "descriptionAr": "و", "descriptionEn": "D"}],
+        },
+        "galleryImages": [
+            {"id": "g1", "image": "/1.jpg", "titleAr": "ملعب", "titleEn": "Field", "category": "sports"},
+            {"id": "g2", "image": "/2.jpg", "titleAr": "فصل", "titleEn": "Class"},
+            {"id": "g3", "image": "/3.jpg", "titleAr": "سباحة", "titleEn": "Pool", "category": "sports"},
+        ],
+        "departments": [{"type": "medical", "titleAr": "القسم الطبي", "titleEn": "Medical", "descriptionAr": "و", "image": "/m.jpg"}],
+    }
+    (tmp_path / "full.json").write_text(json.dumps(snapshot, ensure_ascii=False), encoding="utf-8")
+    assert main([str(tmp_path / "full.json"), "--out", str(tmp_path / "out"), "--workers", "1"]) == 0
+    with open(tmp_path / "out" / "full.ndjson", encoding="utf-8") as f:
+        home, department = [json.loads(line) for line in f]
+
+    assert home["blocks"] == home["blocksAr"] == home["blocksEn"]
+    assert home["blocks"] == [
+        {"id": "hero-0", "kind": "hero-basic", "data": {
+            "heading": "مرحبا", "headingEn": "Welcome", "subheading": "Hi", "subheadingEn": "Hi",
+            "backgroundImage": "/a.jpg", "overlay": True,
+            "cta": {"text": "اكتشف المزيد", "textEn": "Learn More", "link": "#about"},
+        }},
+        {"id": "header-1", "kind": "section-header", "data": {
+            "title": "عنا", "titleEn": "About Us", "subtitle": "", "subtitleEn": "", "alignment": "center",
+        }},
+        {"id": "image-text-2", "kind": "image-with-text", "data": {
+            "image": "", "imagePosition": "right", "title": "عنا", "content": "نص", "contentEn": "Text",
+        }},
+        {"id": "features-3", "kind": "icon-points", "data": {
+            "title": "مميزاتنا", "titleEn": "Our Features", "points": [{
+                "id": "feature-0", "icon": "✓", "title": "ميزة", "titleEn": "Feature",
+                "description": "و", "descriptionEn": "D",
+            }],
+        }},
+        {"id": "gallery-4", "kind": "image-albums", "data": {
+            "title": "معرض الصور", "titleEn": "Photo Gallery", "albums": [
+                {"id": "album-0", "title": "sports", "titleEn": "sports", "images": [
+                    {"id": "g1", "url": "/1.jpg", "caption": "ملعب", "captionEn": "Field"},
+                    {"id": "g3", "url": "/3.jpg", "caption": "سباحة", "captionEn": "Pool"},
+                ]},
+                {"id": "album-1", "title": "المعرض", "titleEn": "Gallery", "images": [
+                    {"id": "g2", "url": "/2.jpg", "caption": "فصل", "captionEn": "Class"},
+                ]},
+            ],
+        }},
+    ]
+    assert [block["kind"] for block in department["blocks"]] == ["section-header", "rich-text", "image-with-text"]
+    assert department["blocks"][1] == {"id": "content-1", "kind": "rich-text", "data": {"content": "و"}}
+    assert department["blocks"][2]["data"] == {
+        "image": "/m.jpg", "imagePosition": "right", "title": "القسم الطبي", "titleEn": "Medical", "content": "و",
+    }
@@ -0,0 +1,49 @@
+import json
+import os
+
+import pytest
+
+from page_blocks import build_block
+from page_generator import build_page, generate, iter_tasks, load_spec, page_id
+
+
+def test_page_ids_are_stable_and_unique_per_language():
+    assert page_id("medical", "ar") == page_id("medical", "ar")
+    assert page_id("medical", "ar") != page_id("medical", "en")
+    assert page_id("/a/b/", "en").startswith("a-b-en-")
+
+
+def test_generate_writes_one_file_per_page_and_language(spec, tmp_path):
+    out_dir = tmp_path / "out"
+    stats = generate(load_spec(spec), str(out_dir), workers=1)
+    assert stats["pages"] == 6
+    assert stats["written"] == 6
+    page = json.loads((out_dir / f"{page_id('dept-1', 'en')}.json").read_text(encoding="utf-8"))
+    assert page["language"] == "en"
+    assert [block["type"] for block in page["blocks"]] == [build_block(name, 0)["type"] for name in ("hero", "about", "contact")]
+    assert [block["order"] for block in page["blocks"]] == [0, 1, 2]
+
+
+def test_content_overrides_reach_the_block():
+    page = {"slug": "x", "content": {"hero": {"titleAr": "عنوان"}}}
+    built = build_page(page, ["hero"], "ar", "2024-01-01T00:00:00")
+    assert built["blocks"][0]["content"]["titleAr"] == "عنوان"
+
+
+def test_a_recipe_repeating_a_block_gets_unique_block_ids():
+    built = build_page({"slug": "x"}, ["hero", "about", "hero"], "en", "2024-01-01T00:00:00")
+    assert [block["id"] for block in built["blocks"]] == ["hero-0", "about-1", "hero-2"]
+
+
+def test_duplicate_pages_are_rejected():
+    spec = {"pages": [{"slug": "a"}, {"slug": "a"}]}
+    with pytest.raises(ValueError, match="Duplicate page"):
+        list(iter_tasks(spec, "now"))
+
+
+def test_ndjson_page_list_is_resolved_relative_to_the_spec(tmp_path):
+    (tmp_path / "pages.ndjson").write_text('{"slug": "a"}\n\n{"slug": "b"}\n', encoding="utf-8")
+    (tmp_path / "spec.json").write_text('{"pages": "pages.ndjson"}', encoding="utf-8")
+    spec = load_spec(str(tmp_path / "spec.json"))
+    assert os.path.isabs(spec["pages"])
+    assert [task.page["slug"] for task in iter_tasks(spec, "now")] == ["a", "b"]
@@ -0,0 +1,104 @@
+import pytest
+
+import page_importer
+from page_importer import Checkpoint, import_pages, sized
+
+
+class FakeCollection:
+    def __init__(self, name):
+        self.name = name
+
+    def document(self, document_id):
+        return self.name, document_id
+
+
+class FakeBatch:
+    def __init__(self, client):
+        self.client = client
+        self.writes = []
+
+    def set(self, reference, data):
+        self.writes.append((reference, data))
+
+    def commit(self):
+        if self.client.failures:
+            raise self.client.failures.pop(0)
+        self.client.commits.append([reference for reference, _ in self.writes])
+        self.client.documents.update(self.writes)
+
+
+class FakeClient:
+    """Records committed batches of (collection, id) references; raises the queued failures first."""
+
+    def __init__(self, failures=()):
+        self.failures = list(failures)
+        self.commits = []
+        self.documents = {}
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def collection(self, name):
+        return FakeCollection(name)
+
+
+def _pages(count, text=""):
+    return [{"id": f"p{i:02}", "title": text} for i in range(count)]
+
+
+def test_batches_split_on_the_op_count_and_the_byte_size():
+    client = FakeClient()
+    stats = import_pages(sized(_pages(7)), collection="pages", concurrency=1, client=client, max_ops=3)
+    assert [len(batch) for batch in client.commits] == [3, 3, 1]
+    assert (stats["pages"], stats["batches"]) == (7, 3)
+
+    client = FakeClient()
+    pages = _pages(5, "x" * 100)
+    size = next(sized(pages[:1]))[1]
+    import_pages(sized(pages), collection="pages", concurrency=1, client=client, max_bytes=2 * size + 1)
+    assert [len(batch) for batch in client.commits] == [2, 2, 1]
+    assert [document_id for batch in client.commits for _, document_id in batch] == [page["id"] for page in pages]
+
+
+def test_transient_failures_are_retried_with_growing_backoff(monkeypatch):
+    delays = []
+    monkeypatch.setattr(page_importer.random, "uniform", lambda low, high: high)
+    monkeypatch.setattr(page_importer.time, "sleep", delays.append)
+    client = FakeClient([ConnectionError("reset"), TimeoutError("deadline")])
+
+    stats = import_pages(sized(_pages(2)), collection="pages", concurrency=1, client=client)
+    assert stats["retries"] == 2 and len(client.commits) == 1
+    assert delays == [page_importer.BACKOFF_SECONDS, page_importer.BACKOFF_SECONDS * 2]
+
+
+def test_permanent_failures_and_exhausted_retries_are_raised(monkeypatch):
+    monkeypatch.setattr(page_importer.time, "sleep", lambda seconds: None)
+    with pytest.raises(ValueError):
+        import_pages(sized(_pages(1)), client=FakeClient([ValueError("invalid document")]))
+    with pytest.raises(ConnectionError):
+        import_pages(sized(_pages(1)), retries=1, client=FakeClient([ConnectionError()] * 2))
+
+
+def test_an_interrupted_import_resumes_from_its_checkpoint(tmp_path):
+    path = str(tmp_path / "import.checkpoint")
+    pages = _pages(10)
+    client = FakeClient()
+    committed = []
+
+    def commit_until_the_third_batch(client, collection, items, retries):
+        if len(committed) == 2:
+            raise KeyboardInterrupt
+        committed.append([page["id"] for page in items])
+        return page_importer.commit_batch(client, collection, items, retries)
+
+    with pytest.raises(KeyboardInterrupt):
+        import_pages(
+            sized(pages), concurrency=1, checkpoint=Checkpoint(path), client=client, max_ops=3, commit=commit_until_the_third_batch
+        )
+    assert Checkpoint(path).done == {f"p{i:02}" for i in range(6)}
+
+    stats = import_pages(sized(pages), concurrency=1, checkpoint=Checkpoint(path), client=client, max_ops=3)
+    assert (stats["skipped"], stats["pages"], stats["batches"]) == (6, 4, 2)
+    written = [document_id for batch in client.commits for _, document_id in batch]
+    assert written == [page["id"] for page in pages]
+    assert Checkpoint(path).done == {page["id"] for page in pages}
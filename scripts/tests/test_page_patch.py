@@ -0,0 +1,62 @@
+import copy
+
+from block_store import BlockStore, pack_page
+from page_blocks import build_block
+from page_patch import apply_patch, diff_pages, firestore_updates, plan_updates
+
+
+def _page():
+    return {
+        "id": "dept-ar",
+        "title": "Department",
+        "seo": {"titleAr": "قسم", "titleEn": "Department"},
+        "blocks": [build_block(name, order) for order, name in enumerate(["hero", "about", "contact"])],
+    }
+
+
+def _edit_block(page):
+    edited = copy.deepcopy(page)
+    edited["blocks"][1]["content"]["titleAr"] = "عن القسم"
+    return edited
+
+
+def test_block_edit_is_a_single_operation_that_round_trips():
+    old = _page()
+    new = _edit_block(old)
+    ops = diff_pages(old, new)
+    assert ops == [{"op": "replace", "path": "/blocks/1/content/titleAr", "value": "عن القسم"}]
+    assert apply_patch(old, ops) == new
+
+
+def test_block_edit_rewrites_the_whole_blocks_array():
+    old = _page()
+    new = _edit_block(old)
+    updates, deletes = firestore_updates(diff_pages(old, new), new)
+    assert updates == {"blocks": new["blocks"]} and deletes == []
+
+
+def test_edits_outside_blocks_address_single_fields():
+    old = _page()
+    new = copy.deepcopy(old)
+    new["seo"]["titleEn"] = "Our Department"
+    del new["seo"]["titleAr"]
+    updates, deletes = firestore_updates(diff_pages(old, new), new)
+    assert updates == {"seo.titleEn": "Our Department"}
+    assert deletes == ["seo.titleAr"]
+
+
+def test_packed_pages_rewrite_only_the_references(tmp_path):
+    store = BlockStore(str(tmp_path / "blocks"))
+    old = pack_page(_page(), store)
+    new = pack_page(_edit_block(_page()), store)
+    (write,) = plan_updates([new], {old["id"]: old})
+    assert list(write["set"]) == ["blockRefs"]
+    refs = write["set"]["blockRefs"]
+    assert refs[0] == old["blockRefs"][0] and refs[2] == old["blockRefs"][2]
+    assert refs[1]["ref"] != old["blockRefs"][1]["ref"] and refs[1]["id"] == old["blockRefs"][1]["id"]
+
+
+def test_unchanged_and_new_pages():
+    page = _page()
+    assert list(plan_updates([page], {page["id"]: copy.deepcopy(page)})) == []
+    assert list(plan_updates([page], {})) == [{"id": page["id"], "page": page}]
@@ -0,0 +1,37 @@
+import gzip
+import json
+import os
+
+from page_importer import iter_page_files
+from page_writers import NON_PAGE_FILES, NdjsonWriter, compress_variants, list_page_files, serialize_page
+
+
+def test_listing_skips_dotfiles_and_build_artifacts(tmp_path):
+    for name in ["b.json", "a.json", "pages.ndjson", ".build-cache.json", "notes.txt", "x.json.gz", *NON_PAGE_FILES]:
+        (tmp_path / name).write_text("{}", encoding="utf-8")
+    assert [os.path.basename(path) for path in list_page_files(str(tmp_path))] == ["a.json", "b.json", "pages.ndjson"]
+    assert [os.path.basename(path) for path in list_page_files(str(tmp_path), (".json",))] == ["a.json", "b.json"]
+
+
+def test_iter_page_files_reads_directories_through_the_listing(tmp_path):
+    (tmp_path / "build-manifest.json").write_text('{"pages": {}}', encoding="utf-8")
+    (tmp_path / "p.json").write_text(serialize_page({"id": "p", "blocks": []}), encoding="utf-8")
+    with NdjsonWriter(str(tmp_path / "pages.ndjson")) as writer:
+        writer.write(serialize_page({"id": "q", "blocks": []}, "compact"))
+    assert [page["id"] for page, _ in iter_page_files([str(tmp_path)])] == ["p", "q"]
+
+
+def test_ndjson_writer_streams_a_matching_gzip_copy(tmp_path):
+    path = str(tmp_path / "pages.ndjson")
+    with NdjsonWriter(path, ("gz",)) as writer:
+        for i in range(3):
+            writer.write(json.dumps({"id": i}))
+    with open(path, "rb") as f:
+        plain = f.read()
+    assert gzip.decompress(open(path + ".gz", "rb").read()) == plain
+    assert plain.count(b"\n") == 3
+
+
+def test_compressed_variants_are_deterministic():
+    data = serialize_page({"id": "x", "title": "عنوان"}).encode("utf-8")
+    assert compress_variants(data, ("gz",)) == compress_variants(data, ("gz",))
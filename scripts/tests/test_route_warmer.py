@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from route_warmer import ConnectionPool, load_targets, parse_status, run_pass
+
+# Keep-alive responses without a body or a content-length; a client reading to EOF would hang on them
+RESPONSES = {
+    "/not-modified": b"HTTP/1.1 304 Not Modified\r\nETag: \"x\"\r\n\r\n",
+    "/no-content": b"HTTP/1.1 204 No Content\r\n\r\n",
+    "/hints": b"HTTP/1.1 103 Early Hints\r\nLink: </a.css>\r\n\r\nHTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok",
+    "/head": b"HTTP/1.1 200 OK\r\nContent-Length: 1234\r\n\r\n",
+    "/garbage": b"\r\n\r\n",
+}
+
+
+async def _serve(handler, scenario):
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await asyncio.wait_for(scenario(f"http://127.0.0.1:{port}"), 5)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+async def _keep_alive(reader, writer):
+    while request := await reader.readuntil(b"\r\n\r\n"):
+        path = request.split()[1].decode()
+        writer.write(RESPONSES[path])
+        await writer.drain()
+        if path == "/garbage":
+            writer.close()
+            return
+
+
+def test_bodiless_responses_keep_the_connection():
+    async def scenario(base_url):
+        pool = ConnectionPool(base_url, 1, timeout=2)
+        results = [
+            await pool.request("/not-modified"),
+            await pool.request("/no-content"),
+            await pool.request("/hints"),
+            await pool.request("/head", method="HEAD"),
+        ]
+        pool.close()
+        return results, pool.opened
+
+    results, opened = asyncio.run(_serve(_keep_alive, scenario))
+    assert [(status, size) for status, _, _, size in results] == [(304, 0), (204, 0), (200, 2), (200, 0)]
+    assert opened == 1
+
+
+def test_malformed_status_line_is_a_failed_sample():
+    async def scenario(base_url):
+        pool = ConnectionPool(base_url, 1, timeout=2)
+        samples = await run_pass(pool, [("/garbage", "g", [])], 1)
+        pool.close()
+        return samples
+
+    (sample,) = asyncio.run(_serve(_keep_alive, scenario))
+    assert sample["error"].startswith("ConnectionError: malformed status line")
+
+
+def test_request_on_a_dropped_idle_connection_is_resent():
+    async def close_after_one(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(RESPONSES["/no-content"])
+        await writer.drain()
+        # Shut the keep-alive connection without telling the client, as an idle timeout would
+        await reader.read(1)
+        writer.close()
+
+    async def scenario(base_url):
+        pool = ConnectionPool(base_url, 1, timeout=2)
+        results = [await pool.request("/no-content"), await pool.request("/no-content")]
+        pool.close()
+        return results, pool.opened, pool.retried
+
+    results, opened, retried = asyncio.run(_serve(close_after_one, scenario))
+    assert [status for status, _, _, _ in results] == [204, 204]
+    assert (opened, retried) == (2, 1)
+
+
+@pytest.mark.parametrize("line", [b"", b"\r\n", b"HTTP/1.1\r\n", b"HTTP/1.1 abc OK\r\n", b"<html>\r\n"])
+def test_parse_status_rejects_malformed_lines(line):
+    with pytest.raises(ConnectionError):
+        parse_status(line)
+
+
+def test_parse_status():
+    assert parse_status(b"HTTP/1.1 304 Not Modified\r\n") == 304
+    assert parse_status(b"HTTP/1.0 200\r\n") == 200
+
+
+def test_drafts_are_only_warmed_on_request(write_json):
+    pages = write_json("pages.json", [
+        {"id": "a", "slug": "live", "language": "en", "status": "published", "blocks": [{"type": "hero"}]},
+        {"id": "b", "slug": "draft", "language": "en", "status": "draft", "blocks": []},
+        {"id": "c", "slug": "legacy", "language": "en", "isPublished": True},
+    ])
+    assert [route for route, _, _ in load_targets([pages])] == ["/en/live", "/en/legacy"]
+    assert [route for route, _, _ in load_targets([pages], include_drafts=True)] == ["/en/live", "/en/draft", "/en/legacy"]
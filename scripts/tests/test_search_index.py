@@ -0,0 +1,50 @@
+import pytest
+
+from page_generator import build_page, page_id
+from search_index import analyze, build_index, delta_decode, delta_encode, search
+
+
+def _generated(slug, language):
+    entry = {"slug": slug, "titleAr": "قسم المدرسة", "titleEn": "School Department"}
+    return build_page(entry, ["hero", "about"], language, "2024-01-01T00:00:00")
+
+
+def test_a_page_without_a_sibling_stands_in_for_it():
+    shards = build_index([_generated("school", "ar")])
+    assert [doc[0] for doc in search(shards["en"], "school")] == [page_id("school", "ar")]
+    assert [doc[0] for doc in search(shards["en"], "education")] == [page_id("school", "ar")]
+    assert [doc[0] for doc in search(shards["ar"], "المدرسة")] == [page_id("school", "ar")]
+    assert shards["en"]["docs"][0][2] == "School Department"
+
+
+@pytest.mark.parametrize("order", [("ar", "en"), ("en", "ar")])
+def test_sibling_pages_are_indexed_once_per_language(order):
+    shards = build_index([_generated("school", language) for language in order])
+    assert [doc[0] for doc in search(shards["en"], "school")] == [page_id("school", "en")]
+    assert [doc[0] for doc in search(shards["ar"], "المدرسة")] == [page_id("school", "ar")]
+    assert len(shards["en"]["docs"]) == len(shards["ar"]["docs"]) == 1
+
+
+def test_stand_ins_only_fill_slugs_without_a_sibling():
+    pages = [_generated("school", "ar"), _generated("school", "en"), _generated("clinic", "ar")]
+    shards = build_index(pages)
+    assert [doc[0] for doc in shards["en"]["docs"]] == [page_id("school", "en"), page_id("clinic", "ar")]
+    assert [doc[0] for doc in search(shards["en"], "department")] == [page_id("school", "en"), page_id("clinic", "ar")]
+
+
+def test_pages_are_left_out_of_languages_they_have_no_text_in():
+    page = {"id": "p", "slug": "p", "language": "en", "titleAr": "مدرسة", "blocks": [{"content": {"titleAr": "نحن هنا"}}]}
+    shards = build_index([page])
+    assert shards["en"]["docs"] == []
+    assert [doc[0] for doc in search(shards["ar"], "مدرسة")] == ["p"]
+
+
+def test_arabic_analysis_folds_spelling_and_affixes():
+    assert analyze("والمدرسة", "ar") == analyze("مدرسه", "ar")
+    assert analyze("أحمد", "ar") == analyze("احمد", "ar")
+    assert analyze("the Schools of us", "en") == ("school", "us")
+
+
+def test_delta_encoding_round_trips():
+    assert delta_encode([3, 9, 10]) == [3, 6, 1]
+    assert delta_decode([3, 6, 1]) == [3, 9, 10]
@@ -0,0 +1,30 @@
+import json
+import os
+
+from page_generator import generate, load_spec
+from page_writers import MANIFEST_FILE, PRESETS_FILE
+from style_presets import main
+
+
+def _pages(directory):
+    return {
+        name: json.loads((directory / name).read_text(encoding="utf-8"))
+        for name in os.listdir(directory)
+        if name.endswith(".json") and not name.startswith(".")
+    }
+
+
+def test_intern_and_expand_round_trip_a_generated_directory(spec, tmp_path, capsys):
+    built = tmp_path / "built"
+    generate(load_spec(spec), str(built), workers=1)
+    assert (built / MANIFEST_FILE).exists() and (built / ".build-cache.json").exists()
+
+    assert main(["intern", str(built), "--out", str(tmp_path / "interned")]) == 0
+    assert "Interned 6 pages" in capsys.readouterr().out
+    interned = _pages(tmp_path / "interned")
+    assert MANIFEST_FILE not in interned
+    assert all("stylePreset" in block for name, page in interned.items() if name != PRESETS_FILE for block in page["blocks"])
+
+    assert main(["expand", str(tmp_path / "interned"), "--out", str(tmp_path / "expanded")]) == 0
+    originals = {name: page for name, page in _pages(built).items() if name != MANIFEST_FILE}
+    assert _pages(tmp_path / "expanded") == originals
@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from translation_catalog import Catalog, CatalogError, catalog_table, is_stale, open_catalog, write_catalog
+from translation_engine import Translator
+
+TABLE_SOURCE = '''translations = {
+    "تواصل معنا": "Contact Us",
+    "القسم الطبي": "Medical Department",
+}
+'''
+
+
+@pytest.fixture
+def table_file(tmp_path):
+    path = tmp_path / "table.py"
+    path.write_text(TABLE_SOURCE, encoding="utf-8")
+    return str(path)
+
+
+def test_lookups_binary_search_the_mapped_file(tmp_path):
+    path = str(tmp_path / "t.cat")
+    write_catalog({"ب": "b", "أ": "a", "ت": "t"}, path)
+    with Catalog.open(path) as catalog:
+        assert len(catalog) == 3
+        assert catalog["ب"] == "b"
+        assert catalog.get("missing") is None
+        assert dict(catalog.items()) == {"أ": "a", "ب": "b", "ت": "t"}
+
+
+def test_open_catalog_compiles_once_and_recompiles_when_the_table_changes(table_file, tmp_path):
+    path = str(tmp_path / "ar-en.cat")
+    assert is_stale(path, table_file)
+    assert catalog_table(table_file, path) == {"تواصل معنا": "Contact Us", "القسم الطبي": "Medical Department"}
+    assert not is_stale(path, table_file)
+
+    with open(table_file, "w", encoding="utf-8") as f:
+        f.write(TABLE_SOURCE.replace("Contact Us", "Get in Touch"))
+    stat = os.stat(path)
+    os.utime(table_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert is_stale(path, table_file)
+    with open_catalog(table_file, path) as catalog:
+        assert catalog["تواصل معنا"] == "Get in Touch"
+
+
+def test_conflicting_duplicates_fail_the_compile(tmp_path):
+    table_file = tmp_path / "table.py"
+    table_file.write_text('translations = {"أ": "a", "أ": "b"}\n', encoding="utf-8")
+    with pytest.raises(CatalogError, match="conflicts"):
+        catalog_table(str(table_file), str(tmp_path / "t.cat"))
+
+
+def test_translator_loads_through_the_catalog(table_file, tmp_path):
+    path = str(tmp_path / "ar-en.cat")
+    translator = Translator.load(table_file, path)
+    assert os.path.exists(path)
+    assert translator.translate("القسم الطبي - تواصل معنا") == "Medical Department - Contact Us"
@@ -0,0 +1,38 @@
+from translation_engine import Translator, normalize_arabic
+
+TABLE = {
+    "القسم الطبي": "Medical Department",
+    "مرحباً بكم في القسم": "Welcome to the Department",
+    "تواصل معنا": "Contact Us",
+}
+
+
+def test_longest_phrase_wins_on_word_boundaries():
+    translator = Translator({"القسم": "Department", **TABLE})
+    assert translator.translate("القسم الطبي") == "Medical Department"
+    assert translator.translate("القسم - تواصل معنا") == "Department - Contact Us"
+
+
+def test_partial_page_translations_are_reported_not_written():
+    translator = Translator(TABLE)
+    page = {"titleAr": "مرحباً بكم في القسم الجديد", "blocks": [{"content": {"titleAr": "تواصل معنا"}}]}
+    translator.translate_page(page)
+    assert "titleEn" not in page
+    assert page["blocks"][0]["content"]["titleEn"] == "Contact Us"
+    assert translator.untranslated == {"مرحباً بكم في القسم الجديد"}
+
+
+def test_ts_source_never_gets_mixed_script_literals():
+    translator = Translator(TABLE)
+    source = 'const a = { title: "تواصل معنا", subtitle: "مرحباً بكم في القسم الطبي", id: "x" }'
+    translated = translator.translate_ts_source(source)
+    assert '"Contact Us"' in translated
+    # Only partly covered: left untouched and reported
+    assert '"مرحباً بكم في القسم الطبي"' in translated
+    assert "Welcome to the Department" not in translated
+    assert translator.untranslated == {"مرحباً بكم في القسم الطبي"}
+
+
+def test_normalize_folds_spelling_variants():
+    assert normalize_arabic("مرحباً  بكم") == normalize_arabic("مرحبا بكم")
+    assert normalize_arabic("أهلاً") == normalize_arabic("اهلا")
@@ -0,0 +1,55 @@
+import json
+import os
+
+import pytest
+
+import translation_bundles
+import watch_daemon
+from translation_catalog import catalog_table
+from translation_coverage import CoverageIndex
+
+TABLE_SOURCE = '''translations = {
+    "تواصل معنا": "Contact Us",
+}
+'''
+
+
+@pytest.fixture
+def table_file(tmp_path, monkeypatch):
+    path = tmp_path / "table.py"
+    path.write_text(TABLE_SOURCE, encoding="utf-8")
+    # Keep the compiled catalog and the coverage index out of the repo's build directory
+    catalog = str(tmp_path / "table.cat")
+    for module in (watch_daemon, translation_bundles):
+        monkeypatch.setattr(module, "catalog_table", lambda table: catalog_table(table, catalog))
+    monkeypatch.setattr(watch_daemon, "CoverageIndex", lambda: CoverageIndex(str(tmp_path / "coverage.json")))
+    return str(path)
+
+
+def _index(directory):
+    with open(os.path.join(directory, translation_bundles.INDEX_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_translation_rebuilds_keep_the_bundle_index_current(table_file, tmp_path):
+    bundles = str(tmp_path / "bundles")
+    target = watch_daemon.TranslationTarget(table_file, bundles)
+    first = _index(bundles)
+    assert first["keys"] and first["chunks"]
+
+    with open(table_file, "w", encoding="utf-8") as f:
+        f.write(TABLE_SOURCE.replace('"Contact Us",', '"Contact Us",\n    "القسم الطبي": "Medical Department",'))
+    os.utime(table_file, ns=(os.stat(table_file).st_mtime_ns + 10**9,) * 2)
+    notes = target.rebuild({target.table_file})
+    assert "1 bundle chunks rewritten" in notes
+
+    index = _index(bundles)
+    assert index["keys"] == first["keys"]
+    assert index["chunks"]["en/blocks.js"]["bytes"] > first["chunks"]["en/blocks.js"]["bytes"]
+    for name, sizes in index["chunks"].items():
+        assert os.path.getsize(os.path.join(bundles, name)) == sizes["bytes"]
+
+    # The one-off CLI writes the same bundles and index
+    cli = str(tmp_path / "cli")
+    assert translation_bundles.main(["--table", table_file, "--out", cli]) == 0
+    assert _index(cli) == index
@@ -0,0 +1,289 @@
+"""
+Per-locale, per-area translation bundles.
+
+lib/translations.ts ships every locale and every page area to every visitor,
+and the Arabic→English pairs of template-translations.py live apart from it.
+This generator merges both and splits them into lazy-loadable ES modules:
+
+    <out>/<locale>/public.js       nav, hero, about, … (one named export per section)
+    <out>/<locale>/dashboard.js    dashboard, login
+    <out>/en/blocks.js             block-template strings, keyed by their Arabic source
+    <out>/index.json               areas, chunk files and sizes, and the key-id index
+
+Sections keep the shape of lib/translations.ts, so `t.nav.home` works on the
+loaded chunk unchanged, and named exports let bundlers drop the sections a
+page never imports. The key-id index lists every flattened key
+("nav.home", "employment.jobs.0.title") once, with the area that holds it. A
+key's id is its position; ids carry over between runs, new keys are appended
+and removed keys leave a null, so ids never shift.
+
+While merging, `en` strings missing from lib/translations.ts are filled from
+the table (matching the `ar` string after normalize_arabic), and keys present
+in one locale only or translated differently by the table are reported.
+Each run prints chunk sizes against the monolithic module and the last run.
+
+Usage:
+    python scripts/translation_bundles.py
+    python scripts/translation_bundles.py --out lib/i18n --check
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+
+from translation_catalog import CatalogError, catalog_table
+from translation_engine import TABLE_FILE, has_arabic, normalize_arabic
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRANSLATIONS_FILE = os.path.join(REPO_ROOT, "lib", "translations.ts")
+BUNDLES_DIR = os.path.join(REPO_ROOT, "build", "i18n")
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+SOURCE_LOCALE = "ar"
+AREAS = ("public", "dashboard", "blocks")
+# Sections of lib/translations.ts only the staff dashboard uses; the rest render on public pages
+SECTION_AREAS = {"dashboard": "dashboard", "login": "dashboard"}
+BLOCKS_EXPORT = "templates"
+IDENTIFIER_RE = re.compile(r"^[A-Za-z_$][A-Za-z0-9_$]*$")
+TOKEN_RE = re.compile(r'\s+|//[^\n]*|/\*.*?\*/|"(?:[^"\\\n]|\\.)*"|[A-Za-z_$][A-Za-z0-9_$]*|-?\d+(?:\.\d+)?|\S', re.S)
+
+
+class TranslationsParseError(ValueError):
+    pass
+
+
+def _tokens(source):
+    for match in TOKEN_RE.finditer(source):
+        token = match.group()
+        if not token.isspace() and not token.startswith(("//", "/*")):
+            yield token
+
+
+def _parse_value(tokens, index):
+    token = tokens[index]
+    if token == "{":
+        value = {}
+        index += 1
+        while tokens[index] != "}":
+            key = tokens[index]
+            key = json.loads(key) if key.startswith('"') else key
+            if tokens[index + 1] != ":":
+                raise TranslationsParseError(f"expected ':' after {key!r}")
+            value[key], index = _parse_value(tokens, index + 2)
+            if tokens[index] == ",":
+                index += 1
+        return value, index + 1
+    if token == "[":
+        value = []
+        index += 1
+        while tokens[index] != "]":
+            item, index = _parse_value(tokens, index)
+            value.append(item)
+            if tokens[index] == ",":
+                index += 1
+        return value, index + 1
+    if token.startswith('"'):
+        return json.loads(token), index + 1
+    raise TranslationsParseError(f"unsupported value {token!r}")
+
+
+def parse_translations(source):
+    """The `translations` object literal of lib/translations.ts as {locale: {section: value}}."""
+    tokens = list(_tokens(source))
+    for index in range(len(tokens) - 3):
+        if tokens[index:index + 3] == ["const", "translations", "="]:
+            return _parse_value(tokens, index + 3)[0]
+    raise TranslationsParseError("no `export const translations = {…}` found")
+
+
+def flatten(value, prefix=""):
+    """Yield (dotted key, string) for every string of a nested section."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from flatten(item, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from flatten(item, f"{prefix}.{index}")
+    else:
+        yield prefix, value
+
+
+def _set_path(target, key, value):
+    *parents, last = key.split(".")
+    for part in parents:
+        target = target[int(part)] if isinstance(target, list) else target[part]
+    if isinstance(target, list):
+        target[int(last)] = value
+    else:
+        target[last] = value
+
+
+def merge_sources(translations, table):
+    """Fill missing/untranslated `en` strings from the table; returns (merged, report)."""
+    normalized = {normalize_arabic(source): target for source, target in table.items()}
+    merged = json.loads(json.dumps(translations))
+    source_strings = dict(flatten(merged.get(SOURCE_LOCALE, {})))
+    report = {"filled": [], "missing": {}, "conflicts": []}
+    for locale, sections in merged.items():
+        if locale == SOURCE_LOCALE:
+            continue
+        strings = dict(flatten(sections))
+        report["missing"][locale] = sorted(set(source_strings) - set(strings))
+        for key, text in source_strings.items():
+            target = normalized.get(normalize_arabic(text)) if isinstance(text, str) else None
+            if target is None:
+                continue
+            current = strings.get(key)
+            if current is None:
+                # The key is absent from this locale; only whole keys under existing parents can be filled
+                try:
+                    _set_path(sections, key, target)
+                except (KeyError, IndexError):
+                    continue
+                report["filled"].append(f"{locale}.{key}")
+            elif isinstance(current, str) and has_arabic(current):
+                _set_path(sections, key, target)
+                report["filled"].append(f"{locale}.{key}")
+            elif current != target:
+                report["conflicts"].append((f"{locale}.{key}", current, target))
+        for key in sorted(set(strings) - set(source_strings)):
+            report["missing"].setdefault(SOURCE_LOCALE, []).append(key)
+    return merged, report
+
+
+def render_module(exports):
+    """An ES module with one `export const` per entry, so unused sections can be tree-shaken."""
+    lines = ["// Generated by scripts/translation_bundles.py from lib/translations.ts and the translations table.\n"]
+    for name, value in exports.items():
+        if not IDENTIFIER_RE.match(name):
+            raise TranslationsParseError(f"section {name!r} is not a valid export name")
+        lines.append(f"export const {name} = {json.dumps(value, ensure_ascii=False, separators=(',', ':'))}\n")
+    return "".join(lines).encode("utf-8")
+
+
+def assign_key_ids(keys, previous_index=None):
+    """Key-id index as a list of [key, area] (or null for a removed key), ids taken from the last run."""
+    entries = [
+        [key, keys[key]] if key in keys else None
+        for key, _ in (entry or (None, None) for entry in (previous_index or []))
+    ]
+    known = {entry[0] for entry in entries if entry}
+    entries.extend([key, area] for key, area in sorted(keys.items()) if key not in known)
+    return entries
+
+
+def build_bundles(translations, table):
+    """Return ({(locale, area): module bytes}, {key: area number}, merge report)."""
+    merged, report = merge_sources(translations, table)
+    chunks = {}
+    for locale, sections in merged.items():
+        for area in AREAS[:-1]:
+            exports = {name: value for name, value in sections.items() if SECTION_AREAS.get(name, "public") == area}
+            if exports:
+                chunks[(locale, area)] = render_module(exports)
+    # Block templates are written in Arabic; only the other locales need a lookup table
+    for locale in merged:
+        if locale != SOURCE_LOCALE:
+            chunks[(locale, "blocks")] = render_module({BLOCKS_EXPORT: dict(sorted(table.items()))})
+
+    keys = {}
+    for locale, sections in merged.items():
+        for name, value in sections.items():
+            area = SECTION_AREAS.get(name, "public")
+            for key, _ in flatten(value, name):
+                keys.setdefault(key, AREAS.index(area))
+    return chunks, keys, report
+
+
+def bundle_sizes(data):
+    return {"bytes": len(data), "gzipBytes": len(gzip.compress(data, mtime=0))}
+
+
+def _delta(current, previous):
+    if previous is None:
+        return ""
+    change = current - previous
+    return f" ({'+' if change >= 0 else ''}{change:,} since last run)"
+
+
+def write_bundles(chunks, keys, out_dir, baseline, unchanged=None):
+    """Write the chunks and index; returns (index, previous index or None).
+
+    `unchanged` maps (locale, area) to the bytes already on disk from an
+    earlier call, and those chunks are not rewritten.
+    """
+    unchanged = unchanged or {}
+    index_path = os.path.join(out_dir, INDEX_FILE)
+    previous = None
+    if os.path.exists(index_path):
+        with open(index_path, encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous.get("version") != INDEX_VERSION:
+            previous = None
+    key_index = assign_key_ids(keys, (previous or {}).get("keys"))
+    index = {"version": INDEX_VERSION, "areas": list(AREAS), "baseline": baseline, "chunks": {}, "keys": key_index}
+    for (locale, area), data in sorted(chunks.items()):
+        name = f"{locale}/{area}.js"
+        if unchanged.get((locale, area)) != data:
+            os.makedirs(os.path.join(out_dir, locale), exist_ok=True)
+            with open(os.path.join(out_dir, name), "wb") as f:
+                f.write(data)
+        index["chunks"][name] = bundle_sizes(data)
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, index_path)
+    return index, previous
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split translations into per-locale, per-area bundles.")
+    parser.add_argument("--translations", default=TRANSLATIONS_FILE, help="lib/translations.ts")
+    parser.add_argument("--table", default=TABLE_FILE)
+    parser.add_argument("--out", default=BUNDLES_DIR, help="output directory for the bundles")
+    parser.add_argument("--check", action="store_true", help="exit non-zero when locales disagree on their keys")
+    args = parser.parse_args(argv)
+
+    with open(args.translations, "rb") as f:
+        source = f.read()
+    try:
+        translations = parse_translations(source.decode("utf-8"))
+    except TranslationsParseError as error:
+        print(f"❌ {args.translations}: {error}")
+        return 1
+    try:
+        table = catalog_table(args.table)
+    except CatalogError as error:
+        print(f"❌ {args.table}: {error}")
+        return 1
+    chunks, keys, report = build_bundles(translations, table)
+    index, previous = write_bundles(chunks, keys, args.out, bundle_sizes(source))
+
+    baseline = index["baseline"]
+    print(f"📦 lib/translations.ts: {baseline['bytes']:,} bytes, {baseline['gzipBytes']:,} gzipped (every locale, every area)")
+    previous_chunks = (previous or {}).get("chunks", {})
+    for name, sizes in index["chunks"].items():
+        before = previous_chunks.get(name, {}).get("gzipBytes")
+        print(f"  {name:<18} {sizes['bytes']:>8,} bytes {sizes['gzipBytes']:>7,} gzipped{_delta(sizes['gzipBytes'], before)}")
+    for locale in sorted({name.split("/")[0] for name in index["chunks"]}):
+        first_load = index["chunks"].get(f"{locale}/public.js")
+        if first_load:
+            saved = baseline["gzipBytes"] - first_load["gzipBytes"]
+            print(f"⚡ Public first load ({locale}): {first_load['gzipBytes']:,} bytes gzipped, {saved:,} less than the monolith")
+    print(f"🔑 {len(keys)} keys in the key-id index")
+    if report["filled"]:
+        print(f"🔁 {len(report['filled'])} strings filled in from the table")
+    for locale, keys in report["missing"].items():
+        if keys:
+            print(f"⚠️  {len(keys)} keys missing from {locale!r}: {', '.join(keys[:5])}{' …' if len(keys) > 5 else ''}")
+    for key, current, target in report["conflicts"][:10]:
+        print(f"⚠️  {key}: {current!r} here, the table says {target!r}")
+    print(f"📁 Bundles saved to: {args.out}")
+    return 1 if args.check and any(report["missing"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Precompiled, memory-mapped translation catalog.
+
+The build step validates the `translations` table of template-translations.py
+and writes a compact binary catalog per locale pair:
+
+    header   magic (8 bytes), entry count (uint32)
+    index    one record per entry, sorted by UTF-8 source bytes:
+             source offset, source length, target offset, target length (uint32 each)
+    blob     the UTF-8 bytes of every source and target string
+
+`Catalog.open()` only maps the file and reads the header, so opening it costs
+the same for ten entries as for ten thousand; lookups binary-search the index
+directly in the mapped pages. The translation tools load the table through
+`open_catalog()`, which recompiles the catalog first when it is missing or
+older than the table.
+
+Usage:
+    python scripts/translation_catalog.py build
+    python scripts/translation_catalog.py lookup "تواصل معنا"
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+
+from translation_engine import TABLE_FILE, load_table_entries
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATALOG_DIR = os.path.join(REPO_ROOT, "build", "translations")
+DEFAULT_LOCALES = "ar-en"
+
+MAGIC = b"TRCAT\x00\x00\x01"
+HEADER = struct.Struct("<8sI")
+RECORD = struct.Struct("<IIII")
+
+
+class CatalogError(ValueError):
+    pass
+
+
+def catalog_path(locales=DEFAULT_LOCALES, catalog_dir=CATALOG_DIR):
+    return os.path.join(catalog_dir, f"{locales}.cat")
+
+
+def table_catalog_path(table_file=TABLE_FILE, catalog_dir=CATALOG_DIR):
+    """The catalog compiled from `table_file`; tables other than the default get their own file."""
+    if os.path.abspath(table_file) == os.path.abspath(TABLE_FILE):
+        return catalog_path(catalog_dir=catalog_dir)
+    digest = hashlib.sha1(os.path.abspath(table_file).encode("utf-8")).hexdigest()[:12]
+    return catalog_path(f"{DEFAULT_LOCALES}-{digest}", catalog_dir)
+
+
+def validate_entries(entries):
+    """Check table entries; returns (table, problems, warnings).
+
+    Conflicting duplicates (same source, different targets) are problems: a
+    dict literal would keep whichever came last without telling anyone.
+    Identical duplicates are only warnings.
+    """
+    table = {}
+    first_line = {}
+    problems = []
+    warnings = []
+    for source, target, line in entries:
+        if not isinstance(source, str) or not isinstance(target, str):
+            problems.append(f"line {line}: source and target must be strings")
+            continue
+        if not source.strip() or not target.strip():
+            problems.append(f"line {line}: empty source or target for {source!r}")
+            continue
+        if source != source.strip() or target != target.strip():
+            warnings.append(f"line {line}: surrounding whitespace in {source!r}")
+        if source in table:
+            if table[source] != target:
+                problems.append(
+                    f"line {line}: {source!r} -> {target!r} conflicts with "
+                    f"{table[source]!r} on line {first_line[source]}"
+                )
+            else:
+                warnings.append(f"line {line}: duplicate of line {first_line[source]} ({source!r})")
+            continue
+        table[source] = target
+        first_line[source] = line
+    return table, problems, warnings
+
+
+def write_catalog(table, path):
+    """Write `table` as a binary catalog, atomically replacing `path`."""
+    entries = sorted((source.encode("utf-8"), target.encode("utf-8")) for source, target in table.items())
+    blob = bytearray()
+    index = bytearray()
+    for source, target in entries:
+        source_offset = len(blob)
+        blob += source
+        target_offset = len(blob)
+        blob += target
+        index += RECORD.pack(source_offset, len(source), target_offset, len(target))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(entries)))
+        f.write(index)
+        f.write(blob)
+    os.replace(tmp_path, path)
+    return HEADER.size + len(index) + len(blob)
+
+
+def build_catalog(table_file=TABLE_FILE, path=None):
+    """Validate the table and write its catalog; raises CatalogError on conflicts."""
+    table, problems, warnings = validate_entries(load_table_entries(table_file))
+    if problems:
+        raise CatalogError("\n".join(problems))
+    path = path or table_catalog_path(table_file)
+    size = write_catalog(table, path)
+    return {"path": path, "entries": len(table), "bytes": size, "warnings": warnings}
+
+
+class Catalog:
+    """Read-only view over a catalog file; keys and values are decoded on demand."""
+
+    def __init__(self, data, count):
+        self._data = data
+        self._count = count
+        self._blob_start = HEADER.size + count * RECORD.size
+
+    @classmethod
+    def open(cls, path=None):
+        path = path or catalog_path()
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise CatalogError(f"{path} is not a translation catalog")
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            data.close()
+            raise CatalogError(f"{path} is not a translation catalog")
+        return cls(data, count)
+
+    def close(self):
+        self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _record(self, position):
+        return RECORD.unpack_from(self._data, HEADER.size + position * RECORD.size)
+
+    def _bytes(self, offset, length):
+        start = self._blob_start + offset
+        return self._data[start:start + length]
+
+    def get(self, source, default=None):
+        key = source.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            source_offset, source_length, target_offset, target_length = self._record(middle)
+            candidate = self._bytes(source_offset, source_length)
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                return self._bytes(target_offset, target_length).decode("utf-8")
+        return default
+
+    def __getitem__(self, source):
+        target = self.get(source)
+        if target is None:
+            raise KeyError(source)
+        return target
+
+    def __contains__(self, source):
+        return self.get(source) is not None
+
+    def items(self):
+        for position in range(self._count):
+            source_offset, source_length, target_offset, target_length = self._record(position)
+            yield (
+                self._bytes(source_offset, source_length).decode("utf-8"),
+                self._bytes(target_offset, target_length).decode("utf-8"),
+            )
+
+    def keys(self):
+        for source, _ in self.items():
+            yield source
+
+
+def is_stale(path, table_file=TABLE_FILE):
+    """True when the catalog is missing or not newer than the table it is compiled from."""
+    try:
+        return os.stat(path).st_mtime_ns <= os.stat(table_file).st_mtime_ns
+    except FileNotFoundError:
+        return True
+
+
+def open_catalog(table_file=TABLE_FILE, path=None):
+    """Open the catalog of `table_file`, recompiling it first when it is stale.
+
+    Raises CatalogError when the table has conflicting entries.
+    """
+    path = path or table_catalog_path(table_file)
+    if is_stale(path, table_file):
+        build_catalog(table_file, path)
+    return Catalog.open(path)
+
+
+def catalog_table(table_file=TABLE_FILE, path=None):
+    """The table as a dict, read through its catalog."""
+    with open_catalog(table_file, path) as catalog:
+        return dict(catalog.items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the binary translation catalog.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="validate the translations table and write the catalog")
+    build.add_argument("--table", default=TABLE_FILE)
+    build.add_argument("--out", default=catalog_path())
+
+    lookup = commands.add_parser("lookup", help="look up source strings in a catalog")
+    lookup.add_argument("strings", nargs="+")
+    lookup.add_argument("--catalog", default=catalog_path())
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        try:
+            result = build_catalog(args.table, args.out)
+        except CatalogError as error:
+            print("❌ Conflicting translations:", file=sys.stderr)
+            print(error, file=sys.stderr)
+            return 1
+        for warning in result["warnings"]:
+            print(f"⚠️  {warning}")
+        print(f"✅ Catalog written to {result['path']}")
+        print(f"🔢 {result['entries']} entries, {result['bytes']:,} bytes")
+        return 0
+
+    with Catalog.open(args.catalog) as catalog:
+        for source in args.strings:
+            print(f"{source} -> {catalog.get(source, '(missing)')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
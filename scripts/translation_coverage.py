@@ -0,0 +1,253 @@
+"""
+Translation coverage of block-templates.ts and exported pages.
+
+Scans TS sources and page JSON/NDJSON for Arabic literals, records where each
+one appears and checks it against the `translations` table after folding
+spelling variants (diacritics, tatweel, alef/yaa forms). Every unique string
+is classified as
+
+    covered   the table translates it completely
+    partial   some phrases are translated but Arabic remains
+    missing   no table phrase applies
+
+and Arabic table keys that no scanned string uses are reported as orphaned.
+
+The index persists in build/translations/coverage.json. Files whose size and
+mtime (or, failing that, content hash) are unchanged are not re-read, and the
+classification is reused outright when neither the sources nor the table
+changed, so a re-scan after a content edit only pays for the edited file.
+
+Usage:
+    python scripts/translation_coverage.py
+    python scripts/translation_coverage.py generated-pages --list missing
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from page_writers import list_page_files
+from translation_catalog import CATALOG_DIR, CatalogError, catalog_table
+from translation_engine import TABLE_FILE, TS_STRING_RE, Translator, has_arabic, normalize_arabic
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BLOCK_TEMPLATES_FILE = os.path.join(REPO_ROOT, "lib", "types", "block-templates.ts")
+COVERAGE_FILE = os.path.join(CATALOG_DIR, "coverage.json")
+INDEX_VERSION = 1
+# Sources whose edits change how strings are extracted or classified
+SCANNER_SOURCES = ("translation_coverage.py", "translation_engine.py")
+STATUSES = ("covered", "partial", "missing")
+
+
+def _display_path(path):
+    path = os.path.abspath(path)
+    return os.path.relpath(path, REPO_ROOT) if path.startswith(REPO_ROOT + os.sep) else path
+
+
+def extract_ts_literals(source, label):
+    """Yield (text, location) for every Arabic string literal of a TS source."""
+    line = 1
+    position = 0
+    for match in TS_STRING_RE.finditer(source):
+        literal = match.group(1)
+        if not has_arabic(literal):
+            continue
+        line += source.count("\n", position, match.start())
+        position = match.start()
+        try:
+            text = json.loads(f'"{literal}"')
+        except ValueError:
+            text = literal
+        yield text, f"{label}:{line}"
+
+
+def extract_page_strings(value, location, path="$"):
+    """Yield (text, location) for every Arabic string in a page tree."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from extract_page_strings(item, location, f"{path}.{key}")
+    elif isinstance(value, list):
+        for i, item in enumerate(value):
+            yield from extract_page_strings(item, location, f"{path}[{i}]")
+    elif isinstance(value, str) and has_arabic(value):
+        yield value, f"{location} {path}"
+
+
+def extract_file(path):
+    """Extract the Arabic strings of one source file as a list of [text, location]."""
+    label = _display_path(path)
+    if path.endswith(".ndjson"):
+        strings = []
+        with open(path, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    strings.extend(extract_page_strings(json.loads(line), f"{label}:{number}"))
+    elif path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            strings = list(extract_page_strings(json.load(f), label))
+    else:
+        with open(path, encoding="utf-8") as f:
+            strings = list(extract_ts_literals(f.read(), label))
+    return [list(item) for item in strings]
+
+
+def expand_sources(paths):
+    """Files to scan: TS files as given, directories expanded to their page JSON/NDJSON."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(list_page_files(path))
+        else:
+            files.append(path)
+    return [os.path.abspath(path) for path in files]
+
+
+def _file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def scanner_fingerprint():
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    return "".join(_file_digest(os.path.join(scripts_dir, name))[:8] for name in SCANNER_SOURCES)
+
+
+def classify(strings_by_file, table):
+    """Group strings by normalized form and check each one against the normalized table."""
+    normalized_table = {}
+    for source, target in table.items():
+        normalized_table.setdefault(normalize_arabic(source), (source, target))
+    translator = Translator({key: target for key, (_, target) in normalized_table.items()})
+
+    entries = {}
+    for strings in strings_by_file:
+        for text, location in strings:
+            key = normalize_arabic(text)
+            entry = entries.get(key)
+            if entry is None:
+                entry = entries[key] = {"text": text, "locations": []}
+            entry["locations"].append(location)
+
+    used = set()
+    for key, entry in entries.items():
+        sources = translator.matched_sources(key)
+        used.update(sources)
+        if not sources:
+            entry["status"] = "missing"
+        elif has_arabic(translator.translate(key)):
+            entry["status"] = "partial"
+        else:
+            entry["status"] = "covered"
+    # Keys without Arabic (phone numbers, figures) never match an extracted string
+    orphaned = sorted(
+        source for key, (source, _) in normalized_table.items() if key not in used and has_arabic(source)
+    )
+    return entries, orphaned
+
+
+class CoverageIndex:
+    def __init__(self, path=COVERAGE_FILE):
+        self.path = path
+        fingerprint = scanner_fingerprint()
+        self.data = {"version": INDEX_VERSION, "scanner": fingerprint, "files": {}, "table": None}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION and data.get("scanner") == fingerprint:
+                self.data = data
+        self.rescanned = []
+        self.dirty = False
+
+    def _refresh(self, path, extract):
+        """Return the cached file entry, re-extracting only when the file really changed."""
+        stat = os.stat(path)
+        entry = self.data["files"].get(path)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+            return entry, False
+        digest = _file_digest(path)
+        if entry and entry["hash"] == digest:
+            entry["mtime"] = stat.st_mtime_ns
+            self.dirty = True
+            return entry, False
+        self.rescanned.append(path)
+        entry = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "hash": digest, "strings": extract(path)}
+        self.data["files"][path] = entry
+        return entry, True
+
+    def update(self, sources, table_path=TABLE_FILE):
+        """Bring the index up to date with `sources` and the table; returns the index data."""
+        self.data["table"] = os.path.abspath(table_path)
+        changed = self._refresh(self.data["table"], lambda path: [])[1]
+        for path in sources:
+            changed = self._refresh(path, extract_file)[1] or changed
+        stale = set(self.data["files"]) - set(sources) - {self.data["table"]}
+        for path in stale:
+            del self.data["files"][path]
+        if changed or stale or "strings" not in self.data:
+            entries, orphaned = classify(
+                (self.data["files"][path]["strings"] for path in sources), catalog_table(table_path)
+            )
+            self.data["strings"] = entries
+            self.data["orphaned"] = orphaned
+            self.data["summary"] = {
+                "strings": sum(len(entry["locations"]) for entry in entries.values()),
+                "unique": len(entries),
+                **{status: sum(1 for entry in entries.values() if entry["status"] == status) for status in STATUSES},
+                "orphaned": len(orphaned),
+            }
+            self.dirty = True
+        if self.dirty:
+            self.save()
+        return self.data
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report which Arabic strings the translation table covers.")
+    parser.add_argument("paths", nargs="*", help="extra TS files, page JSON/NDJSON files or page directories")
+    parser.add_argument("--table", default=TABLE_FILE)
+    parser.add_argument("--no-templates", action="store_true", help="do not scan lib/types/block-templates.ts")
+    parser.add_argument("--index", default=COVERAGE_FILE, help="where the coverage index is kept")
+    parser.add_argument("--list", choices=[*STATUSES, "orphaned"], help="print the strings with this status")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    sources = expand_sources(([] if args.no_templates else [BLOCK_TEMPLATES_FILE]) + args.paths)
+    index = CoverageIndex(args.index)
+    try:
+        data = index.update(sources, args.table)
+    except CatalogError as error:
+        print(f"❌ {args.table}: {error}")
+        return 1
+    seconds = time.perf_counter() - started
+
+    if args.list == "orphaned":
+        for source in data["orphaned"]:
+            print(source)
+    elif args.list:
+        for entry in data["strings"].values():
+            if entry["status"] == args.list:
+                more = f" (+{len(entry['locations']) - 1} more)" if len(entry["locations"]) > 1 else ""
+                print(f"{entry['locations'][0]}{more}: {entry['text']}")
+
+    summary = data["summary"]
+    print(
+        f"📊 {summary['strings']} Arabic strings ({summary['unique']} unique): "
+        f"{summary['covered']} covered, {summary['partial']} partial, {summary['missing']} missing"
+    )
+    print(f"🗑️  {summary['orphaned']} table entries unused by any scanned string")
+    print(f"⏱️  {seconds * 1000:.0f} ms ({len(index.rescanned)} of {len(sources) + 1} files rescanned)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Arabic -> English translation engine built on the `translations` table.
+
+The table is compiled once into a character trie. Each string is then
+translated in a single left-to-right pass: at every word boundary the trie is
+walked as far as the text allows and the longest phrase ending on a word
+boundary wins. Results are memoized per unique source string, since the same
+titles repeat across many blocks and templates.
+"""
+
+import ast
+import json
+import os
+import re
+import unicodedata
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+TABLE_FILE = os.path.join(SCRIPTS_DIR, "template-translations.py")
+
+ARABIC_RE = re.compile("[\u0600-\u06ff\u0750-\u077f\ufb50-\ufdff\ufe70-\ufefe]")
+# Double-quoted TS string literals (block-templates.ts uses no other quote style for text)
+TS_STRING_RE = re.compile(r'"((?:[^"\\\n]|\\.)*)"')
+
+# Harakat, Quranic marks and dagger alef; they vary freely between copies of the same text
+DIACRITICS_RE = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed]")
+TATWEEL = "\u0640"
+# Hamza/madda alef forms and alef maksura are written interchangeably with bare alef and yaa
+LETTER_FORMS = str.maketrans({"\u0623": "\u0627", "\u0625": "\u0627", "\u0622": "\u0627", "\u0671": "\u0627", "\u0649": "\u064a"})
+
+_END = None  # Trie key holding the table key of the phrase ending at a node
+
+
+def load_table_entries(path=TABLE_FILE):
+    """Return the `translations` literal as (source, target, line) tuples, duplicates kept.
+
+    The script is parsed, not executed, so keys that a dict literal would
+    silently collapse are still visible to the catalog build.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and isinstance(node.value, ast.Dict)
+            and any(isinstance(t, ast.Name) and t.id == "translations" for t in node.targets)
+        ):
+            return [
+                (ast.literal_eval(key), ast.literal_eval(value), key.lineno)
+                for key, value in zip(node.value.keys, node.value.values)
+            ]
+    raise ValueError(f"No `translations` table found in {path}")
+
+
+def load_table(path=TABLE_FILE):
+    """Read the `translations` dict literal from a script without executing it."""
+    return {source: target for source, target, _ in load_table_entries(path)}
+
+
+def has_arabic(text):
+    return ARABIC_RE.search(text) is not None
+
+
+def normalize_arabic(text):
+    """Fold spelling variants of Arabic text onto one form for matching (never for display)."""
+    text = DIACRITICS_RE.sub("", text).replace(TATWEEL, "").translate(LETTER_FORMS)
+    return " ".join(text.split())
+
+
+def _is_word_char(char):
+    # Arabic diacritics are combining marks, not alnum, but still part of the word
+    return char.isalnum() or char == "_" or unicodedata.category(char) == "Mn"
+
+
+class Translator:
+    def __init__(self, table):
+        self.table = dict(table)
+        self._trie = {}
+        for source in self.table:
+            node = self._trie
+            for char in source:
+                node = node.setdefault(char, {})
+            node[_END] = source
+        self._cache = {}
+        # Source strings that still contain Arabic after translation
+        self.untranslated = set()
+
+    @classmethod
+    def load(cls, table_file=TABLE_FILE, catalog=None):
+        """A translator over the compiled catalog of `table_file`, recompiled when stale."""
+        # translation_catalog imports this module for the table parser
+        from translation_catalog import open_catalog
+
+        with open_catalog(table_file, catalog) as compiled:
+            return cls(compiled.items())
+
+    def translate(self, text):
+        result = self._cache.get(text)
+        if result is None:
+            result = self._cache[text] = self._translate(text)
+        return result
+
+    def _matches(self, text):
+        """Yield (start, end, source) for the longest table phrase at each word boundary."""
+        i = 0
+        n = len(text)
+        while i < n:
+            if i == 0 or not _is_word_char(text[i - 1]):
+                node = self._trie
+                j = i
+                match_end = match = None
+                while j < n:
+                    node = node.get(text[j])
+                    if node is None:
+                        break
+                    j += 1
+                    if _END in node and (j == n or not _is_word_char(text[j])):
+                        match_end, match = j, node[_END]
+                if match is not None:
+                    yield i, match_end, match
+                    i = match_end
+                    continue
+            i += 1
+
+    def _translate(self, text):
+        exact = self.table.get(text)
+        if exact is not None:
+            return exact
+
+        parts = []
+        copied = 0
+        for start, end, source in self._matches(text):
+            parts.append(text[copied:start])
+            parts.append(self.table[source])
+            copied = end
+        if not parts:
+            return text
+        parts.append(text[copied:])
+        return "".join(parts)
+
+    def matched_sources(self, text):
+        """The table keys a translation of `text` would use."""
+        if text in self.table:
+            return [text]
+        return [source for _, _, source in self._matches(text)]
+
+    def translate_page(self, value, overwrite=False):
+        """Fill `<field>En` from every `<field>Ar` string in a page/block tree, in place.
+
+        Strings the table does not fully cover are left for a human translator
+        and recorded in `untranslated` instead of producing mixed-script text.
+        """
+        if isinstance(value, dict):
+            for key in list(value):
+                item = value[key]
+                if isinstance(item, str):
+                    if len(key) > 2 and key.endswith("Ar") and has_arabic(item):
+                        target = key[:-2] + "En"
+                        if overwrite or not value.get(target):
+                            translated = self.translate(item)
+                            if has_arabic(translated):
+                                self.untranslated.add(item)
+                            else:
+                                value[target] = translated
+                else:
+                    self.translate_page(item, overwrite)
+        elif isinstance(value, list):
+            for item in value:
+                self.translate_page(item, overwrite)
+        return value
+
+    def translate_ts_source(self, source):
+        """Translate every Arabic string literal of a TS source file in one pass.
+
+        As in translate_page, literals the table does not fully cover are left
+        as they are and recorded in `untranslated`.
+        """
+
+        def replace(match):
+            literal = match.group(1)
+            if not has_arabic(literal):
+                return match.group(0)
+            try:
+                text = json.loads(f'"{literal}"')
+            except ValueError:
+                text = literal
+            translated = self.translate(text)
+            if has_arabic(translated):
+                self.untranslated.add(text)
+                return match.group(0)
+            return json.dumps(translated, ensure_ascii=False)
+
+        return TS_STRING_RE.sub(replace, source)
+
+    def cache_info(self):
+        return {"entries": len(self.table), "cachedStrings": len(self._cache)}
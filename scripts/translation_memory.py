@@ -0,0 +1,205 @@
+"""
+Translation-memory suggestions for untranslated Arabic strings.
+
+Every Arabic key of the `translations` table is reduced to its set of
+character trigrams (after normalize_arabic) and a MinHash signature of that
+set. Signatures are split into bands and indexed with locality-sensitive
+hashing, so a lookup only scores the handful of keys that share a band with
+the query instead of the whole table. Candidates are ranked by the exact
+Jaccard similarity of their trigram sets.
+
+Signatures are cached in build/translations, keyed by a hash of the table,
+so they are only recomputed when the table changes.
+
+Usage:
+    python scripts/translation_memory.py suggest "سنوات من الخبرة"
+    python scripts/translation_memory.py pages generated-pages --out suggestions.json
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import struct
+import sys
+import time
+from collections import defaultdict
+
+from translation_catalog import CATALOG_DIR, CatalogError, catalog_table
+from translation_coverage import expand_sources, extract_file
+from translation_engine import TABLE_FILE, Translator, has_arabic, normalize_arabic
+
+NGRAM = 3
+# 20 bands of 3 rows: a pair with trigram Jaccard 0.5 shares a band 93% of the
+# time, one at 0.2 only 15%, which keeps candidate lists short on large tables
+BANDS = 20
+ROWS = 3
+HASHES = BANDS * ROWS
+HASH_ROW = struct.Struct(f"<{HASHES}I")
+DEFAULT_TOP_K = 3
+MIN_SCORE = 0.2
+INDEX_VERSION = 1
+
+_gram_hashes = {}
+
+
+def ngrams(text):
+    """Character trigrams of the normalized text, padded so word edges count."""
+    text = f" {normalize_arabic(text)} "
+    return frozenset(text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1))
+
+
+def _hash_row(gram):
+    """HASHES independent 32-bit hashes of one trigram, memoized since trigrams repeat."""
+    row = _gram_hashes.get(gram)
+    if row is None:
+        row = _gram_hashes[gram] = HASH_ROW.unpack(hashlib.shake_128(gram.encode("utf-8")).digest(HASH_ROW.size))
+    return row
+
+
+def minhash(grams):
+    # Column-wise minimum over the rows: one min-hash per hash function, computed in C
+    return tuple(map(min, zip(*map(_hash_row, grams or [""]))))
+
+
+def band_keys(signature):
+    return [(band, signature[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+
+def jaccard(left, right):
+    if not left or not right:
+        return 0.0
+    shared = len(left & right)
+    return shared / (len(left) + len(right) - shared)
+
+
+class TranslationMemory:
+    def __init__(self, sources, targets, signatures):
+        self.sources = sources
+        self.targets = targets
+        # Trigram sets are cheap to recompute; only the signatures are worth caching
+        self.grams = [ngrams(source) for source in sources]
+        self.signatures = signatures
+        buckets = defaultdict(list)
+        for entry, signature in enumerate(signatures):
+            for key in band_keys(signature):
+                buckets[key].append(entry)
+        self.buckets = dict(buckets)
+
+    @classmethod
+    def from_table(cls, table):
+        entries = [(source, target) for source, target in table.items() if has_arabic(source)]
+        sources = [source for source, _ in entries]
+        return cls(sources, [target for _, target in entries], [minhash(ngrams(source)) for source in sources])
+
+    def __len__(self):
+        return len(self.sources)
+
+    def suggest(self, text, k=DEFAULT_TOP_K, min_score=MIN_SCORE):
+        """Return up to `k` (source, target, score) matches, best first."""
+        grams = ngrams(text)
+        candidates = set()
+        for key in band_keys(minhash(grams)):
+            candidates.update(self.buckets.get(key, ()))
+        best = heapq.nsmallest(
+            k,
+            ((-jaccard(grams, self.grams[entry]), self.sources[entry], entry) for entry in candidates),
+        )
+        return [
+            (source, self.targets[entry], round(-score, 3))
+            for score, source, entry in best
+            if -score >= min_score
+        ]
+
+    def suggest_many(self, texts, k=DEFAULT_TOP_K, min_score=MIN_SCORE):
+        """Suggestions for every unique text; returns {text: [(source, target, score)]}."""
+        return {text: self.suggest(text, k, min_score) for text in dict.fromkeys(texts)}
+
+
+def memory_path(table_path=TABLE_FILE, cache_dir=CATALOG_DIR):
+    with open(table_path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:12]
+    return os.path.join(cache_dir, f"memory-{INDEX_VERSION}-{digest}.json")
+
+
+def load_memory(table_path=TABLE_FILE, cache_dir=CATALOG_DIR):
+    """Load the cached index for the table, building and caching it when the table changed."""
+    path = memory_path(table_path, cache_dir)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return TranslationMemory(data["sources"], data["targets"], [tuple(s) for s in data["signatures"]])
+    memory = TranslationMemory.from_table(catalog_table(table_path))
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"sources": memory.sources, "targets": memory.targets, "signatures": memory.signatures},
+            f,
+            ensure_ascii=False,
+        )
+    os.replace(tmp_path, path)
+    return memory
+
+
+def untranslated_strings(paths, table_path=TABLE_FILE):
+    """Arabic strings of page exports that the table does not fully translate."""
+    translator = Translator.load(table_path)
+    for path in expand_sources(paths):
+        for text, _ in extract_file(path):
+            if has_arabic(translator.translate(text)):
+                yield text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suggest translations for Arabic strings from the table.")
+    parser.add_argument("--table", default=TABLE_FILE)
+    parser.add_argument("-k", type=int, default=DEFAULT_TOP_K, help="suggestions per string")
+    parser.add_argument("--min-score", type=float, default=MIN_SCORE, help="minimum trigram Jaccard similarity")
+    commands = parser.add_subparsers(dest="command", required=True)
+    suggest = commands.add_parser("suggest", help="suggest translations for the given strings")
+    suggest.add_argument("strings", nargs="+")
+    pages = commands.add_parser("pages", help="suggest translations for every untranslated string of page exports")
+    pages.add_argument("paths", nargs="+", help="page JSON/NDJSON files or directories, or TS sources")
+    pages.add_argument("--out", help="write the suggestions as JSON instead of printing them")
+    args = parser.parse_args(argv)
+
+    try:
+        memory = load_memory(args.table)
+        texts = args.strings if args.command == "suggest" else list(untranslated_strings(args.paths, args.table))
+    except CatalogError as error:
+        print(f"❌ {args.table}: {error}")
+        return 1
+    started = time.perf_counter()
+    suggestions = memory.suggest_many(texts, args.k, args.min_score)
+    seconds = time.perf_counter() - started
+
+    if args.command == "pages" and args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    text: [{"source": source, "target": target, "score": score} for source, target, score in matches]
+                    for text, matches in suggestions.items()
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        print(f"📁 Suggestions saved to: {args.out}")
+    else:
+        for text, matches in suggestions.items():
+            print(text)
+            for source, target, score in matches:
+                print(f"   {score:.2f}  {source} → {target}")
+            if not matches:
+                print("   (no similar entries)")
+
+    matched = sum(1 for matches in suggestions.values() if matches)
+    per_lookup = seconds / len(suggestions) * 1000 if suggestions else 0
+    print(f"🔎 {matched} of {len(suggestions)} strings matched {len(memory)} entries ({per_lookup:.3f} ms per lookup)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
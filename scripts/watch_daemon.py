@@ -0,0 +1,412 @@
+"""
+Watch mode: rebuild templates and translations as their sources are saved.
+
+A long-running process that watches the content scripts, the translations
+table, lib/translations.ts and lib/types/block-templates.ts (inotify on
+Linux, mtime polling elsewhere) and keeps everything it parsed warm in
+memory: the imported recipe modules, the page spec, the input of every page,
+the build cache, the table and the coverage index. Bursts of saves are
+debounced into one rebuild, and each rebuild redoes only what the change
+affects:
+
+    page_blocks.py            pages whose recipe uses a block whose output changed
+    page_generator.py, …      every page (the build itself changed)
+    the spec                  pages whose spec entry was added, edited or removed
+    create-home-page-…py      the home template
+    template-translations.py  catalog, translation bundles, coverage, --ts-out
+    lib/translations.ts       translation bundles
+    block-templates.ts        coverage, --ts-out
+
+Pages whose rebuilt content is unchanged are not rewritten. The build cache
+is written back on exit, so the next one-off build stays incremental.
+
+Usage:
+    python scripts/watch_daemon.py --spec pages-spec.json --out generated-pages
+    python scripts/watch_daemon.py --home-output home-page-template.json --ts-out lib/types/block-templates.en.ts
+"""
+
+import argparse
+import contextlib
+import ctypes
+import ctypes.util
+import importlib
+import importlib.util
+import inspect
+import io
+import os
+import select
+import struct
+import sys
+import time
+from datetime import datetime
+
+import build_cache
+import page_blocks
+import page_generator
+import page_writers
+import style_presets
+from translation_bundles import BUNDLES_DIR, TRANSLATIONS_FILE, build_bundles, bundle_sizes, parse_translations, write_bundles
+from translation_catalog import CatalogError, catalog_table
+from translation_coverage import BLOCK_TEMPLATES_FILE, CoverageIndex, expand_sources
+from translation_engine import TABLE_FILE, Translator
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+HOME_SCRIPT = os.path.join(SCRIPTS_DIR, "create-home-page-template.py")
+# Reloaded in this order, so each module picks up the fresh version of the ones it imports
+RECIPE_MODULES = (page_writers, page_blocks, style_presets, build_cache, page_generator)
+DEBOUNCE_SECONDS = 0.02
+POLL_SECONDS = 0.05
+
+# inotify(7) event masks
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MODIFY
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """Directory watches through libc's inotify; editors that save by rename are still seen."""
+
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.paths = set(paths)
+        self._directories = {}
+        for directory in sorted({os.path.dirname(path) for path in self.paths}):
+            descriptor = libc.inotify_add_watch(self._fd, directory.encode(), WATCH_MASK)
+            if descriptor < 0:
+                raise OSError(ctypes.get_errno(), f"cannot watch {directory}")
+            self._directories[descriptor] = directory
+
+    def read(self, timeout):
+        """Watched paths changed within `timeout` seconds (empty on timeout)."""
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return set()
+        data = os.read(self._fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            descriptor, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0").decode()
+            offset += EVENT_HEADER.size + length
+            path = os.path.join(self._directories.get(descriptor, ""), name)
+            if path in self.paths:
+                changed.add(path)
+        return changed
+
+
+class PollingWatcher:
+    """Fallback for platforms without inotify: compares mtimes every POLL_SECONDS."""
+
+    def __init__(self, paths):
+        self.paths = set(paths)
+        self._mtimes = {path: self._mtime(path) for path in self.paths}
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def read(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                mtime = self._mtime(path)
+                if mtime != self._mtimes[path]:
+                    self._mtimes[path] = mtime
+                    changed.add(path)
+            if changed or time.monotonic() >= deadline:
+                return changed
+            time.sleep(min(POLL_SECONDS, max(0.0, deadline - time.monotonic())))
+
+
+def make_watcher(paths):
+    try:
+        return InotifyWatcher(paths)
+    except (OSError, AttributeError):
+        return PollingWatcher(paths)
+
+
+def _module_path(module):
+    return os.path.abspath(module.__file__)
+
+
+def recipe_hashes():
+    """Hash of every block recipe: its default output plus the code that applies overrides."""
+    shared = inspect.getsource(page_blocks.build_block)
+    return {
+        name: build_cache.content_hash([page_blocks.build_block(name, 0), inspect.getsource(recipe), shared])
+        for name, recipe in page_blocks.BLOCK_RECIPES.items()
+    }
+
+
+def reload_recipes(changed_files):
+    """Re-import the build modules if any of them changed; returns the changed module files."""
+    changed = changed_files & {_module_path(module) for module in RECIPE_MODULES}
+    if changed:
+        for module in RECIPE_MODULES:
+            importlib.reload(module)
+    return changed
+
+
+class PageTarget:
+    """Warm state of a --spec build: every page's inputs, rebuilt selectively."""
+
+    def __init__(self, spec_file, out_dir, fmt="pretty", codecs=()):
+        self.spec_file = os.path.abspath(spec_file)
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.codecs = tuple(codecs)
+        stats = page_generator.generate(page_generator.load_spec(self.spec_file), out_dir, fmt=fmt, codecs=codecs)
+        self.cache = build_cache.BuildCache(out_dir, self._fingerprint())
+        self.spec = None
+        self.entries = {}
+        self.recipes = recipe_hashes()
+        self._load_spec()
+        self.initial = stats
+
+    def _fingerprint(self):
+        return build_cache.recipes_fingerprint([None, self.fmt, sorted(self.codecs)])
+
+    def watched_files(self):
+        files = {self.spec_file}
+        if isinstance(self.spec.get("pages"), str):
+            files.add(os.path.abspath(self.spec["pages"]))
+        return files
+
+    def _load_spec(self):
+        """Read the spec; returns the keys of pages that are new, edited or gone."""
+        self.spec = page_generator.load_spec(self.spec_file)
+        timestamp = datetime.now().isoformat()
+        entries = {}
+        for task in page_generator.iter_tasks(self.spec, timestamp):
+            key = page_generator.page_id(task.page["slug"], task.language)
+            entries[key] = (build_cache.content_hash([task.page, task.recipe, task.language]), task)
+        changed = {key for key, (digest, _) in entries.items() if self.entries.get(key, (None,))[0] != digest}
+        removed = set(self.entries) - set(entries)
+        self.entries = entries
+        return changed, removed
+
+    def rebuild(self, changed_files):
+        """Re-render the pages affected by `changed_files`; returns (rebuilt, written, removed)."""
+        changed_modules = changed_files & {_module_path(module) for module in RECIPE_MODULES}
+        affected = set()
+        removed = set()
+        if changed_modules:
+            if changed_modules - {_module_path(page_blocks)}:
+                affected.update(self.entries)
+            else:
+                recipes = recipe_hashes()
+                names = {name for name in recipes.keys() | self.recipes.keys() if recipes.get(name) != self.recipes.get(name)}
+                self.recipes = recipes
+                affected.update(key for key, (_, task) in self.entries.items() if names & set(task.recipe))
+        if changed_files & self.watched_files():
+            changed, removed = self._load_spec()
+            affected.update(changed)
+
+        written = 0
+        timestamp = datetime.now().isoformat()
+        for key in sorted(affected):
+            _, task = self.entries[key]
+            task = task._replace(timestamp=timestamp, previous=self.cache.previous(key))
+            rendered = page_generator.render_page(task, fmt=self.fmt, codecs=self.codecs)
+            if self.cache.record(
+                rendered.id, rendered.filename, None, rendered.hash, rendered.block_hashes,
+                rendered.created_at, rendered.updated_at, rendered.output_hash, rendered.variants,
+            ):
+                page_writers.write_file(os.path.join(self.out_dir, rendered.filename), rendered.text.encode("utf-8"), rendered.variants)
+                written += 1
+        for key in removed:
+            entry = self.cache.entries.pop(key, None)
+            if entry:
+                page_writers.remove_file(os.path.join(self.out_dir, entry["file"]))
+        return len(affected), written, len(removed)
+
+    def save(self):
+        """Write the build cache back with input hashes for the current sources."""
+        self.cache.fingerprint = self._fingerprint()
+        for key, (_, task) in self.entries.items():
+            if key in self.cache.entries:
+                self.cache.entries[key]["input"] = self.cache.input_hash(task.page, task.recipe, task.language)
+        self.cache.seen = set(self.entries)
+        self.cache.save()
+
+
+class HomeTarget:
+    """The single home template written by create-home-page-template.py."""
+
+    def __init__(self, output):
+        self.output = output
+        self.recipes = recipe_hashes()
+        self._emit()
+
+    def _emit(self):
+        module_spec = importlib.util.spec_from_file_location("create_home_page_template", HOME_SCRIPT)
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+        with contextlib.redirect_stdout(io.StringIO()):
+            module.write_home_template(self.output)
+
+    def rebuild(self, changed_files):
+        recipes = recipe_hashes()
+        home_changed = any(recipes.get(name) != self.recipes.get(name) for name in page_blocks.HOME_RECIPE)
+        self.recipes = recipes
+        build_changed = changed_files & {_module_path(module) for module in RECIPE_MODULES if module is not page_blocks}
+        if HOME_SCRIPT in changed_files or home_changed or build_changed:
+            self._emit()
+            return True
+        return False
+
+
+class TranslationTarget:
+    """Catalog, bundles, coverage and the translated TS file, driven by the table."""
+
+    def __init__(self, table_file, bundles_dir, ts_out=None):
+        self.table_file = os.path.abspath(table_file)
+        self.bundles_dir = bundles_dir
+        self.ts_out = ts_out
+        self.table = {}
+        self.coverage = CoverageIndex()
+        self.chunks = {}
+        self.rebuild({self.table_file, TRANSLATIONS_FILE, BLOCK_TEMPLATES_FILE}, initial=True)
+
+    def rebuild(self, changed_files, initial=False):
+        """Returns a list of short notes on what was re-emitted."""
+        notes = []
+        table_changed = self.table_file in changed_files
+        if table_changed:
+            try:
+                # Recompiles the catalog, which the edit just made stale
+                table = catalog_table(self.table_file)
+            except CatalogError as error:
+                if initial:
+                    raise
+                # Keep building from the last table that compiled
+                notes.append(f"catalog not rebuilt: {error}")
+                table = self.table
+            if not initial:
+                edited = {key for key in table.keys() | self.table.keys() if table.get(key) != self.table.get(key)}
+                notes.append(f"{len(edited)} table strings changed")
+            self.table = table
+        if table_changed or TRANSLATIONS_FILE in changed_files:
+            with open(TRANSLATIONS_FILE, "rb") as f:
+                source = f.read()
+            chunks, keys, _ = build_bundles(parse_translations(source.decode("utf-8")), self.table)
+            # Same write path as translation_bundles.py, so index.json keeps its key ids and sizes in step
+            write_bundles(chunks, keys, self.bundles_dir, bundle_sizes(source), unchanged=self.chunks)
+            written = sum(self.chunks.get(chunk) != data for chunk, data in chunks.items())
+            self.chunks = chunks
+            notes.append(f"{written} bundle chunks rewritten")
+        if table_changed or BLOCK_TEMPLATES_FILE in changed_files:
+            summary = self.coverage.update(expand_sources([BLOCK_TEMPLATES_FILE]), self.table_file)["summary"]
+            notes.append(f"coverage {summary['covered']} covered, {summary['partial']} partial, {summary['missing']} missing")
+            if self.ts_out:
+                with open(BLOCK_TEMPLATES_FILE, encoding="utf-8") as f:
+                    source = f.read()
+                with open(self.ts_out, "w", encoding="utf-8") as f:
+                    f.write(Translator(self.table).translate_ts_source(source))
+                notes.append(f"{os.path.basename(self.ts_out)} rewritten")
+        return notes
+
+    def watched_files(self):
+        return {self.table_file, TRANSLATIONS_FILE, BLOCK_TEMPLATES_FILE}
+
+
+def _saved_at(paths):
+    """Latest mtime of the changed files, to time the turnaround from the save itself."""
+    mtimes = [os.stat(path).st_mtime for path in paths if os.path.exists(path)]
+    return max(mtimes) if mtimes else time.time()
+
+
+def run(targets, watcher):
+    """Debounce change bursts and hand them to every target until interrupted.
+
+    A failing rebuild (typically a half-written script that does not import)
+    is reported and the daemon keeps the state of the last good build.
+    """
+    while True:
+        changed = watcher.read(timeout=3600)
+        if not changed:
+            continue
+        # Editors often write a file several times per save; wait until they go quiet
+        while more := watcher.read(DEBOUNCE_SECONDS):
+            changed |= more
+        saved_at = _saved_at(changed)
+        names = ", ".join(sorted(os.path.basename(path) for path in changed))
+        notes = []
+        try:
+            reload_recipes(changed)
+            for target in targets:
+                if isinstance(target, PageTarget):
+                    rebuilt, written, removed = target.rebuild(changed)
+                    if rebuilt or removed:
+                        notes.append(f"{rebuilt} pages rebuilt, {written} written, {removed} removed")
+                elif isinstance(target, HomeTarget):
+                    if target.rebuild(changed):
+                        notes.append("home template re-emitted")
+                else:
+                    notes.extend(target.rebuild(changed))
+        except Exception as error:
+            print(f"❌ {names}: {type(error).__name__}: {error}")
+            continue
+        elapsed = (time.time() - saved_at) * 1000
+        print(f"♻️  {names}: {'; '.join(notes) or 'nothing affected'} ({elapsed:.0f} ms after save)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild templates and translations whenever their sources change.")
+    parser.add_argument("--spec", help="page spec to keep built (see page_generator.py)")
+    parser.add_argument("--out", default="generated-pages", help="output directory for --spec pages")
+    parser.add_argument("--format", choices=("pretty", "compact"), default="pretty", help="page file format")
+    parser.add_argument("--compress", action="append", choices=page_writers.CODECS, default=[], help="also write .gz/.br variants")
+    parser.add_argument("--home-output", help="also keep the single home template up to date at this path")
+    parser.add_argument("--table", default=TABLE_FILE)
+    parser.add_argument("--bundles", default=BUNDLES_DIR, help="translation bundle directory")
+    parser.add_argument("--ts-out", help="keep a translated copy of block-templates.ts at this path")
+    parser.add_argument("--poll", action="store_true", help="poll mtimes instead of using inotify")
+    args = parser.parse_args(argv)
+    try:
+        page_writers.check_codecs(args.compress)
+    except ValueError as error:
+        parser.error(str(error))
+
+    started = time.perf_counter()
+    targets = []
+    if args.spec:
+        pages = PageTarget(args.spec, args.out, args.format, args.compress)
+        targets.append(pages)
+        print(f"✅ Built {pages.initial['pages']} pages into {args.out} ({pages.initial['seconds']:.2f}s)")
+    if args.home_output:
+        targets.append(HomeTarget(args.home_output))
+    try:
+        translations = TranslationTarget(args.table, args.bundles, args.ts_out)
+    except CatalogError as error:
+        print(f"❌ {args.table}: {error}")
+        return 1
+    targets.append(translations)
+
+    watched = {_module_path(module) for module in RECIPE_MODULES} | {HOME_SCRIPT} | translations.watched_files()
+    if args.spec:
+        watched |= pages.watched_files()
+    watcher = PollingWatcher(watched) if args.poll else make_watcher(watched)
+    print(f"👀 Watching {len(watched)} files with {type(watcher).__name__} (ready in {time.perf_counter() - started:.2f}s)")
+    try:
+        run(targets, watcher)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.spec:
+            pages.save()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())